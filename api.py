@@ -0,0 +1,282 @@
+"""
+Local JSON/HTTP calculation API over the same engines as the Streamlit pages.
+
+Run alongside the app (no outside services needed):
+
+    python api.py --port 8502
+
+Endpoints:
+    GET  /health
+    GET  /v1/stats                      Projection cache hit rates (summed over workers)
+    POST /v1/<calculator>               One JSON scenario
+    POST /v1/<calculator>/batch         {"scenarios": [...]} -> {"results": [...]}
+    POST /v1/<calculator>/export.<fmt>        One scenario as a year-by-year CSV/XLSX
+    POST /v1/<calculator>/batch/export.<fmt>  {"scenarios": [...]} -> one CSV/XLSX, streamed
+
+Calculators: readiness, strategy (DR vs IP), super, fire. Missing fields fall
+back to the same defaults as the pages. Exports (fmt: csv or xlsx) are written
+row by row from the projection arrays as batch chunks finish, so memory stays
+flat however many scenarios are exported; readiness has no projection to export.
+"""
+import os
+import json
+import math
+import argparse
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import numpy as np
+
+from calculators.engines import CALCULATORS
+from utils.results import ProjectionResult
+from utils.cache import get_cache_stats
+from utils.simulation import pool_context
+from utils.export import EXPORT_FORMATS, stream_export
+
+logger = logging.getLogger("wealth_api")
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_BATCH_SCENARIOS = 20000
+EXPORT_CHUNK_SCENARIOS = 200  # Scenarios per pool task when streaming an export
+
+# ProjectionResult scalars kept for the engines' own use (resuming a projection), not part of a response
+INTERNAL_SCALARS = ("inputs", "resumed_from_year")
+
+
+def _jsonable(value):
+    """Converts engine output (ProjectionResult, NumPy types) into plain JSON types; inf/NaN become null."""
+    if isinstance(value, ProjectionResult):
+        return {k: _jsonable(v) for k, v in value.to_dict().items() if k not in INTERNAL_SCALARS}
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == "f" and not np.isfinite(value).all():
+            return _jsonable(value.tolist())
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+# --- Calculators ---
+
+EXPORTABLE = ("strategy", "super", "fire")
+
+
+def compute_scenarios(name, scenarios):
+    """
+    Runs scenarios through one calculator; a failed scenario returns its
+    exception. Any exception is caught so one bad scenario can't take down
+    its batch chunk (or the connection streaming it).
+    """
+    func = CALCULATORS[name]
+    results = []
+    for scenario in scenarios:
+        try:
+            results.append(func(scenario))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def run_scenarios(name, scenarios):
+    """Runs a list of scenarios through one calculator (executed inside a pool worker)."""
+    return [
+        {"ok": False, "error": str(result)} if isinstance(result, Exception) else {"ok": True, "result": _jsonable(result)}
+        for result in compute_scenarios(name, scenarios)
+    ]
+
+
+def in_worker(func, name, scenarios):
+    """
+    Runs `func` in a pool worker and returns (pid, cache stats, results): each
+    worker has its own projection cache, so its counters ride back with the work.
+    """
+    results = func(name, scenarios)
+    return os.getpid(), get_cache_stats(), results
+
+
+# --- HTTP layer ---
+
+class CalculationServer(ThreadingHTTPServer):
+    """Threaded HTTP front end; the maths runs in a process pool sized to the cores."""
+
+    daemon_threads = True
+
+    def __init__(self, address, workers=None):
+        super().__init__(address, CalculationHandler)
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=pool_context())
+        self._worker_stats = {}
+        self._stats_lock = threading.Lock()
+
+    def submit(self, func, name, scenarios):
+        return self.executor.submit(in_worker, func, name, scenarios)
+
+    def collect(self, future):
+        """Result of a `submit` future; keeps the worker's latest cache counters."""
+        pid, stats, results = future.result()
+        with self._stats_lock:
+            self._worker_stats[pid] = stats
+        return results
+
+    def cache_stats(self):
+        """Projection cache counters summed over every worker that has run a request."""
+        with self._stats_lock:
+            snapshots = list(self._worker_stats.values())
+        totals = {key: 0 for key in get_cache_stats()}
+        for stats in snapshots:
+            for key, value in stats.items():
+                totals[key] += value
+        lookups = totals["hits"] + totals["disk_hits"] + totals["misses"]
+        totals["hit_rate"] = (totals["hits"] + totals["disk_hits"]) / lookups if lookups else 0.0
+        totals["workers"] = len(snapshots)
+        return totals
+
+    def run_batch(self, name, scenarios):
+        # Split into one chunk per worker so large batches use every core
+        if not scenarios:
+            return []
+        chunk_size = max(1, math.ceil(len(scenarios) / self.workers))
+        futures = [
+            self.submit(run_scenarios, name, scenarios[i:i + chunk_size])
+            for i in range(0, len(scenarios), chunk_size)
+        ]
+        results = []
+        for future in futures:  # Preserves input order
+            results.extend(self.collect(future))
+        return results
+
+    def iter_results(self, name, scenarios, chunk_size=EXPORT_CHUNK_SCENARIOS):
+        """
+        Yields engine results in input order with only a few chunks in flight,
+        so exports stream while the rest of the batch is still computing.
+        """
+        pending = []
+        chunks = (scenarios[i:i + chunk_size] for i in range(0, len(scenarios), chunk_size))
+        for chunk in chunks:
+            pending.append(self.submit(compute_scenarios, name, chunk))
+            if len(pending) >= self.workers * 2:
+                yield from self.collect(pending.pop(0))
+        for future in pending:
+            yield from self.collect(future)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class CalculationHandler(BaseHTTPRequestHandler):
+    server_version = "WealthCalcAPI/1.0"
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise ValueError("Request body too large.")
+        raw = self.rfile.read(length) if length else b"{}"
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "workers": self.server.workers})
+        elif self.path == "/v1/stats":
+            self._send_json(200, {"projection_cache": self.server.cache_stats()})
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def _send_export(self, name, scenarios, fmt, is_batch):
+        if is_batch:
+            results = self.server.iter_results(name, scenarios)
+        else:
+            results = self.server.collect(self.server.submit(compute_scenarios, name, scenarios))
+            if isinstance(results[0], Exception):
+                self._send_json(400, {"error": str(results[0])})
+                return
+
+        # HTTP/1.0 response without a length: the body ends when the connection closes
+        self.send_response(200)
+        self.send_header("Content-Type", EXPORT_FORMATS[fmt])
+        self.send_header("Content-Disposition", f'attachment; filename="{name}_projections.{fmt}"')
+        self.end_headers()
+        for chunk in stream_export(results, fmt):
+            self.wfile.write(chunk)
+
+    def do_POST(self):
+        parts = self.path.strip("/").split("/")
+        fmt = None
+        if len(parts) > 2 and parts[-1].startswith("export."):
+            fmt = parts.pop().split(".", 1)[1]
+        if len(parts) not in (2, 3) or parts[0] != "v1" or parts[1] not in CALCULATORS or (len(parts) == 3 and parts[2] != "batch"):
+            self._send_json(404, {"error": "Not found", "calculators": sorted(CALCULATORS)})
+            return
+        name, is_batch = parts[1], len(parts) == 3
+        if fmt is not None and (fmt not in EXPORT_FORMATS or name not in EXPORTABLE):
+            self._send_json(404, {"error": "Not found", "exports": sorted(EXPORTABLE), "formats": sorted(EXPORT_FORMATS)})
+            return
+
+        try:
+            payload = self._read_json()
+            if is_batch:
+                scenarios = payload.get("scenarios") if isinstance(payload, dict) else None
+                if not isinstance(scenarios, list):
+                    raise ValueError('Batch body must be {"scenarios": [...]}.')
+                if len(scenarios) > MAX_BATCH_SCENARIOS:
+                    raise ValueError(f"At most {MAX_BATCH_SCENARIOS} scenarios per batch.")
+            else:
+                scenarios = [payload]
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        if fmt is not None:
+            self._send_export(name, scenarios, fmt, is_batch)
+            return
+
+        results = self.server.run_batch(name, scenarios)
+        if is_batch:
+            self._send_json(200, {"results": results})
+        elif results[0]["ok"]:
+            self._send_json(200, results[0]["result"])
+        else:
+            self._send_json(400, {"error": results[0]["error"]})
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local JSON/HTTP calculation API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = CalculationServer((args.host, args.port), workers=args.workers)
+    logger.info("Calculation API on http://%s:%s (%s workers)", args.host, args.port, server.workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
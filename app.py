@@ -5,6 +5,11 @@ from calculators.tier2 import render_tier2
 from calculators.tier3_super import render_tier3_super
 from calculators.cost_of_waiting import render_cost_of_waiting
 from utils.scoring import calculate_lead_score, get_lead_tier
+from utils.session import enforce_budget, DEFAULT_USER_PROFILE
+from utils.warmup import start_warmup
+
+# Opt-in (WEALTH_WARMUP): warms imports, caches and workers once per process, in the background
+start_warmup()
 
 def main():
     st.set_page_config(
@@ -16,17 +21,7 @@ def main():
 
     # Initialize session state for shared user profile data
     if 'user_profile' not in st.session_state:
-        st.session_state.user_profile = {
-            "age": 35,
-            "marital_status": "Married/De facto",
-            "income": 120000,
-            "dependants": 0,
-            "home_value": 1000000,
-            "mortgage": 600000,
-            "risk_tolerance": "Balanced",
-            "experience": "Intermediate (Some Shares/Property)",
-            "state": "NSW"
-        }
+        st.session_state.user_profile = dict(DEFAULT_USER_PROFILE)
     
     # Initialize session state for lead data if not exists
     if 'lead_data' not in st.session_state:
@@ -42,6 +37,10 @@ def main():
     if 'page_selection' not in st.session_state:
         st.session_state.page_selection = "Home"
 
+    # Opening a share link restores its profile and scenarios before any page renders
+    from calculators.scenarios import restore_shared_workspace
+    restore_shared_workspace()
+
     # --- CUSTOM CSS FOR APT WEALTH THEME ---
     st.markdown("""
         <style>
@@ -229,5 +228,8 @@ def main():
         if st.button("🏠 Back to Home"):
             go_to_page("Home")
 
+    # Keep this session's stored results within the memory budget (evicted results recompute on access)
+    enforce_budget()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,133 @@
+"""
+Batch PDF reports for advisor mailouts.
+
+Builds the Tier 2 information summary PDF for every prospect in a JSON (list)
+or JSON Lines file and streams them into one zip archive:
+
+    python batch_reports.py prospects.jsonl --out reports.zip --workers 4
+
+Each prospect is {"name": ..., "email": ..., "goal": ..., "scenario": {...}},
+where `scenario` takes the same fields as POST /v1/strategy. PDFs are built in
+a process pool; every worker builds the report styles and font metrics once
+and reuses them for all of its prospects.
+"""
+import os
+import re
+import json
+import time
+import zipfile
+import argparse
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from calculators.engines import run_strategy
+from utils.pdf_gen import generate_pdf_report, _report_styles
+from utils.simulation import pool_context
+
+logger = logging.getLogger("batch_reports")
+
+BATCH_CHUNK_PROSPECTS = 25  # Prospects per pool task
+REPORT_FONTS = ("Helvetica", "Helvetica-Bold")
+
+
+def _init_worker():
+    """Warms the per-process style sheet and font metrics before the first PDF."""
+    from reportlab.pdfbase import pdfmetrics
+    _report_styles()
+    for font in REPORT_FONTS:
+        pdfmetrics.getFont(font)
+
+
+def _file_name(index, prospect):
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", str(prospect.get("name") or "prospect")).strip("_")[:40]
+    return f"{index + 1:05d}_{slug or 'prospect'}.pdf"
+
+
+def build_prospect_reports(start, prospects):
+    """Builds one chunk of PDFs (runs in a pool worker). Returns [(file name, bytes or error)]."""
+    reports = []
+    for offset, prospect in enumerate(prospects):
+        name = _file_name(start + offset, prospect)
+        try:
+            results = run_strategy(prospect.get("scenario") or {})
+            pdf = generate_pdf_report(prospect, results['dr_results'], results['ip_results'])
+            reports.append((name, pdf.getvalue()))
+        except Exception as e:  # One bad prospect is reported in errors.txt, not fatal to its chunk
+            reports.append((name, e))
+    return reports
+
+
+def generate_batch_reports(prospects, output, workers=None, chunk_size=BATCH_CHUNK_PROSPECTS):
+    """
+    Fans PDF builds out over a process pool and writes them into a zip as they finish.
+
+    Chunks are written in input order with at most two per worker in flight,
+    so memory stays bounded however many prospects there are. Failed prospects
+    are listed in errors.txt inside the archive. Returns a dict of counts,
+    elapsed seconds and PDFs per second.
+    """
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    written, errors = 0, []
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context(), initializer=_init_worker) as executor, \
+            zipfile.ZipFile(output, "w", compression=zipfile.ZIP_STORED) as archive:
+
+        def write(future):
+            nonlocal written
+            for name, report in future.result():
+                if isinstance(report, Exception):
+                    errors.append(f"{name}: {report}")
+                else:
+                    archive.writestr(name, report)
+                    written += 1
+
+        pending = []
+        for start in range(0, len(prospects), chunk_size):
+            pending.append(executor.submit(build_prospect_reports, start, prospects[start:start + chunk_size]))
+            if len(pending) >= workers * 2:
+                write(pending.pop(0))
+        for future in pending:
+            write(future)
+        if errors:
+            archive.writestr("errors.txt", "\n".join(errors) + "\n")
+
+    elapsed = time.perf_counter() - started
+    return {
+        "pdfs": written,
+        "failed": len(errors),
+        "seconds": elapsed,
+        "pdfs_per_second": written / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def load_prospects(path):
+    """Reads prospects from a JSON list or a JSON Lines file."""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        prospects = json.loads(text)
+    else:
+        prospects = [json.loads(line) for line in text.splitlines() if line.strip()]
+    if not all(isinstance(p, dict) for p in prospects):
+        raise ValueError("Each prospect must be a JSON object.")
+    return prospects
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a branded PDF per prospect into a zip archive")
+    parser.add_argument("prospects", help="JSON list or JSON Lines file of prospects")
+    parser.add_argument("--out", default="reports.zip")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=BATCH_CHUNK_PROSPECTS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    prospects = load_prospects(args.prospects)
+    stats = generate_batch_reports(prospects, args.out, workers=args.workers, chunk_size=args.chunk_size)
+    logger.info("Wrote %d PDFs to %s in %.1fs (%.1f PDFs/sec, %d failed)",
+                stats["pdfs"], args.out, stats["seconds"], stats["pdfs_per_second"], stats["failed"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Scenario adapters over the calculator engines, shared by the HTTP API, the
+scenario workspace, batch reports and the warm-up.
+
+Each `run_<calculator>` takes one scenario dict, fills missing fields from the
+same defaults as the pages, range-checks the numeric inputs (ValueError on a
+bad field) and returns the engine's result.
+"""
+import math
+import numbers
+
+from calculators.tier1 import calculate_readiness_scores, get_assessment_level, get_score_percentile
+from calculators.tier2 import calculate_tier2_results
+from calculators.tier3_super import calculate_tier3_results, load_fund_data
+from calculators.fire import calculate_fire_projection
+from utils.tax import calculate_marginal_rate
+
+# --- Scenario defaults (mirror the page defaults) ---
+
+READINESS_DEFAULTS = {
+    "equity": 400000, "income": 120000, "experience": "Intermediate (Some Shares/Property)",
+    "risk_tolerance": "Balanced", "age": 35, "dependants": 0
+}
+
+STRATEGY_DEFAULTS = {
+    "income": 120000, "partner_income": 0, "marginal_tax_rate": None,
+    "dr_amount": 650000, "dr_growth": 0.085, "dr_yield": 0.025,
+    "ip_price": 650000, "ip_growth": 0.058, "ip_yield": 0.02, "ip_state": "NSW",
+    "loan_rate": 0.061, "loan_type": "Interest Only", "loan_term": 30,
+    "maint_rate": 0.01, "mgmt_rate": 0.07, "rates": 2500
+}
+
+SUPER_DEFAULTS = {
+    "selected_fund": "AustralianSuper", "current_age": 35, "retirement_age": 65,
+    "current_balance": 30000, "annual_salary": 120000, "employer_contrib": 0.115,
+    "voluntary_contrib": 0, "high_growth_return": None, "balanced_return": None,
+    "salary_growth": 0.03, "unused_cap": 0
+}
+
+FIRE_DEFAULTS = {
+    "current_age": 35, "fire_age": 50, "annual_spend": 80000, "current_investable": 100000,
+    "monthly_savings": 2000, "return_rate": 0.07, "inflation_rate": 0.03, "access_age": 60
+}
+
+# Accepted (min, max) of numeric fields across the calculators; ages follow the page inputs
+MAX_AMOUNT = 1e9
+INPUT_BOUNDS = {
+    "age": (18, 80), "current_age": (18, 90), "retirement_age": (18, 90),
+    "fire_age": (18, 90), "access_age": (18, 90), "dependants": (0, 10), "loan_term": (1, 40),
+    "equity": (-MAX_AMOUNT, MAX_AMOUNT),
+    **{field: (0, MAX_AMOUNT) for field in (
+        "income", "partner_income", "dr_amount", "ip_price", "rates", "current_balance", "annual_salary",
+        "voluntary_contrib", "unused_cap", "annual_spend", "current_investable", "monthly_savings")},
+    **{field: (0, 1) for field in ("marginal_tax_rate", "employer_contrib", "maint_rate", "mgmt_rate", "loan_rate")},
+    **{field: (-1, 1) for field in (
+        "dr_growth", "dr_yield", "ip_growth", "ip_yield", "high_growth_return", "balanced_return",
+        "salary_growth", "return_rate", "inflation_rate")},
+}
+
+
+def _with_defaults(scenario, defaults):
+    if not isinstance(scenario, dict):
+        raise ValueError("Each scenario must be a JSON object.")
+    unknown = set(scenario) - set(defaults)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    params = dict(defaults)
+    params.update(scenario)
+    for field, value in params.items():
+        if field not in INPUT_BOUNDS or value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, numbers.Real) or not math.isfinite(value):
+            raise ValueError(f"{field} must be a number.")
+        low, high = INPUT_BOUNDS[field]
+        if not low <= value <= high:
+            raise ValueError(f"{field} must be between {low:g} and {high:g}.")
+    return params
+
+
+# --- Adapters ---
+
+def run_readiness(scenario):
+    p = _with_defaults(scenario, READINESS_DEFAULTS)
+    scores = calculate_readiness_scores(p["equity"], p["income"], p["experience"], p["risk_tolerance"], p["age"], p["dependants"])
+    return {"scores": scores, "assessment": get_assessment_level(scores["total"]),
+            "percentile": get_score_percentile(scores["total"])}
+
+
+def run_strategy(scenario):
+    p = _with_defaults(scenario, STRATEGY_DEFAULTS)
+    income = p.pop("income")
+    partner_income = p.pop("partner_income")
+    if p["marginal_tax_rate"] is None:
+        p["marginal_tax_rate"] = calculate_marginal_rate(income + partner_income)
+    return calculate_tier2_results(**p)
+
+
+def run_super(scenario):
+    p = _with_defaults(scenario, SUPER_DEFAULTS)
+    fund_data = load_fund_data()
+    if p["selected_fund"] not in fund_data:
+        raise ValueError(f"Unknown fund: {p['selected_fund']}")
+    fund_info = fund_data[p["selected_fund"]]
+    # Default returns to the fund's 10-year history, as the page sliders do
+    if p["high_growth_return"] is None:
+        p["high_growth_return"] = fund_info["return_high_growth_10y"]
+    if p["balanced_return"] is None:
+        p["balanced_return"] = fund_info["return_balanced_10y"]
+    if p["retirement_age"] <= p["current_age"]:
+        raise ValueError("retirement_age must be greater than current_age.")
+    return calculate_tier3_results(**p)
+
+
+def run_fire(scenario):
+    p = _with_defaults(scenario, FIRE_DEFAULTS)
+    if p["fire_age"] <= p["current_age"]:
+        raise ValueError("fire_age must be greater than current_age.")
+    return calculate_fire_projection(**p)
+
+
+CALCULATORS = {
+    "readiness": run_readiness,
+    "strategy": run_strategy,
+    "super": run_super,
+    "fire": run_fire,
+}
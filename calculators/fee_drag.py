@@ -0,0 +1,135 @@
+import numpy as np
+from utils.results import ProjectionResult
+from utils.cache import cached_projection
+from utils.funds import fund_registry
+
+# Inputs are rounded to these bands so nearby salaries/balances share one cached table
+SALARY_BAND = 10000
+BALANCE_BAND = 10000
+
+INVESTMENT_OPTIONS = (
+    ('High Growth', 'return_high_growth_10y', 'investment_fee_high_growth'),
+    ('Balanced', 'return_balanced_10y', 'investment_fee_balanced'),
+)
+
+# Fee components, each modelled by switching it off in turn.
+# 'admin_fee_cap' is removed (admin fees uncapped), so its drag is negative: what the cap saves.
+FEE_COMPONENTS = ('admin_fee_flat', 'admin_fee_percent', 'admin_fee_cap', 'investment_fee', 'transaction_cost')
+
+FEE_COMPONENT_LABELS = {
+    'admin_fee_flat': 'Admin (Flat)',
+    'admin_fee_percent': 'Admin (%)',
+    'admin_fee_cap': 'Admin Cap',
+    'investment_fee': 'Investment Fee',
+    'transaction_cost': 'Transaction Costs',
+    'total': 'Total Fee Drag',
+}
+
+
+def project_super_batch(balance, salary, employer_rate, voluntary, return_rate,
+                        investment_fee_rate, admin_fee_flat, admin_fee_percent,
+                        admin_fee_cap, transaction_cost, salary_growth, years):
+    """
+    Vectorised `calculate_super_projection`: fee and return arguments may be
+    arrays (one entry per scenario) and are stepped together year by year.
+    Returns a (scenarios, years + 1) array of balances.
+    """
+    return_rate, investment_fee_rate, admin_fee_flat, admin_fee_percent, admin_fee_cap, transaction_cost = np.broadcast_arrays(
+        *(np.asarray(a, dtype=np.float64) for a in (return_rate, investment_fee_rate, admin_fee_flat,
+                                                     admin_fee_percent, admin_fee_cap, transaction_cost))
+    )
+    n = return_rate.size
+    balances = np.empty((n, max(years, 0) + 1))
+    current = np.full(n, float(balance))
+    balances[:, 0] = current
+    current_salary = salary
+
+    for year in range(years):
+        # Same order of operations as the single-fund engine
+        total_contrib = current_salary * employer_rate + voluntary
+        net_contrib = total_contrib - total_contrib * 0.15
+        admin_total = np.minimum(admin_fee_flat + current * admin_fee_percent, admin_fee_cap)
+        gross_return = (current + (net_contrib / 2)) * return_rate
+        net_return = gross_return - current * investment_fee_rate - current * transaction_cost
+        current = current + net_contrib + net_return - admin_total
+        balances[:, year + 1] = current
+        current_salary *= (1 + salary_growth)
+
+    return balances
+
+
+def band_inputs(current_balance, annual_salary):
+    """Rounds balance and salary to their cache bands."""
+    return (round(current_balance / BALANCE_BAND) * BALANCE_BAND,
+            round(annual_salary / SALARY_BAND) * SALARY_BAND)
+
+
+@cached_projection
+def calculate_fee_drag_table(current_balance, annual_salary, employer_contrib, voluntary_contrib,
+                             salary_growth, years, fees_version=None):
+    """
+    Lifetime cost of each fee component for every fund and investment option.
+
+    Runs the actual projection plus one projection per component switched off
+    (all in a single vectorised pass) and reports, per fund/option row, the
+    retirement balance difference each component causes. `fees_version` only
+    keys the cache to the fee table revision.
+
+    Returns a ProjectionResult whose series are table columns ('final_balance',
+    one per FEE_COMPONENTS entry, 'total') with the row labels in the 'funds'
+    and 'options' scalars.
+    """
+    index = fund_registry.current()
+    cols = index.columns
+    n_funds = len(index)
+
+    returns = np.concatenate([cols[r] for _, r, _ in INVESTMENT_OPTIONS])
+    invest_fees = np.concatenate([cols[f] for _, _, f in INVESTMENT_OPTIONS])
+    n_opts = len(INVESTMENT_OPTIONS)
+    flat = np.tile(cols['admin_fee_flat'], n_opts)
+    pct = np.tile(cols['admin_fee_percent'], n_opts)
+    cap = np.tile(cols['admin_fee_cap'], n_opts)
+    txn = np.tile(cols['transaction_cost'], n_opts)
+    zeros = np.zeros_like(returns)
+    uncapped = np.full_like(returns, np.inf)
+
+    # Scenario 0 is actual fees, then one per component, then no fees at all
+    scenarios = [
+        (invest_fees, flat, pct, cap, txn),
+        (invest_fees, zeros, pct, cap, txn),
+        (invest_fees, flat, zeros, cap, txn),
+        (invest_fees, flat, pct, uncapped, txn),
+        (zeros, flat, pct, cap, txn),
+        (invest_fees, flat, pct, cap, zeros),
+        (zeros, zeros, zeros, cap, zeros),
+    ]
+    stacked = [np.concatenate(parts) for parts in zip(*scenarios)]
+    balances = project_super_batch(
+        current_balance, annual_salary, employer_contrib, voluntary_contrib,
+        np.tile(returns, len(scenarios)), *stacked, salary_growth, years
+    )
+    finals = balances[:, -1].reshape(len(scenarios), -1)
+
+    block = np.empty((len(FEE_COMPONENTS) + 2, finals.shape[1]))
+    block[0] = finals[0]
+    block[1:] = finals[1:] - finals[0]
+    return ProjectionResult.from_block(('final_balance',) + FEE_COMPONENTS + ('total',), block, {
+        'funds': index.names * n_opts,
+        'options': tuple(label for label, _, _ in INVESTMENT_OPTIONS for _ in range(n_funds)),
+        'years': years,
+    })
+
+
+def get_fee_drag_table(current_balance, annual_salary, employer_contrib, voluntary_contrib, salary_growth, years):
+    """Banded, cached fee-drag table for the current fee data."""
+    banded_balance, banded_salary = band_inputs(current_balance, annual_salary)
+    return calculate_fee_drag_table(banded_balance, banded_salary, employer_contrib, voluntary_contrib,
+                                    salary_growth, years, fees_version=fund_registry.current().version)
+
+
+def precompute_fee_drag_tables(balances, salaries, employer_contrib=0.115, voluntary_contrib=0,
+                               salary_growth=0.03, years=30):
+    """Fills the projection cache for a grid of balance/salary bands."""
+    for balance in balances:
+        for salary in salaries:
+            get_fee_drag_table(balance, salary, employer_contrib, voluntary_contrib, salary_growth, years)
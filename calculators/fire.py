@@ -1,9 +1,14 @@
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
 import numpy_financial as npf
-from utils.ui import parse_currency_input
+from utils.ui import parse_currency_input, render_export_buttons
 from utils.compliance import render_footer_disclaimer, get_projection_disclaimer
+from utils.results import ProjectionResult
+from utils.cache import cached_projection
+from utils.session import store_result, get_result
+from utils.charts import brand_figure, cached_figure, BRAND_INDIGO
 
 def render_fire_calculator():
     """Renders the dedicated FIRE (Financial Independence, Retire Early) Calculator."""
@@ -67,113 +72,26 @@ def render_fire_calculator():
     if st.button("🚀 Run Illustrative Simulation", type="primary", use_container_width=True):
         
         # --- CALCULATION ENGINE ---
+        fire_inputs = {
+            'current_age': current_age, 'fire_age': fire_age, 'annual_spend': annual_spend,
+            'current_investable': current_investable, 'monthly_savings': monthly_savings,
+            'return_rate': return_rate, 'inflation_rate': inflation_rate, 'access_age': access_age
+        }
+        projection = calculate_fire_projection(**fire_inputs)
         
-        # 0. Timeline
-        years_to_fire = fire_age - current_age
-        years_in_bridge = access_age - fire_age
-        
-        # 1. Accumulation Phase (Now -> FIRE Age)
-        # We need to grow the Current Assets + Contributions
-        
-        net_nominal_return = return_rate * (1 - (tax_rate * 0.3)) # Assume only yield is taxed annually? 
-        # Actually simplest is just a "Net Growth Rate" assumption
-        effective_growth_rate = return_rate # Let's stick to raw return for growth, and maybe deduct tax from income?
-        # Standard approach:
-        # User input "Return" is usually pre-tax.
-        # Let's apply a simple tax drag factor of 15% on the return (mix of yield/growth).
-        effective_return = return_rate * 0.85 
-        
-        # Project Year by Year
-        projection_data = []
-        
-        balance = current_investable
-        age = current_age
-        
-        # Store for Chart
-        ages = []
-        balances = []
-        needs = []
-        phase = [] # 'Accumulation', 'Drawdown', 'Super Access'
-        
-        # A. Accumulation Loop
-        for i in range(years_to_fire):
-            # Growth
-            balance = balance * (1 + effective_return)
-            # Contribution
-            balance += (monthly_savings * 12)
-            
-            # Record
-            ages.append(age)
-            balances.append(balance)
-            needs.append(0) # No need in accum calculation visual usually, or show target?
-            phase.append("Accumulation")
-            
-            age += 1
-            
-        fire_starting_balance = balance
-        
-        # B. Drawdown Loop (FIRE Age -> 60)
-        # Expense needs to inflate?
-        # Yes, if we are using nominal returns, we must inflate the expense.
-        
-        current_annual_spend = annual_spend * ((1 + inflation_rate) ** years_to_fire)
-        
-        success = True
-        depletion_age = -1
-        
-        if years_in_bridge > 0:
-            for i in range(years_in_bridge):
-                # Start of year balance
-                start_bal = balance
-                
-                # Growth (assume mid-year spend? or beginning. Let's do beginning for safety)
-                balance -= current_annual_spend
-                
-                # Check absolute failure
-                if balance < 0:
-                    balance = 0
-                    if success: 
-                        success = False
-                        depletion_age = age
-                
-                # Remainder grows
-                balance = balance * (1 + effective_return)
-                
-                # Record
-                ages.append(age)
-                balances.append(start_bal) # Plotting start of year wealth
-                needs.append(current_annual_spend)
-                phase.append("Drawdown (Bridge)")
-                
-                # Inflate spend for next year
-                current_annual_spend *= (1 + inflation_rate)
-                age += 1
-                
-        # C. Post-60 (Legacy / Super Integration not modeled here deeply, just showing leftover)
-        # Just show a few years post 60 to show if it held up
-        for i in range(5):
-            ages.append(age)
-            balances.append(balance)
-            needs.append(current_annual_spend)
-            phase.append("Post-Super Access")
-            age += 1
+        years_to_fire = projection['years_to_fire']
+        years_in_bridge = projection['years_in_bridge']
+        effective_return = projection['effective_return']
+        fire_starting_balance = projection['fire_starting_balance']
+        success = projection['success']
+        depletion_age = projection['depletion_age']
            
-        # Store results in session state
-        st.session_state['fire_results'] = {
-            'ages': ages,
-            'balances': balances,
-            'needs': needs,
-            'fire_starting_balance': fire_starting_balance,
-            'depletion_age': depletion_age,
-            'success': success,
-            'years_to_fire': years_to_fire,
-            'years_in_bridge': years_in_bridge,
-            'inflation_rate': inflation_rate
-        }
+        # Store results in session state (the result object already carries every key the display needs)
+        store_result('fire_results', projection, recompute=calculate_fire_projection, inputs=fire_inputs)
             
     # --- RESULTS DISPLAY ---
-    if 'fire_results' in st.session_state and st.session_state['fire_results']:
-        results = st.session_state['fire_results']
+    results = get_result('fire_results')
+    if results:
         
         # Ensure all required keys exist
         if all(key in results for key in ['ages', 'balances', 'needs', 'inflation_rate']):
@@ -197,17 +115,13 @@ def render_fire_calculator():
                  show_real = st.toggle("Show in Today's Dollars", value=False, help="Adjusts future values for inflation to show purchasing power.")
 
             # Adjustment Logic
-            display_balances = []
-            display_needs = []
-            
-            for i, (bal, need) in enumerate(zip(balances, needs)):
-                if show_real:
-                    factor = (1 + sim_inflation_rate) ** i
-                    display_balances.append(bal / factor)
-                    display_needs.append(need / factor)
-                else:
-                    display_balances.append(bal)
-                    display_needs.append(need)
+            if show_real:
+                factors = (1 + sim_inflation_rate) ** np.arange(len(balances))
+                display_balances = balances / factors
+                display_needs = needs / factors
+            else:
+                display_balances = balances
+                display_needs = needs
 
             final_bridge_balance = display_balances[len(ages)-5] # Roughly age 60 point based on logic?
             # Actually logic captures up to Age 60 + 5 years.
@@ -233,47 +147,11 @@ def render_fire_calculator():
                 r3.metric("Shortfall Age", f"{results['depletion_age']}")
                 
             # Chart
-            fig = go.Figure()
-            
-            # Wealth Line
-            fig.add_trace(go.Scatter(
-                x=ages, y=display_balances,
-                name="Investable Assets",
-                mode='lines',
-                fill='tozeroy',
-                line=dict(color='#6366F1', width=3)
-            ))
-             
-            # Target Line (Spend)
-            # Note: In accumulation, 'needs' is 0, so line drops. 
-            # Better to show Target Spend level across whole chart?
-            # Or just during drawdown.
-            # Existing logic had needs=0 in accumulation.
-            fig.add_trace(go.Scatter(
-                x=ages, 
-                y=display_needs,
-                name="Annual Spend Requirement",
-                mode='lines',
-                line=dict(color='#FF5252', dash='dash')
-            ))
-            
-            fig.update_layout(
-                title="FIRE Bridge Trajectory",
-                xaxis_title="Age",
-                yaxis_title=f"Wealth ({'Real' if show_real else 'Nominal'} $)",
-                height=400,
-                hovermode="x unified"
-            )
-            
-            # Add 'Bridge Phase' shading logic
-            fig.add_vrect(
-                x0=fire_age, x1=60, 
-                annotation_text="Bridge Phase", annotation_position="top left",
-                fillcolor="#6366F1", opacity=0.1, line_width=0
-            )
+            fig = create_fire_chart(ages, display_balances, display_needs, fire_age, show_real)
 
             st.plotly_chart(fig, use_container_width=True)
             st.caption(get_projection_disclaimer())
+            render_export_buttons(results, "FIRE_Year_by_Year", key="fire_export")
             
             # Analysis Text
             if not success:
@@ -299,17 +177,8 @@ def render_fire_calculator():
             # Spend starts at S_0, grows by g (inflation). Discounted by r (return).
             # PV = Sum( S_0 * ((1+g)/(1+r))^t ) for t=0 to N-1
             
-            req_start_spend = annual_spend * ((1 + inflation_rate) ** years_to_fire)
-            
-            if years_in_bridge > 0:
-                if abs(effective_return - inflation_rate) < 0.001:
-                    # Growth equals inflation roughly
-                    required_capital = req_start_spend * years_in_bridge
-                else:
-                    ratio = (1 + inflation_rate) / (1 + effective_return)
-                    required_capital = req_start_spend * (1 - ratio ** years_in_bridge) / (1 - ratio)
-            else:
-                required_capital = 0
+            required_capital = calculate_required_capital(annual_spend, inflation_rate, effective_return,
+                                                          years_to_fire, years_in_bridge)
 
             # Disclaimer / Rounding
             # st.write(f"Debug: Req {required_capital}, Proj {fire_starting_balance}")
@@ -319,14 +188,15 @@ def render_fire_calculator():
             gap = required_capital - fire_starting_balance
             
             # Save results to session state for Summary Page
-            st.session_state['fire_results'] = {
+            store_result('fire_summary', {
                 'projected_wealth': fire_starting_balance,
                 'required_capital': required_capital,
                 'gap': gap,
                 'success': success,
                 'depletion_age': depletion_age if not success else None,
-                'fire_age': fire_age
-            }
+                'fire_age': fire_age,
+                'access_age': access_age
+            })
             
             col_target_1, col_target_2, col_target_3 = st.columns(3)
             col_target_1.metric(
@@ -354,5 +224,216 @@ def render_fire_calculator():
                     delta="Above Target", 
                     delta_color="normal"
                 )
-                
+
             render_footer_disclaimer()
+
+    # --- Monte Carlo (background job) ---
+    st.divider()
+    st.markdown("## 🎲 Sequence-of-Returns Stress Test")
+    st.caption("Runs thousands of randomised return paths in the background. You can keep using the app while it runs.")
+
+    col_mc1, col_mc2 = st.columns(2)
+    with col_mc1:
+        volatility = st.slider("Return Volatility (%)", 4.0, 25.0, 12.0, 1.0, help="Standard deviation of annual returns. Diversified growth portfolios are typically 10-15%.") / 100
+    with col_mc2:
+        n_paths = st.select_slider("Simulated Paths", options=[1000, 2000, 5000, 10000, 50000], value=2000,
+                                   help="Paths use quasi-random (Sobol) sampling with variance reduction, so a few thousand give a stable estimate.")
+
+    if st.button("🎲 Run Monte Carlo in Background", use_container_width=True):
+        from utils.jobs import get_job_queue
+        st.session_state['fire_mc_job'] = get_job_queue().submit("fire_monte_carlo", {
+            'current_age': current_age, 'fire_age': fire_age, 'annual_spend': annual_spend,
+            'current_investable': current_investable, 'monthly_savings': monthly_savings,
+            'return_rate': return_rate, 'inflation_rate': inflation_rate,
+            'volatility': volatility, 'n_paths': n_paths, 'access_age': access_age
+        })
+        st.session_state.pop('fire_mc_results', None)
+
+    if st.session_state.get('fire_mc_job'):
+        render_monte_carlo_job()
+    if st.session_state.get('fire_mc_results') is not None:
+        render_monte_carlo_results(st.session_state['fire_mc_results'], fire_age)
+
+
+@st.fragment(run_every=1.0)
+def render_monte_carlo_job():
+    """Polls the background job; only this fragment reruns while it is in flight."""
+    from utils.jobs import get_job_queue, DONE, FAILED
+    queue = get_job_queue()
+    job_id = st.session_state['fire_mc_job']
+    status = queue.status(job_id)
+
+    if status is None:
+        st.session_state.pop('fire_mc_job', None)
+        st.warning("The background simulation is no longer available. Please run it again.")
+    elif status['state'] == DONE:
+        st.session_state['fire_mc_results'] = queue.result(job_id, pop=True)
+        st.session_state.pop('fire_mc_job', None)
+        st.rerun()
+    elif status['state'] == FAILED:
+        st.session_state.pop('fire_mc_job', None)
+        st.error(f"Simulation failed: {status['error']}")
+    else:
+        st.progress(status['progress'], text=f"Simulating return paths... {status['progress']*100:.0f}%")
+
+
+# --- Charts ---
+
+@cached_figure
+def create_fire_chart(ages, balances, needs, fire_age, show_real):
+    fig = brand_figure()
+    
+    # Wealth Line
+    fig.add_trace(go.Scatter(
+        x=ages, y=balances,
+        name="Investable Assets",
+        mode='lines',
+        fill='tozeroy',
+        line=dict(color=BRAND_INDIGO, width=3)
+    ))
+     
+    # Target Line (Spend); 'needs' is 0 during accumulation
+    fig.add_trace(go.Scatter(
+        x=ages, 
+        y=needs,
+        name="Annual Spend Requirement",
+        mode='lines',
+        line=dict(color='#FF5252', dash='dash')
+    ))
+    
+    fig.update_layout(
+        title="FIRE Bridge Trajectory",
+        xaxis_title="Age",
+        yaxis_title=f"Wealth ({'Real' if show_real else 'Nominal'} $)",
+        height=400,
+        hovermode="x unified"
+    )
+    
+    # Add 'Bridge Phase' shading logic
+    fig.add_vrect(
+        x0=fire_age, x1=60, 
+        annotation_text="Bridge Phase", annotation_position="top left",
+        fillcolor=BRAND_INDIGO, opacity=0.1, line_width=0
+    )
+    return fig
+
+
+@cached_figure
+def create_monte_carlo_chart(ages, p10, p25, p50, p75, p90, fire_age):
+    fig = brand_figure()
+    fig.add_trace(go.Scatter(x=ages, y=p90, line=dict(width=0), showlegend=False, hoverinfo='skip'))
+    fig.add_trace(go.Scatter(x=ages, y=p10, name="10th-90th percentile", fill='tonexty',
+                             fillcolor='rgba(99, 102, 241, 0.15)', line=dict(width=0)))
+    fig.add_trace(go.Scatter(x=ages, y=p75, line=dict(width=0), showlegend=False, hoverinfo='skip'))
+    fig.add_trace(go.Scatter(x=ages, y=p25, name="25th-75th percentile", fill='tonexty',
+                             fillcolor='rgba(99, 102, 241, 0.3)', line=dict(width=0)))
+    fig.add_trace(go.Scatter(x=ages, y=p50, name="Median", mode='lines', line=dict(color=BRAND_INDIGO, width=3)))
+    fig.add_vrect(x0=fire_age, x1=60, annotation_text="Bridge Phase", annotation_position="top left",
+                  fillcolor=BRAND_INDIGO, opacity=0.1, line_width=0)
+    fig.update_layout(title="Range of Outcomes (Nominal $)", xaxis_title="Age", yaxis_title="Investable Assets",
+                      height=400, hovermode="x unified")
+    return fig
+
+
+def render_monte_carlo_results(mc, fire_age):
+    """Shows the success probability and percentile fan chart for a finished run."""
+    m1, m2 = st.columns(2)
+    m1.metric("Probability Bridge Holds", f"{mc['success_probability']*100:.1f}%",
+              help=f"Share of {mc['n_paths']:,} simulated return paths where assets last until age 60 "
+                   f"(± {mc['success_probability_se']*100:.1f}% standard error).")
+    if mc['median_depletion_age'] is not None:
+        m2.metric("Median Depletion Age (failed paths)", f"{mc['median_depletion_age']:.0f}")
+
+    ages = mc['ages']
+    fig = create_monte_carlo_chart(ages, mc['p10'], mc['p25'], mc['p50'], mc['p75'], mc['p90'], fire_age)
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(get_projection_disclaimer())
+
+
+def calculate_required_capital(annual_spend, inflation_rate, effective_return, years_to_fire, years_in_bridge):
+    """
+    Capital needed at the FIRE age to fund the bridge: the present value of a
+    growing annuity (spend inflated to the FIRE age, paid at the start of each
+    bridge year, growing with inflation, discounted at the effective return).
+    """
+    if years_in_bridge <= 0:
+        return 0
+    start_spend = annual_spend * ((1 + inflation_rate) ** years_to_fire)
+    ratio = (1 + inflation_rate) / (1 + effective_return)
+    if ratio == 1:
+        return start_spend * years_in_bridge
+    return start_spend * (1 - ratio ** years_in_bridge) / (1 - ratio)
+
+
+@cached_projection
+def calculate_fire_projection(current_age, fire_age, annual_spend, current_investable, monthly_savings,
+                              return_rate, inflation_rate, access_age=60, post_access_years=5):
+    """
+    Projects outside-super wealth through accumulation, the bridge drawdown and a
+    few years after super access. Returns a ProjectionResult with 'ages',
+    'balances' and 'needs' series plus the headline scalars.
+    """
+    # 0. Timeline
+    years_to_fire = fire_age - current_age
+    years_in_bridge = access_age - fire_age
+    accumulation_years = max(years_to_fire, 0)
+    bridge_years = max(years_in_bridge, 0)
+    
+    # User input "Return" is usually pre-tax.
+    # Apply a simple tax drag factor of 15% on the return (mix of yield/growth).
+    effective_return = return_rate * 0.85
+    
+    total_years = accumulation_years + bridge_years + post_access_years
+    block = np.zeros((3, total_years))
+    ages, balances, needs = block
+    ages[:] = current_age + np.arange(total_years)
+    
+    balance = current_investable
+    
+    # A. Accumulation Loop
+    for i in range(accumulation_years):
+        balance = balance * (1 + effective_return)
+        balance += (monthly_savings * 12)
+        balances[i] = balance
+        
+    fire_starting_balance = balance
+    
+    # B. Drawdown Loop (FIRE Age -> 60)
+    # Nominal returns, so the expense must inflate too.
+    current_annual_spend = annual_spend * ((1 + inflation_rate) ** years_to_fire)
+    
+    success = True
+    depletion_age = -1
+    
+    for i in range(accumulation_years, accumulation_years + bridge_years):
+        # Start of year balance (plotted), spend taken at the beginning for safety
+        balances[i] = balance
+        needs[i] = current_annual_spend
+        balance -= current_annual_spend
+        
+        if balance < 0:
+            balance = 0
+            if success:
+                success = False
+                depletion_age = int(ages[i])
+        
+        # Remainder grows
+        balance = balance * (1 + effective_return)
+        
+        # Inflate spend for next year
+        current_annual_spend *= (1 + inflation_rate)
+    
+    # C. Post-60: just show a few years to show if it held up
+    post_start = accumulation_years + bridge_years
+    balances[post_start:] = balance
+    needs[post_start:] = current_annual_spend
+    
+    return ProjectionResult.from_block(('ages', 'balances', 'needs'), block, {
+        'fire_starting_balance': fire_starting_balance,
+        'depletion_age': depletion_age,
+        'success': success,
+        'years_to_fire': years_to_fire,
+        'years_in_bridge': years_in_bridge,
+        'effective_return': effective_return,
+        'inflation_rate': inflation_rate
+    })
@@ -0,0 +1,82 @@
+import numpy as np
+from utils.tax import calculate_income_tax_array
+
+# Named ownership structures: share of the investment in the first partner's name
+OWNERSHIP_SPLITS = {
+    "100% You": 1.0,
+    "50/50": 0.5,
+    "100% Partner": 0.0,
+}
+
+# Granularity of the search for the best split
+OPTIMISE_STEPS = 101
+
+
+def household_tax_by_split(taxable_income, franking_credits, user_income, partner_income, user_shares):
+    """
+    Tax saved by the household for each ownership split, per year.
+
+    `taxable_income`/`franking_credits` are the investment's per-year amounts
+    (shape (..., years)); `user_shares` is a 1-D array of the share owned by
+    the first partner. Each partner's tax is `calculate_income_tax` on their
+    salary plus their share of the investment income (losses reduce it), less
+    their share of the refundable franking credits. Everything is evaluated
+    in one batched call and returns shape (..., splits, years).
+    """
+    taxable = np.asarray(taxable_income, dtype=np.float64)[..., np.newaxis, :]
+    franking = np.asarray(franking_credits, dtype=np.float64)[..., np.newaxis, :]
+    shares = np.asarray(user_shares, dtype=np.float64)[:, np.newaxis]
+
+    # Stack both partners so the bracket maths runs once
+    incomes = np.stack(np.broadcast_arrays(user_income + shares * taxable, partner_income + (1 - shares) * taxable))
+    with_investment = calculate_income_tax_array(incomes).sum(axis=0) - franking
+    without_investment = calculate_income_tax_array(np.array([user_income, partner_income])).sum()
+    return without_investment - with_investment
+
+
+def calculate_household_results(strategies, user_income, partner_income, optimise=True):
+    """
+    Compares ownership structures for each strategy projection.
+
+    `strategies` maps a label to a Tier 2 projection carrying 'taxable_income'
+    (and, for shares, 'franking_credits'). All strategies, the named splits and
+    (when `optimise`) a 1% grid of splits are evaluated in a single batch.
+    Returns {label: {'splits': {name: {'user_share', 'tax_saved_yearly',
+    'tax_saved'}}, 'best_share', 'best_tax_saved'}} where tax_saved is the
+    cumulative total over the horizon.
+    """
+    labels = list(strategies)
+    years = len(strategies[labels[0]]['taxable_income'])
+    taxable = np.stack([strategies[label]['taxable_income'] for label in labels])
+    franking = np.stack([strategies[label].get('franking_credits', np.zeros(years)) for label in labels])
+
+    named = np.array(list(OWNERSHIP_SPLITS.values()))
+    grid = np.linspace(1.0, 0.0, OPTIMISE_STEPS) if optimise else np.zeros(0)
+    shares = np.concatenate([named, grid])
+    yearly = household_tax_by_split(taxable, franking, user_income, partner_income, shares)
+    cumulative = yearly.cumsum(axis=-1)
+
+    results = {}
+    for s_idx, label in enumerate(labels):
+        splits = {
+            name: {
+                'user_share': float(share),
+                'tax_saved_yearly': yearly[s_idx, i],
+                'tax_saved': cumulative[s_idx, i],
+            }
+            for i, (name, share) in enumerate(OWNERSHIP_SPLITS.items())
+        }
+        # Best total benefit across every split evaluated (ties keep the earlier, more 'You'-weighted split)
+        best = int(np.argmax(cumulative[s_idx, :, -1]))
+        if optimise:
+            splits["Optimised"] = {
+                'user_share': float(shares[best]),
+                'tax_saved_yearly': yearly[s_idx, best],
+                'tax_saved': cumulative[s_idx, best],
+            }
+        results[label] = {
+            'splits': splits,
+            'best_share': float(shares[best]),
+            'best_tax_saved': float(cumulative[s_idx, best, -1]),
+        }
+    return results
@@ -0,0 +1,372 @@
+import warnings
+import numpy as np
+from scipy.stats import norm, qmc
+from utils.results import ProjectionResult
+from utils.downsample import percentile_bands
+from utils.sketch import QuantileSketch
+from utils.simulation import iter_blocks
+from calculators.fire import calculate_fire_projection, calculate_required_capital
+
+# Fixed default seed: the same inputs always give the same fan chart (screen and PDF)
+DEFAULT_SEED = 20240701
+
+# Percentiles reported for fan charts
+FAN_PERCENTILES = (10, 25, 50, 75, 90)
+
+# "pseudo": numpy's generator; "sobol": scrambled Sobol points (quasi-Monte Carlo)
+SAMPLERS = ("pseudo", "sobol")
+
+# Minimum independently scrambled Sobol sequences (blocks) per run; the
+# spread of their estimates gives the standard error (one QMC sequence has none)
+QMC_REPLICATES = 8
+
+# Control variate thresholds on the linearised funding ratio, in standard deviations
+CONTROL_THRESHOLDS = (-1.0, -0.5, 0.0, 0.5, 1.0)
+
+# From this many paths, runs stream through a quantile sketch instead of keeping every path
+STREAMING_MIN_PATHS = 20000
+
+
+def simulate_fire_paths(current_age, fire_age, annual_spend, current_investable, monthly_savings,
+                        return_rate, inflation_rate, volatility=0.12, n_paths=10000, seed=DEFAULT_SEED,
+                        access_age=60, post_access_years=5, chunk_size=2000, progress=None,
+                        sampler="sobol", antithetic=True, control_variate=True, streaming=None, workers=None):
+    """
+    Monte Carlo version of `calculate_fire_projection` with random annual returns.
+
+    Returns are drawn i.i.d. normal around the same after-tax `effective_return`
+    the deterministic model uses, so sequence-of-returns risk in the bridge
+    phase shows up as a probability of success rather than a single path.
+
+    By default the draws are scrambled Sobol points in antithetic pairs, and
+    the success rate is corrected with control variates built from the
+    deterministic FIRE balance and required bridge capital (see
+    `_funding_ratio_model`). Together these reach a given accuracy with
+    several times fewer paths than plain sampling (`sampler="pseudo"`,
+    `antithetic=False`, `control_variate=False`).
+
+    Paths are simulated in blocks (utils.simulation), each with its own RNG
+    stream spawned from `seed`, on up to `workers` processes; blocks are
+    merged in order, so the result is bitwise identical for any worker count.
+    Within a block, paths are processed `chunk_size` at a time. With
+    `streaming` (the default from STREAMING_MIN_PATHS paths), no chunk is
+    kept: the fan percentiles come from a QuantileSketch, within its relative
+    accuracy (0.5%) of the in-memory ones plus the gap between neighbouring
+    paths (negligible at streaming sizes), and memory no longer grows with
+    `n_paths`. The success probability, its standard error and the median
+    depletion age are computed from running totals in both modes, so they
+    are identical.
+
+    Returns a ProjectionResult with one series per fan percentile
+    ('p10' ... 'p90', balances by age) and the scalars 'success_probability',
+    'success_probability_se' (its standard error), 'n_paths' and
+    'median_depletion_age'.
+    """
+    years_to_fire = max(fire_age - current_age, 0)
+    years_in_bridge = max(access_age - fire_age, 0)
+    total_years = years_to_fire + years_in_bridge + post_access_years
+    effective_return = return_rate * 0.85
+    effective_volatility = volatility * 0.85
+    if streaming is None:
+        streaming = n_paths >= STREAMING_MIN_PATHS
+
+    if sampler not in SAMPLERS:
+        raise ValueError(f"Unknown sampler '{sampler}'. Use one of {SAMPLERS}.")
+
+    model = None
+    if control_variate:
+        model = _funding_ratio_model(current_age, fire_age, annual_spend, current_investable, monthly_savings,
+                                     return_rate, inflation_rate, effective_volatility, access_age,
+                                     post_access_years, total_years)
+    estimate = _RunningEstimate(len(CONTROL_THRESHOLDS) if model else 0)
+    depletions = np.zeros(total_years, dtype=np.int64)  # failed paths by depletion year
+    sketch = QuantileSketch(total_years) if streaming else None
+    balances = []
+
+    blocks = iter_blocks(
+        _simulate_fire_block, n_paths, seed, workers=workers,
+        min_blocks=QMC_REPLICATES if sampler == "sobol" else 1, progress=progress,
+        years_to_fire=years_to_fire, years_in_bridge=years_in_bridge, total_years=total_years,
+        annual_spend=annual_spend, current_investable=current_investable, monthly_savings=monthly_savings,
+        inflation_rate=inflation_rate, effective_return=effective_return,
+        effective_volatility=effective_volatility, sampler=sampler, antithetic=antithetic,
+        model=model, streaming=streaming, chunk_size=chunk_size
+    )
+    for block in blocks:
+        estimate.merge(block['estimate'])
+        depletions += block['depletions']
+        if streaming:
+            sketch.merge(block['sketch'])
+        else:
+            balances.append(block['balances'])
+
+    control_means = norm.cdf(model[1] - np.array(CONTROL_THRESHOLDS)) if model else None
+    success_probability, success_se = estimate.result(control_means)
+
+    if streaming:
+        percentiles = sketch.percentiles(FAN_PERCENTILES)
+    else:
+        _, percentiles = percentile_bands(np.vstack(balances) if balances else np.empty((0, total_years)),
+                                          FAN_PERCENTILES)
+    names = [f"p{p}" for p in FAN_PERCENTILES]
+    median_depletion = _histogram_median(depletions)
+    return ProjectionResult.from_block(['ages'] + names, np.vstack([current_age + np.arange(total_years), percentiles]), {
+        'success_probability': success_probability,
+        'success_probability_se': success_se,
+        'n_paths': n_paths,
+        'median_depletion_age': float(current_age + median_depletion) if median_depletion is not None else None,
+    })
+
+
+def _simulate_fire_block(size, seed_sequence, years_to_fire, years_in_bridge, total_years, annual_spend,
+                         current_investable, monthly_savings, inflation_rate, effective_return,
+                         effective_volatility, sampler, antithetic, model, streaming, chunk_size):
+    """
+    Simulates one block of paths from its own RNG stream (runs in a pool worker).
+
+    Returns the block's running estimate, depletion-year counts and either
+    its QuantileSketch (streaming) or its balances matrix.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    estimate = _RunningEstimate(len(CONTROL_THRESHOLDS) if model else 0)
+    depletions = np.zeros(total_years, dtype=np.int64)
+    sketch = QuantileSketch(total_years) if streaming else None
+    balances = []
+
+    for normals, groups in _normal_chunks(size, total_years, sampler, antithetic, rng, chunk_size):
+        returns = effective_return + effective_volatility * normals
+        chunk_balances, depleted_at = _run_fire_paths(
+            returns, years_to_fire, years_in_bridge, annual_spend, current_investable,
+            monthly_savings, inflation_rate
+        )
+        if streaming:
+            sketch.add(chunk_balances)
+        else:
+            balances.append(chunk_balances)
+        depletions += np.bincount(depleted_at[depleted_at >= 0], minlength=total_years)
+
+        outcomes = (depleted_at < 0).astype(np.float64)[:, np.newaxis]
+        if model:
+            outcomes = np.hstack([outcomes, _funding_ratio_controls(normals, *model)])
+        estimate.add(outcomes, groups)
+
+    return {
+        'estimate': estimate,
+        'depletions': depletions,
+        'sketch': sketch,
+        'balances': np.vstack(balances) if balances else np.empty((0, total_years)),
+    }
+
+
+def _normal_chunks(n_paths, n_years, sampler, antithetic, rng, chunk_size):
+    """
+    Yields (normals, groups) chunks of at most `chunk_size` paths for one block.
+
+    `groups` labels the paths (or antithetic pairs) that are independent of
+    each other, for the standard error; a Sobol block is one scrambled
+    sequence, so it is a single group. Antithetic partners sit next to each
+    other and never straddle a chunk. The draws do not depend on `chunk_size`.
+    """
+    if antithetic:
+        chunk_size += chunk_size % 2
+
+    if sampler == "pseudo" or n_years == 0:
+        for start in range(0, n_paths, chunk_size):
+            size = min(chunk_size, n_paths - start)
+            if not antithetic:
+                yield rng.standard_normal((size, n_years)), np.arange(start, start + size)
+            else:
+                yield _antithetic(rng.standard_normal(((size + 1) // 2, n_years)), size), np.arange(start, start + size) // 2
+        return
+
+    engine = qmc.Sobol(n_years, scramble=True, seed=rng)
+    for start in range(0, n_paths, chunk_size):
+        size = min(chunk_size, n_paths - start)
+        with warnings.catch_warnings():
+            # Sobol warns about point counts that aren't powers of two; the leading points are still well spread
+            warnings.simplefilter("ignore", UserWarning)
+            points = engine.random((size + 1) // 2 if antithetic else size)
+        normals = norm.ppf(np.clip(points, 1e-12, 1 - 1e-12))
+        yield (_antithetic(normals, size) if antithetic else normals), np.zeros(size, dtype=np.int64)
+
+
+def _antithetic(half, n_paths):
+    """Interleaves draws with their mirror images (z, -z, z, -z, ...), trimmed to n_paths."""
+    normals = np.empty((2 * len(half), half.shape[1]))
+    normals[0::2] = half
+    normals[1::2] = -half
+    return normals[:n_paths]
+
+
+def _funding_ratio_model(current_age, fire_age, annual_spend, current_investable, monthly_savings,
+                         return_rate, inflation_rate, effective_volatility, access_age, post_access_years,
+                         total_years):
+    """
+    Linearised log funding ratio for the control variates.
+
+    A path survives the bridge roughly when its FIRE balance covers the
+    present value of the bridge spending at its own returns. The log of that
+    funding ratio, linearised around the deterministic model's closed-form
+    values (FIRE starting balance and required capital, both annuities), is
+    a weighted sum of the normal draws, so it is exactly normal.
+
+    Returns (weights, center) with the ratio standardised to
+    center + normals @ weights, or None when there is nothing to control
+    (no bridge, no volatility, nothing saved).
+    """
+    years_to_fire = max(fire_age - current_age, 0)
+    years_in_bridge = max(access_age - fire_age, 0)
+    projection = calculate_fire_projection(current_age, fire_age, annual_spend, current_investable, monthly_savings,
+                                           return_rate, inflation_rate, access_age=access_age,
+                                           post_access_years=post_access_years)
+    effective_return = projection['effective_return']
+    fire_balance = projection['fire_starting_balance']
+    required_capital = calculate_required_capital(annual_spend, inflation_rate, effective_return,
+                                                  years_to_fire, years_in_bridge)
+    if years_in_bridge == 0 or fire_balance <= 0 or effective_volatility == 0:
+        return None
+
+    # d ln(FIRE balance) / d return: balance entering each accumulation year, grown to the FIRE age
+    weights = np.zeros(total_years)
+    before = np.concatenate([[current_investable], projection['balances'][:years_to_fire - 1]])[:years_to_fire]
+    weights[:years_to_fire] = before * (1 + effective_return) ** np.arange(years_to_fire - 1, -1, -1) / fire_balance
+    # -d ln(required capital) / d return: present value of the spending still to come after each bridge year
+    spend = annual_spend * (1 + inflation_rate) ** years_to_fire
+    spend_pv = spend * ((1 + inflation_rate) / (1 + effective_return)) ** np.arange(years_in_bridge)
+    remaining = np.cumsum(spend_pv[::-1])[::-1] - spend_pv
+    weights[years_to_fire:years_to_fire + years_in_bridge] = remaining / ((1 + effective_return) * required_capital)
+
+    scale = np.linalg.norm(weights)
+    return weights / scale, np.log(fire_balance / required_capital) / (effective_volatility * scale)
+
+
+def _funding_ratio_controls(normals, weights, center):
+    """
+    Control variates, one column per CONTROL_THRESHOLDS entry: whether the
+    standardised funding ratio clears the threshold. Each has mean
+    norm.cdf(center - threshold) exactly.
+    """
+    return ((center + normals @ weights)[:, np.newaxis] > np.array(CONTROL_THRESHOLDS)).astype(np.float64)
+
+
+class _RunningEstimate:
+    """
+    Success rate with control variates and its standard error, from running totals.
+
+    Each added row is [outcome, control 1, ...]. Path-level moments give the
+    control coefficients; moments of the group means give the standard
+    error, since paths within a group (antithetic pair, Sobol block) are
+    not independent. Groups must arrive contiguously and in order.
+    """
+
+    def __init__(self, n_controls):
+        k = n_controls + 1
+        self.n, self.total, self.cross = 0, np.zeros(k), np.zeros((k, k))
+        self.groups, self.group_total, self.group_cross = 0, np.zeros(k), np.zeros((k, k))
+        self._open = None  # (group id, sum, count) of the group the last chunk ended in
+
+    def add(self, values, groups):
+        self.n += len(values)
+        self.total += values.sum(axis=0)
+        self.cross += values.T @ values
+
+        starts = np.flatnonzero(np.diff(groups, prepend=groups[0] - 1))
+        sums = np.add.reduceat(values, starts, axis=0)
+        counts = np.diff(np.append(starts, len(values)))
+        if self._open is not None:
+            group, open_sum, open_count = self._open
+            if group == groups[0]:
+                sums[0] += open_sum
+                counts[0] += open_count
+            else:
+                self._close(open_sum[np.newaxis], np.array([open_count]))
+        self._close(sums[:-1], counts[:-1])
+        self._open = (groups[-1], sums[-1], counts[-1])
+
+    def merge(self, other):
+        """Adds another estimate's totals (e.g. a block's); its groups must be separate from ours."""
+        self._flush()
+        other._flush()
+        self.n += other.n
+        self.total += other.total
+        self.cross += other.cross
+        self.groups += other.groups
+        self.group_total += other.group_total
+        self.group_cross += other.group_cross
+
+    def _flush(self):
+        """Closes the group the last chunk ended in."""
+        if self._open is not None:
+            self._close(self._open[1][np.newaxis], np.array([self._open[2]]))
+            self._open = None
+
+    def _close(self, sums, counts):
+        means = sums / counts[:, np.newaxis]
+        self.groups += len(means)
+        self.group_total += means.sum(axis=0)
+        self.group_cross += means.T @ means
+
+    def result(self, control_means=None):
+        """(estimate, standard error)."""
+        self._flush()
+        if self.n == 0:
+            return 0.0, 0.0
+
+        mean = self.total / self.n
+        coefficients = np.array([1.0])
+        estimate = mean[0]
+        if control_means is not None:
+            covariance = self.cross / self.n - np.outer(mean, mean)
+            beta = np.linalg.lstsq(covariance[1:, 1:], covariance[1:, 0], rcond=None)[0]
+            estimate = mean[0] - (mean[1:] - control_means) @ beta
+            coefficients = np.concatenate([[1.0], -beta])
+
+        se = 0.0
+        if self.groups > 1:
+            group_mean = self.group_total / self.groups
+            group_covariance = (self.group_cross - self.groups * np.outer(group_mean, group_mean)) / (self.groups - 1)
+            se = float(np.sqrt(max(coefficients @ group_covariance @ coefficients, 0.0) / self.groups))
+        return float(np.clip(estimate, 0.0, 1.0)), se
+
+
+def _histogram_median(counts):
+    """Median of the values behind a histogram of integer values (as np.median), or None if empty."""
+    total = counts.sum()
+    if total == 0:
+        return None
+    cumulative = np.cumsum(counts)
+    low = np.searchsorted(cumulative, (total - 1) // 2, side="right")
+    high = np.searchsorted(cumulative, total // 2, side="right")
+    return (low + high) / 2
+
+
+def _run_fire_paths(returns, years_to_fire, years_in_bridge, annual_spend, current_investable,
+                    monthly_savings, inflation_rate):
+    """
+    Steps a (paths x years) matrix of annual returns through the FIRE phases.
+    Mirrors the deterministic engine: balances are recorded at year end during
+    accumulation and at the start of each bridge year.
+    """
+    n_paths, total_years = returns.shape
+    balances = np.empty((n_paths, total_years))
+    depleted_at = np.full(n_paths, -1, dtype=np.int64)
+    balance = np.full(n_paths, float(current_investable))
+
+    # A. Accumulation
+    for i in range(years_to_fire):
+        balance = balance * (1 + returns[:, i]) + monthly_savings * 12
+        balances[:, i] = balance
+
+    # B. Bridge drawdown (spend at the beginning of the year)
+    spend = annual_spend * ((1 + inflation_rate) ** years_to_fire)
+    for i in range(years_to_fire, years_to_fire + years_in_bridge):
+        balances[:, i] = balance
+        balance = balance - spend
+        newly_depleted = (balance < 0) & (depleted_at < 0)
+        depleted_at[newly_depleted] = i
+        balance = np.maximum(balance, 0) * (1 + returns[:, i])
+        spend *= (1 + inflation_rate)
+
+    # C. Post super access
+    balances[:, years_to_fire + years_in_bridge:] = balance[:, np.newaxis]
+    return balances, depleted_at
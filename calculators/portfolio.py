@@ -0,0 +1,266 @@
+import numpy as np
+from utils.tax import (calculate_income_tax, calculate_stamp_duty, calculate_stamp_duty_array, calculate_lmi,
+                       calculate_lmi_array, calculate_land_tax_array, LMI_BANDS)
+from utils.results import ProjectionResult
+from utils.cache import cached_projection
+
+LEGAL_COSTS = 2000
+LAND_VALUE_SHARE = 0.6
+MAX_LVR = 0.80  # Lenders' usual limit for equity release without LMI
+
+# Defaults for any field a property omits (mirror the Tier 2 inputs)
+PROPERTY_DEFAULTS = {
+    "price": 650000, "state": "NSW", "purchase_year": 0, "growth": 0.058, "yield_rate": 0.02,
+    "maint": 0.01, "mgmt": 0.07, "rates": 2500, "deposit": 0
+}
+
+PORTFOLIO_SERIES = ("net_wealth", "tax_saved", "tax_saved_yearly", "loan_balance",
+                    "portfolio_value", "rent", "land_tax", "net_cash")
+
+
+def _finance_purchase(prop, portfolio_value, portfolio_debt, cross_collateralise):
+    """
+    Works out how one purchase is funded. Acquisition costs are borrowed like
+    Tier 2 (price + stamp duty + legals, less any cash deposit). With
+    cross-collateralisation, the part of that above 80% of the new property's
+    value is secured against spare equity in the properties already held, and
+    LMI only applies to whatever that equity cannot cover.
+    """
+    price = prop["price"]
+    stamp_duty = calculate_stamp_duty(prop["state"], price)
+    borrowed = max(price + stamp_duty + LEGAL_COSTS - prop["deposit"], 0)
+
+    equity_released = 0.0
+    if cross_collateralise:
+        usable_equity = max(portfolio_value * MAX_LVR - portfolio_debt, 0)
+        equity_released = min(usable_equity, max(borrowed - price * MAX_LVR, 0))
+
+    secured = borrowed - equity_released
+    lmi = calculate_lmi(secured, price) if price > 0 and secured / price > MAX_LVR else 0
+    return {
+        "stamp_duty": stamp_duty,
+        "lmi": lmi,
+        "equity_released": equity_released,
+        "loan": borrowed + lmi,
+    }
+
+
+@cached_projection
+def calculate_portfolio_projection(properties, interest_rate, tax_rate, loan_type="Interest Only",
+                                   loan_term=30, years=10, cross_collateralise=True,
+                                   collateral_value=0, collateral_debt=0):
+    """
+    Projects a multi-property portfolio with staggered purchases.
+
+    `properties` is a list of dicts (see PROPERTY_DEFAULTS); `purchase_year` is
+    the 0-based projection year the property is bought at the start of. Each
+    year steps every property at once (growth, loan, rent and costs as in
+    `calculate_ip_projection`), then assesses land tax on the total land value
+    held in each state and applies negative gearing to the portfolio's net cash.
+    `collateral_value`/`collateral_debt` describe assets outside the portfolio
+    (e.g. the home, at today's value) whose equity purchases can also draw on.
+
+    Returns a ProjectionResult with the PORTFOLIO_SERIES totals. Scalars hold
+    the per-purchase funding ('purchases'), per-property values and loans
+    ('property_values', 'property_loans': properties x years) and
+    'land_tax_by_state'.
+    """
+    props = [dict(PROPERTY_DEFAULTS, **p) for p in properties]
+    n = len(props)
+
+    price = np.array([p["price"] for p in props], dtype=np.float64)
+    growth = np.array([p["growth"] for p in props], dtype=np.float64)
+    yield_rate = np.array([p["yield_rate"] for p in props], dtype=np.float64)
+    maint = np.array([p["maint"] for p in props], dtype=np.float64)
+    mgmt = np.array([p["mgmt"] for p in props], dtype=np.float64)
+    rates = np.array([p["rates"] for p in props], dtype=np.float64)
+    purchase_year = np.array([p["purchase_year"] for p in props], dtype=np.int64)
+    states = sorted({p["state"] for p in props})
+    state_masks = {state: np.array([p["state"] == state for p in props]) for state in states}
+
+    block = np.zeros((len(PORTFOLIO_SERIES), years))
+    net_wealth, tax_saved_cum, tax_saved_yearly, loan_balances, portfolio_value, rent_total, land_tax_total, net_cash_total = block
+    property_values = np.zeros((n, years))
+    property_loans = np.zeros((n, years))
+    land_tax_by_state = {state: np.zeros(years) for state in states}
+
+    current_val = np.zeros(n)
+    current_loan = np.zeros(n)
+    yearly_payment = np.zeros(n)
+    active = np.zeros(n, dtype=bool)
+    purchases = [None] * n
+    total_tax_saved = 0
+
+    for i in range(years):
+        # Purchases at the start of the year, in list order, against the equity held so far
+        for k in np.flatnonzero(purchase_year == i):
+            funding = _finance_purchase(props[k], collateral_value + current_val[active].sum(),
+                                        collateral_debt + current_loan[active].sum(), cross_collateralise)
+            purchases[k] = dict(funding, year=i)
+            current_val[k] = price[k]
+            current_loan[k] = funding["loan"]
+            if loan_type == "Principal & Interest":
+                if interest_rate > 0:
+                    yearly_payment[k] = (current_loan[k] * interest_rate * (1 + interest_rate)**loan_term) / ((1 + interest_rate)**loan_term - 1)
+                else:
+                    yearly_payment[k] = current_loan[k] / loan_term
+            active[k] = True
+
+        # Value growth (held properties only)
+        current_val = np.where(active, current_val * (1 + growth), 0.0)
+
+        # Interest & principal
+        interest = current_loan * interest_rate
+        if loan_type == "Interest Only":
+            principal_paid = np.zeros(n)
+        else:
+            principal_paid = yearly_payment - interest
+            paid_off = principal_paid > current_loan
+            principal_paid = np.where(paid_off, current_loan, principal_paid)
+            interest = np.where(paid_off, 0.0, interest)
+
+        # Income & expenses per property
+        rent = current_val * yield_rate
+        expenses = interest + current_val * maint + rent * mgmt + np.where(active, rates, 0.0)
+
+        # Land tax on the aggregate land value held in each state
+        land_tax = 0.0
+        for state in states:
+            state_land = (current_val[state_masks[state]] * LAND_VALUE_SHARE).sum()
+            land_tax_by_state[state][i] = calculate_land_tax_array(state, state_land)
+            land_tax += land_tax_by_state[state][i]
+
+        net_cash = rent.sum() - (expenses.sum() + land_tax)
+
+        # Tax impact (losses offset other income; profits are taxed)
+        current_tax_saving = -(net_cash * tax_rate)
+        total_tax_saved += current_tax_saving
+        tax_saved_cum[i] = total_tax_saved
+        tax_saved_yearly[i] = current_tax_saving
+
+        # Update loans
+        current_loan = current_loan - principal_paid
+
+        property_values[:, i] = current_val
+        property_loans[:, i] = current_loan
+        portfolio_value[i] = current_val.sum()
+        loan_balances[i] = current_loan.sum()
+        net_wealth[i] = portfolio_value[i] - loan_balances[i]
+        rent_total[i] = rent.sum()
+        land_tax_total[i] = land_tax
+        net_cash_total[i] = net_cash
+
+    for matrix in (property_values, property_loans):
+        matrix.flags.writeable = False
+    return ProjectionResult.from_block(PORTFOLIO_SERIES, block, {
+        "purchases": purchases,
+        "property_values": property_values,
+        "property_loans": property_loans,
+        "land_tax_by_state": land_tax_by_state,
+    })
+
+
+# --- Purchase scheduler ---
+
+ASSESSMENT_BUFFER = 0.03  # APRA serviceability buffer over the actual rate
+RENT_SHADING = 0.80  # Share of rent lenders count as income
+MAX_DEBT_TO_INCOME = 6.0
+ASSESSMENT_TERM = 30
+
+
+def _loan_balance_after(loan, rate, payment, periods):
+    """Closed-form P&I balance after `periods` annual payments (floored at zero)."""
+    if rate > 0:
+        growth = (1 + rate) ** periods
+        balance = loan * growth - payment * (growth - 1) / rate
+    else:
+        balance = loan - payment * periods
+    return np.maximum(balance, 0.0)
+
+
+@cached_projection
+def schedule_purchases(target_price, state, growth, yield_rate, annual_income, interest_rate, tax_rate,
+                       home_value=0, home_loan=0, living_expenses=40000, max_properties=5, years=20,
+                       price_growth=None, income_growth=0.03, expense_inflation=0.03,
+                       loan_type="Interest Only", loan_term=30, maint=0.01, mgmt=0.07, rates=2500):
+    """
+    Walks forward year by year and buys the next property as soon as it is affordable.
+
+    A purchase in year t (price grown by `price_growth`, default the property's
+    growth) is feasible when:
+      - equity: the costs above 80% of the price are covered by spare equity in
+        the home and the properties already held, so no LMI is payable (the
+        threshold is the first LMI band);
+      - serviceability: after-tax income plus shaded rent covers living costs
+        and repayments on all debt at the assessment rate (actual + buffer);
+      - debt-to-income stays within MAX_DEBT_TO_INCOME.
+
+    Every candidate year is assessed at once against compiled stamp duty and
+    LMI tables, so each purchase costs a handful of array operations.
+    Returns {'timeline': [purchase dicts], 'properties': [portfolio inputs],
+    'projection': calculate_portfolio_projection result}.
+    """
+    price_growth = growth if price_growth is None else price_growth
+    max_lvr = LMI_BANDS[0][0]
+    t = np.arange(years)
+
+    # Paths that do not depend on the purchases
+    prices = target_price * (1 + price_growth) ** t
+    stamp_duty = calculate_stamp_duty_array(state, prices)
+    borrowed = prices + stamp_duty + LEGAL_COSTS
+    salary = annual_income * (1 + income_growth) ** t
+    salary_after_tax = salary - np.array([calculate_income_tax(s) for s in salary])
+    living = living_expenses * (1 + expense_inflation) ** t
+    assessed_rate = interest_rate + ASSESSMENT_BUFFER
+    repayment_factor = assessed_rate * (1 + assessed_rate) ** ASSESSMENT_TERM / ((1 + assessed_rate) ** ASSESSMENT_TERM - 1)
+
+    # Portfolio held so far, valued at the start of every year
+    held_value = np.zeros(years)
+    held_debt = np.zeros(years)
+    held_rent = np.zeros(years)
+    timeline, properties = [], []
+    next_year = 0
+
+    while len(timeline) < max_properties and next_year < years:
+        window = slice(next_year, years)
+        equity = max_lvr * (home_value + held_value[window]) - (home_loan + held_debt[window])
+        needed = borrowed[window] - max_lvr * prices[window]
+        released = np.minimum(np.maximum(equity, 0), np.maximum(needed, 0))
+        lvr = (borrowed[window] - released) / prices[window]
+        lmi = calculate_lmi_array(borrowed[window] - released, prices[window])
+
+        total_debt = home_loan + held_debt[window] + borrowed[window]
+        rent = held_rent[window] + prices[window] * yield_rate
+        surplus = salary_after_tax[window] + RENT_SHADING * rent - living[window] - total_debt * repayment_factor
+        dti = total_debt / (salary[window] + rent)
+
+        feasible = (lmi == 0) & (lvr <= max_lvr) & (surplus >= 0) & (dti <= MAX_DEBT_TO_INCOME)
+        if not feasible.any():
+            break
+        offset = int(np.argmax(feasible))
+        year = next_year + offset
+
+        timeline.append({
+            "year": year, "price": float(prices[year]), "stamp_duty": float(stamp_duty[year]),
+            "equity_released": float(released[offset]), "lvr": float(lvr[offset]),
+            "serviceability_surplus": float(surplus[offset]), "debt_to_income": float(dti[offset]),
+        })
+        properties.append({
+            "price": float(prices[year]), "state": state, "purchase_year": year, "growth": growth,
+            "yield_rate": yield_rate, "maint": maint, "mgmt": mgmt, "rates": rates,
+        })
+
+        # Fold the new property into the held paths from its purchase year
+        ahead = t[year:] - year
+        held_value[year:] += prices[year] * (1 + growth) ** ahead
+        held_rent[year:] += prices[year] * (1 + growth) ** ahead * yield_rate
+        if loan_type == "Principal & Interest":
+            payment = borrowed[year] * interest_rate * (1 + interest_rate)**loan_term / ((1 + interest_rate)**loan_term - 1) if interest_rate > 0 else borrowed[year] / loan_term
+            held_debt[year:] += _loan_balance_after(borrowed[year], interest_rate, payment, ahead)
+        else:
+            held_debt[year:] += borrowed[year]
+        next_year = year + 1
+
+    projection = calculate_portfolio_projection(properties, interest_rate, tax_rate, loan_type, loan_term, years,
+                                                collateral_value=home_value, collateral_debt=home_loan) if properties else None
+    return {"timeline": timeline, "properties": properties, "projection": projection}
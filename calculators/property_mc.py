@@ -0,0 +1,182 @@
+import numpy as np
+from utils.results import ProjectionResult
+from utils.cache import cached_projection
+from utils.downsample import percentile_bands
+from utils.simulation import iter_blocks
+from utils.tax import calculate_land_tax_array
+from calculators.monte_carlo import DEFAULT_SEED, FAN_PERCENTILES
+
+# Annual shocks simulated per path, in the row/column order of PROPERTY_CORRELATION
+PROPERTY_FACTORS = ("growth", "rent", "rate", "vacancy")
+
+# Correlation of the annual shocks: rate rises weigh on prices, and weak
+# rental markets bring both softer rents and longer vacancies (simplified)
+PROPERTY_CORRELATION = (
+    (1.0, 0.4, -0.3, -0.2),
+    (0.4, 1.0, 0.1, -0.5),
+    (-0.3, 0.1, 1.0, 0.1),
+    (-0.2, -0.5, 0.1, 1.0),
+)
+
+# --- DEFAULT RISK ASSUMPTIONS ---
+GROWTH_VOLATILITY = 0.08    # sd of annual capital growth
+GROWTH_PERSISTENCE = 0.5    # year-to-year autocorrelation of growth, so booms and drawdowns last several years
+RENT_VOLATILITY = 0.04      # sd of annual rent growth
+RATE_VOLATILITY = 0.0075    # sd of the annual move in the (variable) loan rate
+RATE_REVERSION = 0.2        # share of the gap back to the starting rate closed each year
+VACANCY_RATE = 0.04         # mean share of the year untenanted (about two weeks)
+VACANCY_VOLATILITY = 0.8    # log-sd of the vacancy share
+
+# Land value as a share of property value for land tax (as calculate_ip_projection)
+LAND_SHARE = 0.6
+
+# Paths shown on the Tier 2 page (a 30-year run takes well under a second)
+PAGE_PATHS = 20000
+PAGE_YEARS = 30
+
+
+def simulate_property_paths(price, loan, growth, yield_rate, interest_rate, tax_rate, maint, mgmt, rates, state,
+                            loan_type="Interest Only", loan_term=30, years=PAGE_YEARS,
+                            growth_volatility=GROWTH_VOLATILITY, rent_volatility=RENT_VOLATILITY,
+                            rate_volatility=RATE_VOLATILITY, vacancy_rate=VACANCY_RATE,
+                            correlation=PROPERTY_CORRELATION, n_paths=PAGE_PATHS, seed=DEFAULT_SEED,
+                            workers=None, progress=None):
+    """
+    Monte Carlo version of `calculate_ip_projection` (tier2).
+
+    Instead of constant growth, yield and loan rate, every path draws
+    correlated annual shocks (PROPERTY_FACTORS) through the Cholesky factor
+    of `correlation`:
+    - capital growth around `growth`, autocorrelated (GROWTH_PERSISTENCE) so
+      drawdowns run over several years;
+    - rent, starting at `yield_rate` of the price and growing around `growth`;
+    - a variable loan rate mean-reverting to `interest_rate` (P&I repayments
+      are re-set each year for the remaining term);
+    - the share of the year the property is vacant, averaging `vacancy_rate`.
+    Expenses, land tax and the tax on net rent follow the deterministic engine;
+    with zero volatilities and vacancy it reproduces it.
+
+    Paths are simulated as (paths x years) arrays in blocks (utils.simulation),
+    so the result is identical for any number of `workers`. Net equity can be
+    negative (the loan includes costs), so the equity paths are kept in memory
+    rather than sketched: 8 bytes per path-year, 5 MB at the page's 20,000 x 30.
+
+    Returns a ProjectionResult with the series 'years', 'equity_p10' ...
+    'equity_p90' (net equity fan), 'cash_flow_p10' / 'p50' / 'p90' (after-tax
+    cash flow) and 'negative_cash_probability' (share of paths with a
+    negative cash flow in each year), and the scalars 'n_paths',
+    'negative_equity_probability' (final year), 'final_equity_mean' and
+    'negative_years_mean' / 'p10' / 'p50' / 'p90' (negative cash-flow years
+    per path).
+    """
+    correlation = np.asarray(correlation, dtype=np.float64)
+    if correlation.shape != (len(PROPERTY_FACTORS), len(PROPERTY_FACTORS)) or not np.allclose(correlation, correlation.T) \
+            or not np.allclose(np.diag(correlation), 1.0):
+        raise ValueError(f"correlation must be a symmetric {len(PROPERTY_FACTORS)}x{len(PROPERTY_FACTORS)} "
+                         f"correlation matrix ({', '.join(PROPERTY_FACTORS)}).")
+    try:
+        cholesky = np.linalg.cholesky(correlation)
+    except np.linalg.LinAlgError:
+        raise ValueError("correlation must be positive definite.")
+
+    equity, cash_flow = [], []
+    blocks = iter_blocks(
+        _simulate_property_block, n_paths, seed, workers=workers, progress=progress, cholesky=cholesky,
+        years=years, price=price, loan=loan, growth=growth, yield_rate=yield_rate, interest_rate=interest_rate,
+        tax_rate=tax_rate, maint=maint, mgmt=mgmt, rates=rates, state=state, loan_type=loan_type,
+        loan_term=loan_term, volatilities=(growth_volatility, rent_volatility, rate_volatility, VACANCY_VOLATILITY),
+        vacancy_rate=vacancy_rate
+    )
+    for block in blocks:
+        equity.append(block['equity'])
+        cash_flow.append(block['cash_flow'])
+    equity = np.vstack(equity) if equity else np.empty((0, years))
+    cash_flow = np.vstack(cash_flow) if cash_flow else np.empty((0, years))
+
+    _, equity_bands = percentile_bands(equity, FAN_PERCENTILES)
+    _, cash_bands = percentile_bands(cash_flow, (10, 50, 90))
+    negative = cash_flow < 0
+    negative_years = negative.sum(axis=1)
+    years_p10, years_p50, years_p90 = np.percentile(negative_years, (10, 50, 90))
+
+    names = (['years'] + [f"equity_p{p}" for p in FAN_PERCENTILES]
+             + ['cash_flow_p10', 'cash_flow_p50', 'cash_flow_p90', 'negative_cash_probability'])
+    block = np.vstack([np.arange(1, years + 1), equity_bands, cash_bands, negative.mean(axis=0)])
+    return ProjectionResult.from_block(names, block, {
+        'n_paths': n_paths,
+        'negative_equity_probability': float((equity[:, -1] < 0).mean()),
+        'final_equity_mean': float(equity[:, -1].mean()),
+        'negative_years_mean': float(negative_years.mean()),
+        'negative_years_p10': float(years_p10),
+        'negative_years_p50': float(years_p50),
+        'negative_years_p90': float(years_p90),
+    })
+
+
+@cached_projection
+def calculate_property_risk(price, loan, growth, yield_rate, interest_rate, tax_rate, maint, mgmt, rates, state,
+                           loan_type="Interest Only", loan_term=30):
+    """The Tier 2 page's simulation (PAGE_PATHS x PAGE_YEARS, default risk assumptions), cached on its inputs."""
+    return simulate_property_paths(price, loan, growth, yield_rate, interest_rate, tax_rate, maint, mgmt, rates,
+                                   state, loan_type, loan_term)
+
+
+def _simulate_property_block(size, seed_sequence, cholesky, years, **params):
+    """Simulates one block of paths from its own RNG stream (runs in a pool worker)."""
+    rng = np.random.default_rng(seed_sequence)
+    shocks = rng.standard_normal((size, years, len(PROPERTY_FACTORS))) @ cholesky.T
+    equity, cash_flow = _run_property_paths(shocks, **params)
+    return {'equity': equity, 'cash_flow': cash_flow}
+
+
+def _run_property_paths(shocks, price, loan, growth, yield_rate, interest_rate, tax_rate, maint, mgmt, rates, state,
+                        loan_type, loan_term, volatilities, vacancy_rate):
+    """
+    Steps a (paths x years x factors) array of correlated standard normal
+    shocks through the property cash flows. Mirrors calculate_ip_projection
+    year by year; returns (net equity, after-tax cash flow), each paths x years.
+    """
+    n_paths, years, _ = shocks.shape
+    growth_volatility, rent_volatility, rate_volatility, vacancy_volatility = volatilities
+    equity = np.empty((n_paths, years))
+    cash_flow = np.empty((n_paths, years))
+
+    value = np.full(n_paths, float(price))
+    balance = np.full(n_paths, float(loan))
+    rent = np.full(n_paths, price * yield_rate)
+    rate = np.full(n_paths, float(interest_rate))
+    growth_gap = np.zeros(n_paths)
+    persistence = np.sqrt(1 - GROWTH_PERSISTENCE ** 2)
+
+    for i in range(years):
+        growth_shock, rent_shock, rate_shock, vacancy_shock = np.moveaxis(shocks[:, i], 1, 0)
+
+        # Value, rent and loan rate
+        growth_gap = GROWTH_PERSISTENCE * growth_gap + persistence * growth_volatility * growth_shock
+        value = value * np.maximum(1 + growth + growth_gap, 0)
+        rent = rent * np.maximum(1 + growth + rent_volatility * rent_shock, 0)
+        rate = np.maximum(rate + RATE_REVERSION * (interest_rate - rate) + rate_volatility * rate_shock, 0)
+        vacancy = np.minimum(vacancy_rate * np.exp(vacancy_volatility * vacancy_shock - vacancy_volatility ** 2 / 2), 1)
+
+        # Interest & principal (P&I re-amortised over the remaining term at this year's rate)
+        interest = balance * rate
+        if loan_type == "Interest Only":
+            principal = 0
+        else:
+            remaining = max(loan_term - i, 1)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                growth_factor = (1 + rate) ** remaining
+                payment = np.where(rate > 0, balance * rate * growth_factor / (growth_factor - 1), balance / remaining)
+            principal = np.minimum(payment - interest, balance)
+
+        # Expenses
+        collected = rent * (1 - vacancy)
+        land_tax = calculate_land_tax_array(state, value * LAND_SHARE)
+        net_cash = collected - (interest + value * maint + collected * mgmt + rates + land_tax)
+
+        # Losses are deducted at the marginal rate (negative gearing), profits taxed at it
+        cash_flow[:, i] = net_cash * (1 - tax_rate)
+        balance = balance - principal
+        equity[:, i] = value - balance
+
+    return equity, cash_flow
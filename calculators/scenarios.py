@@ -0,0 +1,282 @@
+import streamlit as st
+import pandas as pd
+from calculators.engines import run_strategy, run_super, run_fire, STRATEGY_DEFAULTS, SUPER_DEFAULTS, FIRE_DEFAULTS
+from calculators.fire import calculate_required_capital
+from calculators.tier5_legacy import calculate_estate_tax
+from utils.cache import make_key
+from utils.share import encode_scenario, decode_scenario, SHARE_QUERY_PARAM
+
+# Session key holding the workspace: {scenario name: input set}
+WORKSPACE_KEY = "scenario_workspace"
+# Session key holding the share token last restored or published, so reruns don't restore it again
+SHARED_TOKEN_KEY = "_shared_token"
+BASELINE_NAME = "Current Plan"
+MAX_SCENARIOS = 4  # Current plan + three what-ifs
+
+LEGACY_DEFAULTS = {"taxable_portion": 0.85}
+
+# Input set sections -> (defaults, engine). Legacy has no engine; it reuses the super projection.
+SECTIONS = {
+    "strategy": (STRATEGY_DEFAULTS, run_strategy),
+    "super": (SUPER_DEFAULTS, run_super),
+    "fire": (FIRE_DEFAULTS, run_fire),
+    "legacy": (LEGACY_DEFAULTS, None),
+}
+
+# (key, label) of the metrics compared across scenarios
+SCENARIO_METRICS = (
+    ("shares_net_wealth", "Shares Net Wealth (10y)"),
+    ("property_net_wealth", "Property Net Wealth (10y)"),
+    ("shares_tax_saved", "Shares Tax Saved (10y)"),
+    ("property_tax_saved", "Property Tax Saved (10y)"),
+    ("super_at_retirement", "Super at Retirement (High Growth)"),
+    ("fire_gap", "FIRE Gap (Shortfall at FIRE Age)"),
+    ("estate_tax", "Potential Estate Tax"),
+)
+
+# (section, field, label, kind) of the inputs a what-if can change
+EDITABLE_FIELDS = (
+    ("strategy", "income", "Household Income ($)", "currency"),
+    ("strategy", "dr_amount", "Share Investment ($)", "currency"),
+    ("strategy", "ip_price", "Property Price ($)", "currency"),
+    ("strategy", "loan_rate", "Loan Interest Rate (%)", "percent"),
+    ("super", "current_balance", "Current Super Balance ($)", "currency"),
+    ("super", "voluntary_contrib", "Voluntary Super Contributions ($/year)", "currency"),
+    ("super", "retirement_age", "Retirement Age", "age"),
+    ("fire", "fire_age", "FIRE Age", "age"),
+    ("fire", "annual_spend", "FIRE Annual Spend ($)", "currency"),
+    ("fire", "monthly_savings", "Monthly Savings Outside Super ($)", "currency"),
+    ("legacy", "taxable_portion", "Taxable Component of Super (%)", "percent"),
+)
+
+
+def default_scenario(profile=None):
+    """The 'current plan' input set: page defaults, personalised from the Tier 1 profile."""
+    profile = profile or {}
+    age = profile.get("age", SUPER_DEFAULTS["current_age"])
+    income = profile.get("income", STRATEGY_DEFAULTS["income"])
+    return {
+        "strategy": dict(STRATEGY_DEFAULTS, income=income),
+        "super": dict(SUPER_DEFAULTS, current_age=age, annual_salary=income,
+                      retirement_age=max(SUPER_DEFAULTS["retirement_age"], age + 1)),
+        "fire": dict(FIRE_DEFAULTS, current_age=age, fire_age=max(FIRE_DEFAULTS["fire_age"], age + 5)),
+        "legacy": dict(LEGACY_DEFAULTS),
+    }
+
+
+def _section_inputs(inputs, section):
+    defaults = SECTIONS[section][0]
+    return dict(defaults, **inputs.get(section, {}))
+
+
+def _scenario_metrics(inputs, results):
+    """The SCENARIO_METRICS values of one scenario's results."""
+    dr, ip = results["strategy"]["dr_results"], results["strategy"]["ip_results"]
+    super_at_retirement = results["super"]["hg_projection"]["balance"][-1]
+
+    fire, fire_inputs = results["fire"], _section_inputs(inputs, "fire")
+    required_capital = calculate_required_capital(fire_inputs["annual_spend"], fire["inflation_rate"],
+                                                  fire["effective_return"], fire["years_to_fire"],
+                                                  fire["years_in_bridge"])
+    taxable_portion = _section_inputs(inputs, "legacy")["taxable_portion"]
+    return {
+        "shares_net_wealth": float(dr["net_wealth"][-1]),
+        "property_net_wealth": float(ip["net_wealth"][-1]),
+        "shares_tax_saved": float(dr["tax_saved"][-1]),
+        "property_tax_saved": float(ip["tax_saved"][-1]),
+        "super_at_retirement": float(super_at_retirement),
+        "fire_gap": float(required_capital - fire["fire_starting_balance"]),
+        "estate_tax": float(calculate_estate_tax(super_at_retirement, taxable_portion)),
+    }
+
+
+def compute_workspace(scenarios, baseline=BASELINE_NAME):
+    """
+    Runs every scenario's input set through the tier engines in one pass.
+
+    Args:
+        scenarios (dict): {name: {section: {field: value}}}; missing sections
+            and fields take the page defaults.
+        baseline (str): Scenario the others are diffed against.
+
+    Sections whose inputs match an earlier scenario's are reused rather than
+    run again (a what-if that only changes FIRE inputs runs one engine), and
+    the engines themselves are backed by the shared projection cache.
+    Returns {'results', 'metrics', 'diffs', 'errors', 'stats'}; a scenario
+    that fails (e.g. invalid inputs) is reported in 'errors' and left out of
+    the rest.
+    """
+    runs = {}  # make_key(section, inputs) -> result
+    stats = {"computed": 0, "reused": 0}
+    results, metrics, errors = {}, {}, {}
+
+    for name, inputs in scenarios.items():
+        try:
+            sections = {}
+            for section, (_, engine) in SECTIONS.items():
+                if engine is None:
+                    continue
+                params = _section_inputs(inputs, section)
+                key = make_key(f"workspace:{section}", params)
+                if key in runs:
+                    stats["reused"] += 1
+                else:
+                    runs[key] = engine(params)
+                    stats["computed"] += 1
+                sections[section] = runs[key]
+            results[name] = sections
+            metrics[name] = _scenario_metrics(inputs, sections)
+        except Exception as e:
+            errors[name] = str(e)
+
+    diffs = diff_metrics(metrics, baseline) if baseline in metrics else {}
+    return {"results": results, "metrics": metrics, "diffs": diffs, "errors": errors, "stats": stats}
+
+
+def diff_metrics(metrics, baseline=BASELINE_NAME):
+    """
+    Per-metric differences of every scenario against the baseline.
+    Returns {name: {metric: {'value', 'baseline', 'change', 'pct_change'}}};
+    'pct_change' is None where the baseline value is zero.
+    """
+    base = metrics[baseline]
+    diffs = {}
+    for name, values in metrics.items():
+        if name == baseline:
+            continue
+        diffs[name] = {}
+        for key, value in values.items():
+            change = value - base[key]
+            diffs[name][key] = {
+                "value": value,
+                "baseline": base[key],
+                "change": change,
+                "pct_change": change / abs(base[key]) if base[key] else None,
+            }
+    return diffs
+
+
+# --- SHARE LINKS ---
+
+def restore_shared_workspace():
+    """
+    Restores the profile and workspace from a share link's query parameter.
+
+    Runs once per token: the restored inputs land straight on the summary
+    page's comparison (shown to unregistered recipients too; the rest of the
+    summary stays gated), whose projections come from the shared cache when
+    the link was made on this server. Returns True if state was restored.
+    """
+    token = st.query_params.get(SHARE_QUERY_PARAM)
+    if not token or token == st.session_state.get(SHARED_TOKEN_KEY):
+        return False
+    st.session_state[SHARED_TOKEN_KEY] = token
+    try:
+        profile, scenarios, baseline = decode_scenario(token)
+    except ValueError as e:
+        st.warning(f"This share link could not be opened: {e}")
+        return False
+
+    st.session_state.setdefault('user_profile', {}).update(profile)
+    st.session_state[WORKSPACE_KEY] = {BASELINE_NAME if name == baseline else name: inputs
+                                       for name, inputs in scenarios.items()}
+    st.session_state.page_selection = "Information Summary"
+    return True
+
+
+def _render_share_link(workspace):
+    """Publishes the workspace in the address bar and shows the link to copy."""
+    try:
+        token = encode_scenario(st.session_state.get('user_profile'), workspace, BASELINE_NAME)
+    except ValueError as e:
+        st.caption(f"This workspace can't be shared as a link: {e}")
+        return
+    if st.query_params.get(SHARE_QUERY_PARAM) != token:
+        st.query_params[SHARE_QUERY_PARAM] = token
+    st.session_state[SHARED_TOKEN_KEY] = token
+
+    with st.expander("🔗 Share or bookmark this comparison"):
+        base_url = (getattr(st.context, "url", None) or "").split("?")[0]
+        st.code(f"{base_url}?{SHARE_QUERY_PARAM}={token}", language=None)
+        st.caption("The link holds your profile and scenarios (no contact details). "
+                   "Opening it restores them and goes straight to this comparison.")
+
+
+# --- UI ---
+
+def _input_widget(section, field, label, kind, value):
+    key = f"ws_{section}_{field}"
+    if kind == "percent":
+        return st.number_input(label, value=float(value) * 100, step=0.1, key=key) / 100
+    if kind == "age":
+        return int(st.number_input(label, min_value=18, max_value=90, value=int(value), step=1, key=key))
+    return st.number_input(label, min_value=0.0, value=float(value), step=1000.0, key=key)
+
+
+def render_scenario_workspace():
+    """Named what-if scenarios against the current plan, with a per-metric comparison."""
+    st.subheader("🧪 Scenario Workspace")
+    st.caption("Save up to three what-ifs and compare them with your current plan across every tier. "
+               "Illustrative only; each figure uses the same simplified models as the tier pages.")
+
+    workspace = st.session_state.setdefault(WORKSPACE_KEY, {})
+    if BASELINE_NAME not in workspace:
+        workspace[BASELINE_NAME] = default_scenario(st.session_state.get('user_profile'))
+    baseline = workspace[BASELINE_NAME]
+
+    with st.expander("➕ Add or update a what-if scenario", expanded=len(workspace) == 1):
+        with st.form("scenario_workspace_form"):
+            name = st.text_input("Scenario Name", value=f"What-if {len(workspace)}")
+            columns = st.columns(3)
+            changes = {}
+            for i, (section, field, label, kind) in enumerate(EDITABLE_FIELDS):
+                with columns[i % 3]:
+                    changes[(section, field)] = _input_widget(section, field, label, kind, baseline[section][field])
+            submitted = st.form_submit_button("💾 Save Scenario", use_container_width=True)
+
+        if submitted:
+            name = name.strip()
+            if not name or name == BASELINE_NAME:
+                st.error(f"Please choose a name other than '{BASELINE_NAME}'.")
+            elif name not in workspace and len(workspace) >= MAX_SCENARIOS:
+                st.error(f"The workspace holds up to {MAX_SCENARIOS - 1} what-ifs. Remove one first.")
+            else:
+                scenario = {section: dict(fields) for section, fields in baseline.items()}
+                for (section, field), value in changes.items():
+                    scenario[section][field] = value
+                workspace[name] = scenario
+                st.success(f"Saved '{name}'.")
+
+    _render_share_link(workspace)
+
+    what_ifs = [name for name in workspace if name != BASELINE_NAME]
+    if not what_ifs:
+        st.info("Add a what-if above to compare it with your current plan.")
+        return
+
+    col_remove, col_button = st.columns([3, 1])
+    with col_remove:
+        to_remove = st.selectbox("Remove a scenario", what_ifs, key="ws_remove_choice")
+    with col_button:
+        st.write("")
+        if st.button("🗑️ Remove", use_container_width=True, key="ws_remove"):
+            workspace.pop(to_remove, None)
+            st.rerun()
+
+    comparison = compute_workspace(workspace)
+    for name, error in comparison["errors"].items():
+        st.error(f"'{name}' could not be modelled: {error}")
+    if BASELINE_NAME not in comparison["metrics"]:
+        return
+
+    rows = []
+    for key, label in SCENARIO_METRICS:
+        row = {"Metric": label, BASELINE_NAME: f"${comparison['metrics'][BASELINE_NAME][key]:,.0f}"}
+        for name, diff in comparison["diffs"].items():
+            row[name] = f"${diff[key]['value']:,.0f}"
+            row[f"Δ {name}"] = f"{diff[key]['change']:+,.0f}"
+        rows.append(row)
+    st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+    stats = comparison["stats"]
+    st.caption(f"{stats['computed']} projections run, {stats['reused']} reused from unchanged inputs. "
+               "A positive FIRE gap is a shortfall; lower is better for the gap and estate tax.")
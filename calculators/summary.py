@@ -2,12 +2,15 @@ import streamlit as st
 import plotly.graph_objects as go
 from utils.leads import render_lead_capture_form
 from utils.compliance import render_footer_disclaimer
-from utils.ui import go_to_page
+from utils.ui import go_to_page, render_consolidated_report_button
+from utils.session import get_result
 
 def render_summary_page():
     """
     Renders the 'Strategy Summary' page.
-    This is a synthesis of all previous tiers, gated by lead capture.
+    This is a synthesis of all previous tiers, gated by lead capture. A
+    session opened from a share link sees the shared scenario comparison
+    above the gate.
     """
     st.title("Information Summary (Illustrative Synthesis)")
     
@@ -25,6 +28,11 @@ def render_summary_page():
     # --- 1. Lead Gate ---
     # Check if lead data exists (email/phone captured)
     if 'lead_data' not in st.session_state or not st.session_state.lead_data.get('email'):
+        from calculators.scenarios import SHARED_TOKEN_KEY, render_scenario_workspace
+        if st.session_state.get(SHARED_TOKEN_KEY):
+            render_scenario_workspace()
+            st.divider()
+
         st.info("🔒 **This information summary is reserved for registered users.**")
         st.write("Unlock a synthesized view of the illustrative scenarios, concepts, and areas for potential exploration identified in the previous tiers.")
         
@@ -36,9 +44,9 @@ def render_summary_page():
 
     # --- 2. Data Aggregation ---
     profile = st.session_state.get('user_profile', {})
-    tier3 = st.session_state.get('tier3_results', {})
-    fire = st.session_state.get('fire_results', {})
-    legacy = st.session_state.get('legacy_results', {})
+    tier3 = get_result('tier3_results', {})
+    fire = get_result('fire_summary', {})
+    legacy = get_result('legacy_results', {})
     
     if not profile:
         st.warning("⚠️ No profile data found. Please complete Tier 1 first.")
@@ -133,8 +141,13 @@ def render_summary_page():
             st.markdown(action)
             
         st.markdown("---")
+        render_consolidated_report_button("summary_report")
         st.caption("Want to discuss these concepts further?")
         if st.button("📅 Book Information Session", type="primary", use_container_width=True):
              st.success("Request received! We will contact you shortly to arrange an educational session.")
 
+    st.divider()
+    from calculators.scenarios import render_scenario_workspace
+    render_scenario_workspace()
+
     render_footer_disclaimer()
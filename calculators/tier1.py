@@ -1,10 +1,18 @@
+import functools
 import streamlit as st
 import plotly.graph_objects as go
+import numpy as np
 
 
 from utils.ui import parse_currency_input, go_to_page
 from utils.compliance import render_footer_disclaimer, get_projection_disclaimer
 from utils.leads import render_lead_capture_form
+from utils.charts import brand_figure, cached_figure
+from utils.session import store_result, get_result
+
+# Incomes a couple starts from before they enter their own
+DEFAULT_USER_INCOME = 90000
+DEFAULT_PARTNER_INCOME = 60000
 
 def render_tier1():
     """Renders the enhanced Tier 1 'Financial Readiness Assessment' calculator."""
@@ -69,14 +77,14 @@ def render_tier1():
             with col_inc_a:
                 user_income = parse_currency_input(
                     "Your Income ($)", 
-                    profile.get('user_income', 90000), 
+                    profile.get('user_income', DEFAULT_USER_INCOME), 
                     "Your individual pre-tax income",
                     key="t1_user_income_sp"
                 )
             with col_inc_b:
                 partner_income = parse_currency_input(
                     "Partner Income ($)", 
-                    profile.get('partner_income', 60000), 
+                    profile.get('partner_income', DEFAULT_PARTNER_INCOME), 
                     "Partner's individual pre-tax income",
                     key="t1_partner_income"
                 )
@@ -169,7 +177,7 @@ def render_tier1():
         })
         # Calculate scores
         scores = calculate_readiness_scores(equity, income, experience, risk_tolerance, age, dependants)
-        st.session_state['tier1_results'] = {
+        store_result('tier1_results', {
             'scores': scores,
             'equity': equity,
             'income': income,
@@ -180,11 +188,11 @@ def render_tier1():
             'age': age,
             'dependants': dependants,
             'marital_status': marital_status
-        }
+        })
         
     # Display Results if they exist in state
-    if 'tier1_results' in st.session_state:
-        results = st.session_state['tier1_results']
+    results = get_result('tier1_results')
+    if results is not None:
         scores = results['scores']
         total_score = scores['total']
         
@@ -212,6 +220,9 @@ def render_tier1():
             st.warning(f"**⚡ Readiness Score: Building Foundation.** Score: {total_score}/100. You are on track to building a strong foundation.")
         else:
             st.info(f"**🌱 Readiness Score: Early Stage.** Score: {total_score}/100. Focus on strengthening your base first.")
+
+        percentile = get_score_percentile(total_score)
+        st.caption(f"📊 Your score is higher than about **{percentile:.0f}%** of a synthetic reference population of {REFERENCE_POPULATION_SIZE:,} Australian adult profiles (illustrative only, not survey data).")
         
         # Component Breakdown
         st.markdown("### 📈 Score Breakdown")
@@ -285,66 +296,63 @@ def render_tier1():
     return None
 
 
+# --- Scoring tables (shared by the scalar and array scorers) ---
+# (minimum value, points), highest band first. Below the last band: 1 point per $10k.
+EQUITY_SCORE_BANDS = [(500000, 30), (200000, 25), (100000, 20), (50000, 12)]
+INCOME_SCORE_BANDS = [(200000, 30), (150000, 26), (120000, 22), (100000, 18), (80000, 14)]
+MAX_DEPENDANT_PENALTY = 5
+EXPERIENCE_LEVELS = ["Beginner (Cash/Term Deposits)", "Intermediate (Some Shares/Property)", "Advanced (Active Portfolio/SMSF)"]
+RISK_SCORES = {
+    "Conservative": 5,
+    "Moderately Conservative": 8,
+    "Balanced": 12,
+    "Moderate Growth": 16,
+    "High Growth": 20
+}
+DEFAULT_RISK_SCORE = 12
+# (age below, bonus): younger investors have more time for compounding
+AGE_BONUS_BANDS = [(35, 5), (45, 3), (55, 1)]
+
+
+def _band_score(value, bands):
+    for minimum, points in bands:
+        if value >= minimum:
+            return points
+    return max(0, int(value / 10000))
+
+def _experience_score(experience):
+    if "Advanced" in experience:
+        return 20
+    elif "Intermediate" in experience:
+        return 12
+    return 5
+
 def calculate_readiness_scores(equity, income, experience, risk_tolerance, age=35, dependants=0):
     """Calculate component scores and total readiness score."""
     
     # Equity Score (0-30)
-    if equity >= 500000:
-        equity_score = 30
-    elif equity >= 200000:
-        equity_score = 25
-    elif equity >= 100000:
-        equity_score = 20
-    elif equity >= 50000:
-        equity_score = 12
-    else:
-        equity_score = max(0, int(equity / 10000))
+    equity_score = _band_score(equity, EQUITY_SCORE_BANDS)
     
     # Income Score (0-30)
-    if income >= 200000:
-        income_score = 30
-    elif income >= 150000:
-        income_score = 26
-    elif income >= 120000:
-        income_score = 22
-    elif income >= 100000:
-        income_score = 18
-    elif income >= 80000:
-        income_score = 14
-    else:
-        income_score = max(0, int(income / 10000))
+    income_score = _band_score(income, INCOME_SCORE_BANDS)
     
     # Adjust income score based on dependants (more dependants = higher income needed)
     if dependants > 0:
-        income_adjustment = min(5, dependants * 2)  # Lose up to 5 points for dependants
+        income_adjustment = min(MAX_DEPENDANT_PENALTY, dependants * 2)  # Lose up to 5 points for dependants
         income_score = max(0, income_score - income_adjustment)
     
     # Experience Score (0-20)
-    if "Advanced" in experience:
-        experience_score = 20
-    elif "Intermediate" in experience:
-        experience_score = 12
-    else:
-        experience_score = 5
+    experience_score = _experience_score(experience)
     
     # Risk Score (0-20)
-    risk_map = {
-        "Conservative": 5,
-        "Moderately Conservative": 8,
-        "Balanced": 12,
-        "Moderate Growth": 16,
-        "High Growth": 20
-    }
-    risk_score = risk_map.get(risk_tolerance, 12)
+    risk_score = RISK_SCORES.get(risk_tolerance, DEFAULT_RISK_SCORE)
     
-    # Age bonus: younger investors have more time for compounding
+    # Age bonus
     age_bonus = 0
-    if age < 35:
-        age_bonus = 5
-    elif age < 45:
-        age_bonus = 3
-    elif age < 55:
-        age_bonus = 1
+    for age_below, bonus in AGE_BONUS_BANDS:
+        if age < age_below:
+            age_bonus = bonus
+            break
     
     total = equity_score + income_score + experience_score + risk_score + age_bonus
     
@@ -358,6 +366,102 @@ def calculate_readiness_scores(equity, income, experience, risk_tolerance, age=3
     }
 
 
+def _band_score_array(values, bands):
+    thresholds = np.array([minimum for minimum, _ in reversed(bands)], dtype=np.float64)
+    points = np.array([0] + [p for _, p in reversed(bands)], dtype=np.int64)
+    idx = np.searchsorted(thresholds, values, side='right')
+    fallback = np.maximum(0, np.trunc(values / 10000)).astype(np.int64)
+    return np.where(idx > 0, points[idx], fallback)
+
+def _lookup_array(labels, score_of, known_labels):
+    # Equality masks for the labels the page offers; anything else is scored once per distinct value
+    labels = np.asarray(labels, dtype=str).reshape(-1)
+    scores = np.full(labels.shape, -1, dtype=np.int64)
+    for label in known_labels:
+        scores[labels == label] = score_of(label)
+    other = scores < 0
+    if other.any():
+        unique, inverse = np.unique(labels[other], return_inverse=True)
+        scores[other] = np.array([score_of(label) for label in unique], dtype=np.int64)[inverse.reshape(-1)]
+    return scores
+
+def calculate_readiness_scores_array(equity, income, experience, risk_tolerance, age=35, dependants=0):
+    """
+    Array version of `calculate_readiness_scores` for scoring whole populations.
+    Numeric inputs are arrays (or scalars, broadcast); experience and risk are
+    sequences of the same labels the page uses. Returns the same keys with
+    int64 arrays.
+    """
+    label_count = max(np.size(experience), np.size(risk_tolerance))
+    equity, income, age, dependants, _ = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(a, dtype=np.float64)) for a in (equity, income, age, dependants)),
+        np.empty(label_count)
+    )
+    n = equity.size
+    equity_score = _band_score_array(equity, EQUITY_SCORE_BANDS)
+    income_score = _band_score_array(income, INCOME_SCORE_BANDS)
+    penalty = np.minimum(MAX_DEPENDANT_PENALTY, dependants * 2).astype(np.int64)
+    income_score = np.where(dependants > 0, np.maximum(0, income_score - penalty), income_score)
+
+    experience_score = np.broadcast_to(_lookup_array(experience, _experience_score, EXPERIENCE_LEVELS), (n,))
+    risk_score = np.broadcast_to(_lookup_array(risk_tolerance, lambda r: RISK_SCORES.get(r, DEFAULT_RISK_SCORE), RISK_SCORES), (n,))
+
+    age_limits = np.array([age_below for age_below, _ in AGE_BONUS_BANDS], dtype=np.float64)
+    age_bonuses = np.array([bonus for _, bonus in AGE_BONUS_BANDS] + [0], dtype=np.int64)
+    age_bonus = age_bonuses[np.searchsorted(age_limits, age, side='right')]
+
+    return {
+        'equity': equity_score,
+        'income': income_score,
+        'experience': experience_score,
+        'risk': risk_score,
+        'age_bonus': age_bonus,
+        'total': equity_score + income_score + experience_score + risk_score + age_bonus
+    }
+
+
+# --- Reference population (synthetic, for percentile ranking) ---
+
+REFERENCE_POPULATION_SIZE = 200000
+REFERENCE_SEED = 20240601
+
+def generate_reference_population(n=REFERENCE_POPULATION_SIZE, seed=REFERENCE_SEED):
+    """
+    Synthetic Australian adult profiles (illustrative, loosely shaped on ABS
+    income and home-ownership patterns): ages 20-70, log-normal household
+    income around $100k, home ownership rising with age and equity growing
+    with it, plus experience, risk and dependant mixes.
+    """
+    rng = np.random.default_rng(seed)
+    age = rng.integers(20, 71, n)
+    income = np.round(rng.lognormal(np.log(100000), 0.55, n), -3)
+    owns_home = rng.random(n) < np.clip(0.15 + (age - 20) * 0.014, 0, 0.85)
+    equity = np.where(owns_home, np.round(rng.lognormal(np.log(25000 * (age - 19)), 0.8), -3), 0.0)
+    experience = np.array(EXPERIENCE_LEVELS)[rng.choice(3, n, p=[0.5, 0.35, 0.15])]
+    risk_tolerance = np.array(list(RISK_SCORES))[rng.choice(len(RISK_SCORES), n, p=[0.15, 0.2, 0.35, 0.2, 0.1])]
+    dependants = np.where((age >= 25) & (age < 60), np.minimum(rng.poisson(0.9, n), 5), 0)
+    return {'age': age, 'income': income, 'equity': equity, 'experience': experience,
+            'risk_tolerance': risk_tolerance, 'dependants': dependants}
+
+@functools.lru_cache(maxsize=1)
+def get_reference_scores():
+    """Sorted total scores of the reference population (built once per process)."""
+    population = generate_reference_population()
+    scores = calculate_readiness_scores_array(population['equity'], population['income'], population['experience'],
+                                              population['risk_tolerance'], population['age'], population['dependants'])
+    sorted_scores = np.sort(scores['total'])
+    sorted_scores.flags.writeable = False
+    return sorted_scores
+
+def get_score_percentile(total_score):
+    """Percentile rank (0-100) of a score in the reference population; ties count half."""
+    reference = get_reference_scores()
+    below = np.searchsorted(reference, total_score, side='left')
+    at_or_below = np.searchsorted(reference, total_score, side='right')
+    return float((below + at_or_below) / 2 / reference.size * 100)
+
+
+@cached_figure
 def create_gauge_chart(score):
     """Create a gauge chart for the readiness score."""
     
@@ -369,7 +473,8 @@ def create_gauge_chart(score):
     else:
         color = "#EF4444"  # Rose
     
-    fig = go.Figure(go.Indicator(
+    fig = brand_figure()
+    fig.add_trace(go.Indicator(
         mode = "gauge+number",
         value = score,
         domain = {'x': [0, 1], 'y': [0, 1]},
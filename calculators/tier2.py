@@ -1,10 +1,18 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
+import numpy as np
 from utils.tax import calculate_income_tax, calculate_marginal_rate, calculate_stamp_duty, calculate_lmi, calculate_land_tax
-from utils.ui import parse_currency_input
+from utils.ui import parse_currency_input, render_export_buttons
 from utils.compliance import render_footer_disclaimer, get_projection_disclaimer
 from utils.leads import render_lead_capture_form
+from utils.results import ProjectionResult
+from utils.session import store_result, get_result
+from utils.cache import cached_projection
+from utils.charts import brand_figure, cached_figure, BRAND_NAVY, BRAND_INDIGO, BRAND_PURPLE, BRAND_RED
+from calculators.portfolio import calculate_portfolio_projection, schedule_purchases, ASSESSMENT_BUFFER
+from calculators.household import calculate_household_results
+from calculators.property_mc import calculate_property_risk, PAGE_PATHS, PAGE_YEARS
 
 def render_tier2():
     st.title("Tier 2: Direction (Illustrative Strategy Comparison)")
@@ -164,32 +172,19 @@ def render_tier2():
                 "loan_type": loan_type
             })
 
-        # 2. Calculate Costs (Use IP State)
-        stamp_duty = calculate_stamp_duty(ip_state, ip_price)
-        
-        # Loan Calcs
-        total_ip_loan = ip_price + stamp_duty + 2000 # 2k legal
-        lvr_ip = total_ip_loan / ip_price if ip_price > 0 else 0
-        lmi = calculate_lmi(total_ip_loan, ip_price) if(lvr_ip > 0.8 and ip_price > 0) else 0
-        total_ip_cost = total_ip_loan + lmi
-        
-        # 3. Run Projections with P&I Logic
-        dr_results = calculate_dr_projection(dr_amount, dr_growth, dr_yield, loan_rate, marginal_tax_rate, loan_type, loan_term)
-        # Pass ip_state for Land Tax
-        ip_results = calculate_ip_projection(ip_price, total_ip_cost, ip_growth, ip_yield, loan_rate, marginal_tax_rate, 
-                                             maint_rate, mgmt_rate, rates, ip_state, loan_type, loan_term)
-        
-        # Store in session state
-        st.session_state['tier2_results'] = {
-            'dr_results': dr_results,
-            'ip_results': ip_results,
-            'stamp_duty': stamp_duty,
-            'lmi': lmi
+        # 2. Calculate Costs & Run Projections (recomputable if evicted from the session)
+        tier2_inputs = {
+            "dr_amount": dr_amount, "dr_growth": dr_growth, "dr_yield": dr_yield,
+            "ip_price": ip_price, "ip_growth": ip_growth, "ip_yield": ip_yield, "ip_state": ip_state,
+            "loan_rate": loan_rate, "marginal_tax_rate": marginal_tax_rate,
+            "loan_type": loan_type, "loan_term": loan_term,
+            "maint_rate": maint_rate, "mgmt_rate": mgmt_rate, "rates": rates
         }
+        store_result('tier2_results', calculate_tier2_results(**tier2_inputs), recompute=calculate_tier2_results, inputs=tier2_inputs)
 
     # Display Results if present
-    if 'tier2_results' in st.session_state:
-        results = st.session_state['tier2_results']
+    results = get_result('tier2_results')
+    if results:
         dr_results = results['dr_results']
         ip_results = results['ip_results']
         stamp_duty = results['stamp_duty']
@@ -209,7 +204,7 @@ def render_tier2():
             *   **Rental Yield:** Gross yield estimate derived from state averages; actual yields vary by suburb and property type.
             """)
         
-        tab1, tab2, tab3 = st.tabs(["📈 Dashboard", "📋 Yearly Breakdown", "💰 Cashflow Analysis"])
+        tab1, tab2, tab3, tab4 = st.tabs(["📈 Dashboard", "📋 Yearly Breakdown", "💰 Cashflow Analysis", "🏘️ Portfolio Builder"])
         
         with tab1:
             # KPIS
@@ -239,50 +234,27 @@ def render_tier2():
             years = list(range(1, 11))
             inflation_rate = 0.025 if show_real else 0.0
             
-            dr_wealth_display = []
-            ip_wealth_display = []
-            
-            for i, (dr_val, ip_val) in enumerate(zip(dr_results['net_wealth'], ip_results['net_wealth'])):
-                factor = (1 + inflation_rate) ** (i + 1)
-                dr_wealth_display.append(dr_val / factor)
-                ip_wealth_display.append(ip_val / factor)
+            # Nominal view charts the stored arrays directly (no copy)
+            if show_real:
+                factors = (1 + inflation_rate) ** np.arange(1, dr_results.periods + 1)
+                dr_wealth_display = dr_results['net_wealth'] / factors
+                ip_wealth_display = ip_results['net_wealth'] / factors
+            else:
+                dr_wealth_display = dr_results['net_wealth']
+                ip_wealth_display = ip_results['net_wealth']
                 
             # Update Metrics with Final Adjusted Values
             k1.metric("Option A: Shares Net Wealth (10y)", f"${dr_wealth_display[-1]:,.0f}", delta=f"Loan Rem: ${dr_results['loan_balance'][-1]:,.0f}")
             k2.metric("Option B: Property Net Wealth (10y)", f"${ip_wealth_display[-1]:,.0f}", delta=f"Loan Rem: ${ip_results['loan_balance'][-1]:,.0f}", delta_color="normal")
 
             # Chart
-            fig_wealth = go.Figure()
-            # Indigo for Shares (Growth/Opportunity)
-            fig_wealth.add_trace(go.Scatter(x=years, y=dr_wealth_display, name="Debt Recycling (Shares)", 
-                                    line={'color': '#6366F1', 'width': 4}, mode='lines+markers'))
-            # Slate for Property (Stability/Foundation)
-            fig_wealth.add_trace(go.Scatter(x=years, y=ip_wealth_display, name="Investment Property", 
-                                    line={'color': '#0F172A', 'width': 4}, mode='lines+markers'))
-                                    
-            fig_wealth.update_layout(
-                title="Projected Net Wealth Accumulation",
-                xaxis_title="Years",
-                yaxis_title="Net Wealth ($)",
-                legend={'yanchor': "top", 'y': 0.99, 'xanchor': "left", 'x': 0.01},
-                hovermode="x unified",
-                height=400
-            )
+            fig_wealth = create_wealth_chart(years, dr_wealth_display, ip_wealth_display)
             st.plotly_chart(fig_wealth, use_container_width=True)
             st.caption(get_projection_disclaimer())
             
             # New Tax Comparison Chart
             st.markdown("### 💸 Annual Tax Impact Comparison")
-            fig_tax = go.Figure()
-            fig_tax.add_trace(go.Bar(x=years, y=dr_results['tax_saved_yearly'], name="Shares Tax Benefit", marker_color='#A855F7'))
-            fig_tax.add_trace(go.Bar(x=years, y=ip_results['tax_saved_yearly'], name="Property Tax Benefit", marker_color='#6366F1'))
-            fig_tax.update_layout(
-                title="Annual Tax Savings (Negative Gearing Benefit)",
-                xaxis_title="Year",
-                yaxis_title="Tax Saved ($)",
-                barmode='group',
-                height=350
-            )
+            fig_tax = create_tax_chart(years, dr_results['tax_saved_yearly'], ip_results['tax_saved_yearly'])
             st.plotly_chart(fig_tax, use_container_width=True)
             
             with st.expander("💡 Why does the Property Tax Benefit increase over time?"):
@@ -331,6 +303,7 @@ def render_tier2():
                     "Property (Annual Tax)": [f"${x:,.0f}" for x in ip_results['tax_saved_yearly']]
                 })
                 st.dataframe(df, hide_index=True, use_container_width=True)
+                render_export_buttons(results, "Strategy_Year_by_Year", key="t2_export")
             else:
                 st.info("🔒 **Detailed Breakdown Locked**")
                 if render_lead_capture_form("tier2_tab2", button_label="Unlock Breakdown"):
@@ -346,6 +319,19 @@ def render_tier2():
                 "Property": [f"${ip_results.get('tax_saved', [0]*10)[-1]:,.0f}", f"${ip_final - ip_results['net_wealth'][0]:,.0f}"]
             })
             st.table(cf_df)
+
+            if partner_income > 0:
+                render_ownership_structure(dr_results, ip_results, income_user, partner_income)
+
+            st.divider()
+            render_property_risk(ip_price, results['ip_loan'], ip_growth, ip_yield, loan_rate, marginal_tax_rate,
+                                 maint_rate, mgmt_rate, rates, ip_state, loan_type, loan_term)
+
+        with tab4:
+            render_portfolio_builder(ip_price, ip_state, ip_growth, ip_yield, maint_rate, mgmt_rate, rates,
+                                     loan_rate, marginal_tax_rate, loan_type, loan_term, home_value, home_loan)
+            render_purchase_scheduler(ip_price, ip_state, ip_growth, ip_yield, maint_rate, mgmt_rate, rates,
+                                      loan_rate, marginal_tax_rate, loan_type, loan_term, home_value, home_loan, total_income)
     
         # Disclaimer Footer
         render_footer_disclaimer()
@@ -388,11 +374,268 @@ def render_tier2():
         
 import numpy_financial as npf
 
+# --- Charts ---
+
+@cached_figure
+def create_wealth_chart(years, dr_wealth, ip_wealth):
+    fig = brand_figure()
+    # Indigo for Shares (Growth/Opportunity)
+    fig.add_trace(go.Scatter(x=years, y=dr_wealth, name="Debt Recycling (Shares)", 
+                             line={'color': BRAND_INDIGO, 'width': 4}, mode='lines+markers'))
+    # Slate for Property (Stability/Foundation)
+    fig.add_trace(go.Scatter(x=years, y=ip_wealth, name="Investment Property", 
+                             line={'color': BRAND_NAVY, 'width': 4}, mode='lines+markers'))
+    fig.update_layout(
+        title="Projected Net Wealth Accumulation",
+        xaxis_title="Years",
+        yaxis_title="Net Wealth ($)",
+        legend={'yanchor': "top", 'y': 0.99, 'xanchor': "left", 'x': 0.01},
+        hovermode="x unified",
+        height=400
+    )
+    return fig
+
+
+@cached_figure
+def create_tax_chart(years, dr_tax, ip_tax):
+    fig = brand_figure()
+    fig.add_trace(go.Bar(x=years, y=dr_tax, name="Shares Tax Benefit", marker_color=BRAND_PURPLE))
+    fig.add_trace(go.Bar(x=years, y=ip_tax, name="Property Tax Benefit", marker_color=BRAND_INDIGO))
+    fig.update_layout(
+        title="Annual Tax Savings (Negative Gearing Benefit)",
+        xaxis_title="Year",
+        yaxis_title="Tax Saved ($)",
+        barmode='group',
+        height=350
+    )
+    return fig
+
+
+@cached_figure
+def create_portfolio_chart(years, portfolio_value, loan_balance, net_wealth):
+    fig = brand_figure()
+    fig.add_trace(go.Scatter(x=years, y=portfolio_value, name="Portfolio Value", line={'color': BRAND_NAVY, 'width': 3}))
+    fig.add_trace(go.Scatter(x=years, y=loan_balance, name="Total Debt", line={'color': BRAND_RED, 'dash': 'dash'}))
+    fig.add_trace(go.Scatter(x=years, y=net_wealth, name="Net Wealth", fill='tozeroy', line={'color': BRAND_INDIGO, 'width': 3}))
+    fig.update_layout(title="Illustrative Portfolio Projection", xaxis_title="Year", yaxis_title="$", hovermode="x unified", height=400)
+    return fig
+
+
+@cached_figure
+def create_property_risk_chart(years, p10, p25, p50, p75, p90):
+    fig = brand_figure()
+    fig.add_trace(go.Scatter(x=years, y=p90, line=dict(width=0), showlegend=False, hoverinfo='skip'))
+    fig.add_trace(go.Scatter(x=years, y=p10, name="10th-90th percentile", fill='tonexty',
+                             fillcolor='rgba(15, 23, 42, 0.12)', line=dict(width=0)))
+    fig.add_trace(go.Scatter(x=years, y=p75, line=dict(width=0), showlegend=False, hoverinfo='skip'))
+    fig.add_trace(go.Scatter(x=years, y=p25, name="25th-75th percentile", fill='tonexty',
+                             fillcolor='rgba(15, 23, 42, 0.25)', line=dict(width=0)))
+    fig.add_trace(go.Scatter(x=years, y=p50, name="Median", mode='lines', line=dict(color=BRAND_NAVY, width=3)))
+    fig.update_layout(title="Range of Property Net Equity (Nominal $)", xaxis_title="Year",
+                      yaxis_title="Net Equity ($)", height=400, hovermode="x unified")
+    return fig
+
+
+@cached_figure
+def create_negative_cash_chart(years, probability):
+    fig = brand_figure()
+    fig.add_trace(go.Bar(x=years, y=probability, name="Negative cash flow", marker_color=BRAND_RED))
+    fig.update_layout(title="Chance of a Negative After-Tax Cash Flow, by Year", xaxis_title="Year",
+                      yaxis_title="Share of Paths", yaxis_tickformat=".0%", height=300)
+    return fig
+
+
+def render_property_risk(price, loan, growth, yield_rate, interest_rate, tax_rate, maint, mgmt, rates, state,
+                         loan_type, loan_term):
+    """Simulated range of property outcomes: net equity fan and negative cash-flow years."""
+    st.markdown("#### 🎲 Property Risk Simulation")
+    st.caption(f"{PAGE_PATHS:,} simulated {PAGE_YEARS}-year paths in which capital growth, rent, vacancies and a "
+               "variable loan rate move together, instead of the constant assumptions above.")
+    if not st.toggle("Simulate property risk", key="t2_property_risk"):
+        return
+
+    with st.spinner("Simulating property paths..."):
+        risk = calculate_property_risk(price, loan, growth, yield_rate, interest_rate, tax_rate, maint, mgmt,
+                                       rates, state, loan_type, loan_term)
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric(f"Median Net Equity (Year {PAGE_YEARS})", f"${risk['equity_p50'][-1]:,.0f}",
+              help=f"10th-90th percentile: ${risk['equity_p10'][-1]:,.0f} to ${risk['equity_p90'][-1]:,.0f}.")
+    m2.metric("Negative Cash-Flow Years (Median)", f"{risk['negative_years_p50']:.0f} of {PAGE_YEARS}",
+              help=f"Years the property costs more than it earns after tax. Average {risk['negative_years_mean']:.1f}; "
+                   f"1 in 10 paths has {risk['negative_years_p90']:.0f} or more.")
+    m3.metric(f"Chance of Negative Equity (Year {PAGE_YEARS})", f"{risk['negative_equity_probability']*100:.1f}%",
+              help="Share of paths where the loan exceeds the property's value.")
+
+    years = risk['years']
+    fig = create_property_risk_chart(years, risk['equity_p10'], risk['equity_p25'], risk['equity_p50'],
+                                     risk['equity_p75'], risk['equity_p90'])
+    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(create_negative_cash_chart(years, risk['negative_cash_probability']), use_container_width=True)
+    st.caption(get_projection_disclaimer())
+
+
+def render_ownership_structure(dr_results, ip_results, income_user, partner_income):
+    """Compares owning each investment in either name, jointly, or at the best split."""
+    st.markdown("#### 👫 Ownership Structure")
+    st.caption("Investment income (or losses) is taxed at each owner's own marginal rate, so whose name an investment is held in changes the household's tax.")
+    household = calculate_household_results({"Shares": dr_results, "Property": ip_results}, income_user, partner_income)
+
+    split_names = list(household["Shares"]["splits"])
+    own_df = pd.DataFrame({
+        "Ownership": [
+            f"{name} ({household['Shares']['splits'][name]['user_share']:.0%} / {household['Property']['splits'][name]['user_share']:.0%} yours)"
+            if name == "Optimised" else name
+            for name in split_names
+        ],
+        "Shares (Tax Saved, 10y)": [f"${household['Shares']['splits'][name]['tax_saved'][-1]:,.0f}" for name in split_names],
+        "Property (Tax Saved, 10y)": [f"${household['Property']['splits'][name]['tax_saved'][-1]:,.0f}" for name in split_names],
+    })
+    st.table(own_df)
+    st.caption("Optimised shows the split (in 1% steps) with the highest combined tax benefit over the period. Ownership also affects CGT on sale, asset protection and estate planning.")
+
+
+def render_portfolio_builder(ip_price, ip_state, ip_growth, ip_yield, maint_rate, mgmt_rate, rates,
+                             loan_rate, marginal_tax_rate, loan_type, loan_term, home_value, home_loan):
+    """Multi-property portfolio: one editable row per purchase, starting from the Strategy B property."""
+    st.markdown("### 🏘️ Multi-Property Portfolio")
+    st.caption("Add a row per property. Deposits and costs above 80% of each purchase are funded from equity in your home and earlier purchases where available; land tax is assessed on your combined land value in each state.")
+
+    default_rows = pd.DataFrame([{
+        "Price ($)": float(ip_price), "State": ip_state, "Purchase Year": 0,
+        "Growth (%)": round(ip_growth * 100, 2), "Yield (%)": round(ip_yield * 100, 2)
+    }])
+    edited = st.data_editor(
+        default_rows,
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        key="t2_portfolio_rows",
+        column_config={
+            "Price ($)": st.column_config.NumberColumn(min_value=50000, step=10000, format="$%d"),
+            "State": st.column_config.SelectboxColumn(options=["NSW", "VIC", "QLD", "WA", "SA", "TAS", "ACT", "NT"], required=True),
+            "Purchase Year": st.column_config.NumberColumn(min_value=0, max_value=29, step=1),
+            "Growth (%)": st.column_config.NumberColumn(min_value=0.0, max_value=15.0, step=0.1),
+            "Yield (%)": st.column_config.NumberColumn(min_value=0.0, max_value=10.0, step=0.1),
+        }
+    )
+    horizon = st.slider("Projection Horizon (Years)", 10, 30, 20, 5, key="t2_portfolio_years")
+
+    edited = edited.dropna()
+    if edited.empty:
+        st.info("Add at least one property to model a portfolio.")
+        return
+
+    properties = [{
+        "price": float(row["Price ($)"]), "state": row["State"], "purchase_year": int(row["Purchase Year"]),
+        "growth": float(row["Growth (%)"]) / 100, "yield_rate": float(row["Yield (%)"]) / 100,
+        "maint": maint_rate, "mgmt": mgmt_rate, "rates": rates
+    } for _, row in edited.iterrows()]
+    portfolio = calculate_portfolio_projection(properties, loan_rate, marginal_tax_rate, loan_type, loan_term, horizon,
+                                               collateral_value=home_value, collateral_debt=home_loan)
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric(f"Portfolio Net Wealth ({horizon}y)", f"${portfolio['net_wealth'][-1]:,.0f}")
+    m2.metric("Total Debt", f"${portfolio['loan_balance'][-1]:,.0f}")
+    m3.metric("Cumulative Tax Impact", f"${portfolio['tax_saved'][-1]:,.0f}", help="Positive means net tax saved from negative gearing.")
+
+    years_axis = list(range(1, horizon + 1))
+    fig = create_portfolio_chart(years_axis, portfolio['portfolio_value'], portfolio['loan_balance'], portfolio['net_wealth'])
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(get_projection_disclaimer())
+
+    purchase_rows = []
+    for prop, purchase in zip(properties, portfolio['purchases']):
+        if purchase is None:
+            continue
+        purchase_rows.append({
+            "Year": purchase['year'], "State": prop['state'], "Price": prop['price'],
+            "Stamp Duty": purchase['stamp_duty'], "Equity Released": purchase['equity_released'],
+            "LMI": purchase['lmi'], "Loan": purchase['loan']
+        })
+    st.markdown("#### Purchase Funding")
+    st.dataframe(
+        pd.DataFrame(purchase_rows).style.format({c: '${:,.0f}' for c in ["Price", "Stamp Duty", "Equity Released", "LMI", "Loan"]}),
+        use_container_width=True, hide_index=True
+    )
+
+    land_tax = portfolio['land_tax_by_state']
+    if any(values.any() for values in land_tax.values()):
+        st.markdown("#### Land Tax by State (Annual)")
+        st.bar_chart(pd.DataFrame(land_tax, index=years_axis))
+
+def render_purchase_scheduler(ip_price, ip_state, ip_growth, ip_yield, maint_rate, mgmt_rate, rates,
+                              loan_rate, marginal_tax_rate, loan_type, loan_term, home_value, home_loan, total_income):
+    """Earliest feasible purchase year for each further Strategy B-style property."""
+    st.divider()
+    st.markdown("### ⏱️ How Fast Could a Portfolio Grow?")
+    st.caption(f"Repeats the Strategy B purchase ({ip_state}, growing with the market) whenever home and portfolio equity cover the costs above 80% LVR (so no LMI) and the household income services all debt at the rate plus a {ASSESSMENT_BUFFER*100:.0f}% assessment buffer.")
+
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        max_properties = st.number_input("Maximum Properties", 1, 10, 5, 1, key="t2_sched_max")
+    with c2:
+        living_expenses = parse_currency_input("Household Living Expenses ($/yr)", 40000, key="t2_sched_living")
+    with c3:
+        horizon = st.slider("Horizon (Years)", 10, 30, 20, 5, key="t2_sched_years")
+
+    plan = schedule_purchases(ip_price, ip_state, ip_growth, ip_yield, total_income, loan_rate, marginal_tax_rate,
+                              home_value=home_value, home_loan=home_loan, living_expenses=living_expenses,
+                              max_properties=max_properties, years=horizon, loan_type=loan_type, loan_term=loan_term,
+                              maint=maint_rate, mgmt=mgmt_rate, rates=rates)
+    if not plan['timeline']:
+        st.warning("On these assumptions no purchase passes the equity and serviceability checks within the horizon.")
+        return
+
+    df_plan = pd.DataFrame([{
+        "Property": idx + 1, "Year": p['year'], "Price": p['price'], "Stamp Duty": p['stamp_duty'],
+        "Equity Used": p['equity_released'], "Serviceability Surplus": p['serviceability_surplus'],
+        "Debt-to-Income": p['debt_to_income']
+    } for idx, p in enumerate(plan['timeline'])])
+    st.dataframe(
+        df_plan.style.format({"Price": '${:,.0f}', "Stamp Duty": '${:,.0f}', "Equity Used": '${:,.0f}',
+                              "Serviceability Surplus": '${:,.0f}', "Debt-to-Income": '{:.1f}x'}),
+        use_container_width=True, hide_index=True
+    )
+    projection = plan['projection']
+    st.metric(f"Illustrative Portfolio Net Wealth ({horizon}y)", f"${projection['net_wealth'][-1]:,.0f}",
+              help=f"{len(plan['timeline'])} properties, ${projection['loan_balance'][-1]:,.0f} total debt at the end of the horizon.")
+
+def calculate_tier2_results(dr_amount, dr_growth, dr_yield, ip_price, ip_growth, ip_yield, ip_state,
+                            loan_rate, marginal_tax_rate, loan_type, loan_term, maint_rate, mgmt_rate, rates):
+    """Runs both Tier 2 strategies (plus IP upfront costs) for one set of inputs."""
+    # Calculate Costs (Use IP State)
+    stamp_duty = calculate_stamp_duty(ip_state, ip_price)
+    
+    # Loan Calcs
+    total_ip_loan = ip_price + stamp_duty + 2000 # 2k legal
+    lvr_ip = total_ip_loan / ip_price if ip_price > 0 else 0
+    lmi = calculate_lmi(total_ip_loan, ip_price) if(lvr_ip > 0.8 and ip_price > 0) else 0
+    total_ip_cost = total_ip_loan + lmi
+    
+    # Run Projections with P&I Logic
+    dr_results = calculate_dr_projection(dr_amount, dr_growth, dr_yield, loan_rate, marginal_tax_rate, loan_type, loan_term)
+    # Pass ip_state for Land Tax
+    ip_results = calculate_ip_projection(ip_price, total_ip_cost, ip_growth, ip_yield, loan_rate, marginal_tax_rate, 
+                                         maint_rate, mgmt_rate, rates, ip_state, loan_type, loan_term)
+    
+    return {
+        'dr_results': dr_results,
+        'ip_results': ip_results,
+        'stamp_duty': stamp_duty,
+        'lmi': lmi,
+        'ip_loan': total_ip_cost
+    }
+
+PROJECTION_SERIES = ("net_wealth", "tax_saved", "tax_saved_yearly", "loan_balance")
+# Per-year investment taxable income (before the owner's tax) and refundable offsets, for per-partner tax
+TAX_SERIES = ("taxable_income", "franking_credits")
+
+@cached_projection
 def calculate_dr_projection(amount, growth, yield_rate, interest_rate, tax_rate, loan_type="Interest Only", loan_term=30, years=10, franking_allocation=0.30, company_tax_rate=0.30):
-    net_wealth = []
-    tax_saved_cum = []
-    tax_saved_yearly = []
-    loan_balances = []
+    # One preallocated (series x years) block instead of growing lists
+    block = np.zeros((len(PROJECTION_SERIES) + len(TAX_SERIES), years))
+    net_wealth, tax_saved_cum, tax_saved_yearly, loan_balances, taxable_incomes, franking_offsets = block
     
     current_val = amount
     loan = amount
@@ -437,6 +680,8 @@ def calculate_dr_projection(amount, growth, yield_rate, interest_rate, tax_rate,
         
         # Taxable Income = Gross Income - Deductions (Interest)
         taxable_income = gross_income - interest
+        taxable_incomes[i] = taxable_income
+        franking_offsets[i] = franking_credits
         
         # Tax Liability (Negative means tax loss/refund)
         tax_liability = taxable_income * tax_rate
@@ -456,24 +701,22 @@ def calculate_dr_projection(amount, growth, yield_rate, interest_rate, tax_rate,
         
         total_tax_saved += current_tax_saving
 
-        tax_saved_cum.append(total_tax_saved)
-        tax_saved_yearly.append(current_tax_saving)
+        tax_saved_cum[i] = total_tax_saved
+        tax_saved_yearly[i] = current_tax_saving
         
         # Update Loan
         loan -= principal_paid
-        loan_balances.append(loan)
+        loan_balances[i] = loan
         
         # Net Wealth
-        net_equity = current_val - loan
-        net_wealth.append(net_equity)
+        net_wealth[i] = current_val - loan
         
-    return {"net_wealth": net_wealth, "tax_saved": tax_saved_cum, "tax_saved_yearly": tax_saved_yearly, "loan_balance": loan_balances}
+    return ProjectionResult.from_block(PROJECTION_SERIES + TAX_SERIES, block)
 
+@cached_projection
 def calculate_ip_projection(price, loan, growth, yield_rate, interest_rate, tax_rate, maint, mgmt, rates, state, loan_type="Interest Only", loan_term=30, years=10):
-    net_wealth = []
-    tax_saved_cum = []
-    tax_saved_yearly = []
-    loan_balances = []
+    block = np.zeros((len(PROJECTION_SERIES) + len(TAX_SERIES), years))
+    net_wealth, tax_saved_cum, tax_saved_yearly, loan_balances, taxable_incomes, _ = block
     
     current_val = price
     current_loan = loan
@@ -512,6 +755,7 @@ def calculate_ip_projection(price, loan, growth, yield_rate, interest_rate, tax_
         
         total_expenses = interest + maintenance + management + rates + land_tax
         net_cash = rent - total_expenses
+        taxable_incomes[i] = net_cash
         
         # Tax Impact
         if net_cash < 0:
@@ -522,17 +766,14 @@ def calculate_ip_projection(price, loan, growth, yield_rate, interest_rate, tax_
             current_tax_saving = -(net_cash * tax_rate)
             total_tax_saved += current_tax_saving
             
-        tax_saved_cum.append(total_tax_saved)
-        tax_saved_yearly.append(current_tax_saving)
+        tax_saved_cum[i] = total_tax_saved
+        tax_saved_yearly[i] = current_tax_saving
         
         # Update Loan
         current_loan -= principal_paid
-        loan_balances.append(current_loan)
+        loan_balances[i] = current_loan
         
         # Net Equity
-        net_equity = current_val - current_loan
-        net_wealth.append(net_equity)
-        
-    render_footer_disclaimer()
+        net_wealth[i] = current_val - current_loan
         
-    return {"net_wealth": net_wealth, "tax_saved": tax_saved_cum, "tax_saved_yearly": tax_saved_yearly, "loan_balance": loan_balances}
+    return ProjectionResult.from_block(PROJECTION_SERIES + TAX_SERIES, block)
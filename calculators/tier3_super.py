@@ -1,18 +1,21 @@
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
-import json
-import os
-from utils.ui import parse_currency_input
+import numpy as np
+from utils.ui import parse_currency_input, render_export_buttons, render_consolidated_report_button
 from utils.compliance import render_footer_disclaimer, get_projection_disclaimer
 from utils.leads import render_lead_capture_form
+from utils.results import ProjectionResult
+from utils.session import store_result, get_result
+from utils.cache import cached_projection
+from utils.funds import fund_registry
+from utils.charts import (brand_figure, cached_figure, BRAND_NAVY, BRAND_INDIGO, BRAND_PURPLE, BRAND_EMERALD,
+                          BRAND_AMBER, BRAND_BLUE, BRAND_RED)
+from calculators.fee_drag import get_fee_drag_table, FEE_COMPONENTS, FEE_COMPONENT_LABELS, SALARY_BAND, BALANCE_BAND
 
-# Load fund fee data
-@st.cache_data
+# Load fund fee data (compiled index, reloaded when fund_fees.json changes)
 def load_fund_data():
-    data_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'fund_fees.json')
-    with open(data_path, 'r') as f:
-        return json.load(f)
+    return fund_registry.current()
 
 def render_tier3_super():
     st.title("Tier 3: Acceleration (Superannuation Concepts)")
@@ -127,54 +130,19 @@ def render_tier3_super():
     if st.session_state.get('tier3_submitted', False):
         years_to_retirement = retirement_age - current_age
         
-        # Get fund-specific fees
-        fund_info = fund_data[selected_fund]
-        
-        # Determine Marginal Rate for Tax Benefit Calc (Simple estimate based on income)
-        # Using 2024-25 resident tax rates
-        income = annual_salary
-        if income > 190000:
-            marginal_rate = 0.45
-        elif income > 135000:
-            marginal_rate = 0.37
-        elif income > 45000:
-            marginal_rate = 0.30
-        else:
-            marginal_rate = 0.19
-            
-        # Medicare levy
-        marginal_rate += 0.02 
-        
-        # Calculate projections with fund-specific fees
-        hg_projection = calculate_super_projection(
-            current_balance, annual_salary, employer_contrib, voluntary_contrib,
-            high_growth_return, fund_info['investment_fee_high_growth'], 
-            fund_info['admin_fee_flat'], fund_info['admin_fee_percent'], 
-            fund_info['admin_fee_cap'], fund_info['transaction_cost'],
-            salary_growth, years_to_retirement, unused_cap, marginal_rate
-        )
-        
-        bal_projection = calculate_super_projection(
-            current_balance, annual_salary, employer_contrib, voluntary_contrib,
-            balanced_return, fund_info['investment_fee_balanced'], 
-            fund_info['admin_fee_flat'], fund_info['admin_fee_percent'], 
-            fund_info['admin_fee_cap'], fund_info['transaction_cost'],
-            salary_growth, years_to_retirement, unused_cap, marginal_rate
-        )
-        
-        st.session_state['tier3_results'] = {
-            'hg_projection': hg_projection,
-            'bal_projection': bal_projection,
-            'current_age': current_age,
-            'retirement_age': retirement_age,
-            'selected_fund': selected_fund,
-            'current_balance': current_balance,
-            'unused_cap': unused_cap,
-            'tax_saved_catchup': hg_projection.get('tax_saved_catchup', 0)
+        tier3_inputs = {
+            "selected_fund": selected_fund, "current_age": current_age, "retirement_age": retirement_age,
+            "current_balance": current_balance, "annual_salary": annual_salary,
+            "employer_contrib": employer_contrib, "voluntary_contrib": voluntary_contrib,
+            "high_growth_return": high_growth_return, "balanced_return": balanced_return,
+            "salary_growth": salary_growth, "unused_cap": unused_cap
         }
+        # Resume from the last run's year-by-year state so slider drags only recompute the years they affect
+        previous = st.session_state.get('tier3_results')
+        store_result('tier3_results', calculate_tier3_results(**tier3_inputs, previous=previous), recompute=calculate_tier3_results, inputs=tier3_inputs)
 
-    if 'tier3_results' in st.session_state:
-        results = st.session_state['tier3_results']
+    results = get_result('tier3_results')
+    if results:
         hg_projection = results['hg_projection']
         bal_projection = results['bal_projection']
         current_age = results['current_age']
@@ -223,60 +191,23 @@ def render_tier3_super():
             # Chart 1: Growth Lines
             years = list(range(current_age, retirement_age + 1))
             
-            # Prepare Display Data
-            hg_display = []
-            bal_display = []
-            
-            for i, (hg, bal) in enumerate(zip(hg_projection['balance'], bal_projection['balance'])):
-                factor = (1 + inflation_rate) ** i
-                hg_display.append(hg / factor)
-                bal_display.append(bal / factor)
-            
-            fig = go.Figure()
-            
-            fig.add_trace(go.Scatter(
-                x=years, 
-                y=hg_display, 
-                name="High Growth",
-                line={'color': '#6366F1', 'width': 4},
-                mode='lines',
-                fill='tonexty'
-            ))
-            
-            fig.add_trace(go.Scatter(
-                x=years, 
-                y=bal_display, 
-                name="Balanced",
-                line={'color': '#0F172A', 'width': 4, 'dash': 'dash'},
-                mode='lines'
-            ))
+            # Prepare Display Data (nominal view uses the stored arrays directly)
+            if show_real:
+                factors = (1 + inflation_rate) ** np.arange(hg_projection.periods)
+                hg_display = hg_projection['balance'] / factors
+                bal_display = bal_projection['balance'] / factors
+            else:
+                hg_display = hg_projection['balance']
+                bal_display = bal_projection['balance']
             
-            fig.update_layout(
-                title=f"Super Balance Growth: Age {current_age} → {retirement_age}",
-                xaxis_title="Age",
-                yaxis_title="Super Balance ($)",
-                hovermode="x unified",
-                height=450
-            )
+            fig = create_growth_chart(years, hg_display, bal_display, current_age, retirement_age)
             
             st.plotly_chart(fig, use_container_width=True)
 
             # Chart 2: The Gap (Difference)
-            gap_values = [h - b for h, b in zip(hg_display, bal_display)]
+            gap_values = hg_display - bal_display
             
-            fig_gap = go.Figure()
-            fig_gap.add_trace(go.Bar(
-                x=years,
-                y=gap_values,
-                name="The Gap",
-                marker_color='#A855F7'
-            ))
-            fig_gap.update_layout(
-                title="The Cost of Waiting: Cumulative Difference Over Time",
-                xaxis_title="Age",
-                yaxis_title="Difference ($)",
-                height=300
-            )
+            fig_gap = create_gap_chart(years, gap_values)
             st.plotly_chart(fig_gap, use_container_width=True)
             
             # Insight
@@ -296,9 +227,7 @@ def render_tier3_super():
             st.markdown(f"Comparing **{selected_fund}** against the top 5 performing funds (based on 10-year High Growth returns)")
             
             # Get top 5 funds by high growth returns
-            fund_performance = [(name, data['return_high_growth_10y']) for name, data in fund_data.items()]
-            fund_performance.sort(key=lambda x: x[1], reverse=True)
-            top_5_funds = [f[0] for f in fund_performance[:5]]
+            top_5_funds = fund_data.top('return_high_growth_10y', 5)
             
             # Make sure user's fund is included
             comparison_funds = top_5_funds.copy()
@@ -308,7 +237,7 @@ def render_tier3_super():
             # Calculate projections for each fund
             fund_projections = {}
             for fund_name in comparison_funds:
-                fund = fund_data[fund_name]
+                fund = fund_data.fees(fund_name)
                 projection = calculate_super_projection(
                     current_balance, annual_salary, employer_contrib, voluntary_contrib,
                     fund['return_high_growth_10y'], fund['investment_fee_high_growth'], 
@@ -320,36 +249,11 @@ def render_tier3_super():
             
             # Create comparison chart
             years = list(range(current_age, retirement_age + 1))
-            fig2 = go.Figure()
-            
-            # Color palette
-            colors = ['#6366F1', '#10B981', '#A855F7', '#F59E0B', '#3B82F6', '#EF4444']
-            
-            for idx, (fund_name, balances) in enumerate(fund_projections.items()):
-                # Adjust for inflation
-                adj_balances = [b / ((1 + inflation_rate) ** i) for i, b in enumerate(balances)]
-                
-                is_user_fund = (fund_name == selected_fund)
-                fig2.add_trace(go.Scatter(
-                    x=years,
-                    y=adj_balances,
-                    name=f"{fund_name} {'(YOUR FUND)' if is_user_fund else ''}",
-                    line={
-                        'color': colors[idx % len(colors)],
-                        'width': 5 if is_user_fund else 2,
-                        'dash': 'solid' if is_user_fund else 'dot'
-                    },
-                    mode='lines'
-                ))
-            
-            fig2.update_layout(
-                title=f"Fund Performance Comparison (High Growth Option)",
-                xaxis_title="Age",
-                yaxis_title="Super Balance ($)",
-                hovermode="x unified",
-                height=500,
-                legend=dict(orientation="v", yanchor="top", y=0.99, xanchor="left", x=0.01)
-            )
+            fund_balances = {
+                fund_name: balances / ((1 + inflation_rate) ** np.arange(len(balances))) if show_real else balances
+                for fund_name, balances in fund_projections.items()
+            }
+            fig2 = create_fund_comparison_chart(years, fund_balances, selected_fund)
             
             st.plotly_chart(fig2, use_container_width=True)
             st.caption(get_projection_disclaimer())
@@ -399,7 +303,28 @@ def render_tier3_super():
                 
                 *Past performance is not a reliable indicator of future performance.*
                 """)
-        
+
+            # --- Fee drag breakdown ---
+            st.markdown("#### 💸 Where Do the Fees Go?")
+            st.caption(f"Estimated reduction in the retirement balance caused by each fee component "
+                       f"(inputs rounded to the nearest ${SALARY_BAND:,} salary and ${BALANCE_BAND:,} balance band). "
+                       f"A negative Admin Cap figure is what the cap saves you.")
+            fee_drag = get_fee_drag_table(current_balance, annual_salary, employer_contrib, voluntary_contrib,
+                                          salary_growth, years_to_retirement)
+            df_fee_drag = pd.DataFrame({'Fund': fee_drag['funds'], 'Option': fee_drag['options']})
+            for column in FEE_COMPONENTS + ('total',):
+                df_fee_drag[FEE_COMPONENT_LABELS[column]] = fee_drag[column] / discount_factor
+            df_fee_drag = df_fee_drag[df_fee_drag['Fund'].isin(comparison_funds)].sort_values(
+                ['Option', FEE_COMPONENT_LABELS['total']]
+            )
+            df_fee_drag['Fund'] = [f"{name} {'⭐ (You)' if name == selected_fund else ''}" for name in df_fee_drag['Fund']]
+
+            st.dataframe(
+                df_fee_drag.style.format({label: '${:,.0f}' for key, label in FEE_COMPONENT_LABELS.items()}),
+                use_container_width=True,
+                hide_index=True
+            )
+
         with tab3:
             # GATED CONTENT
             if 'lead_data' in st.session_state and st.session_state.lead_data.get('email'):
@@ -409,7 +334,7 @@ def render_tier3_super():
                     'Age': years,
                     'High Growth Balance': hg_projection['balance'],
                     'Balanced Balance': bal_projection['balance'],
-                    'Gap': [hg - bal for hg, bal in zip(hg_projection['balance'], bal_projection['balance'])]
+                    'Gap': hg_projection['balance'] - bal_projection['balance']
                 })
                 
                 st.dataframe(
@@ -420,6 +345,7 @@ def render_tier3_super():
                     }),
                     use_container_width=True
                 )
+                render_export_buttons(results, "Super_Year_by_Year", key="t3_export")
             else:
                  st.info("🔒 **Detailed Projection Locked**")
                  if render_lead_capture_form("tier3_tab3", button_label="Unlock Detailed View"):
@@ -431,22 +357,238 @@ def render_tier3_super():
         # PDF Generation (if data exists)
         st.divider()
         if 'lead_data' in st.session_state and st.session_state.lead_data.get('email'):
-             # PDF logic would go here
-             st.info("📄 PDF Report generation for Super is coming soon.")
+             render_consolidated_report_button("tier3_report")
         else:
              st.markdown("### 📄 Want a Professional PDF Report?")
              if render_lead_capture_form("tier3_pdf", button_label="Generate PDF Report"):
                  st.rerun()
 
+# --- Charts ---
+
+FUND_COLORS = [BRAND_INDIGO, BRAND_EMERALD, BRAND_PURPLE, BRAND_AMBER, BRAND_BLUE, BRAND_RED]
+
+@cached_figure
+def create_growth_chart(years, hg_balances, bal_balances, current_age, retirement_age):
+    fig = brand_figure()
+    
+    fig.add_trace(go.Scatter(
+        x=years, 
+        y=hg_balances, 
+        name="High Growth",
+        line={'color': BRAND_INDIGO, 'width': 4},
+        mode='lines',
+        fill='tonexty'
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=years, 
+        y=bal_balances, 
+        name="Balanced",
+        line={'color': BRAND_NAVY, 'width': 4, 'dash': 'dash'},
+        mode='lines'
+    ))
+    
+    fig.update_layout(
+        title=f"Super Balance Growth: Age {current_age} → {retirement_age}",
+        xaxis_title="Age",
+        yaxis_title="Super Balance ($)",
+        hovermode="x unified",
+        height=450
+    )
+    return fig
+
+
+@cached_figure
+def create_gap_chart(years, gap_values):
+    fig = brand_figure()
+    fig.add_trace(go.Bar(
+        x=years,
+        y=gap_values,
+        name="The Gap",
+        marker_color=BRAND_PURPLE
+    ))
+    fig.update_layout(
+        title="The Cost of Waiting: Cumulative Difference Over Time",
+        xaxis_title="Age",
+        yaxis_title="Difference ($)",
+        height=300
+    )
+    return fig
+
+
+@cached_figure
+def create_fund_comparison_chart(years, fund_balances, selected_fund):
+    fig = brand_figure()
+    
+    for idx, (fund_name, balances) in enumerate(fund_balances.items()):
+        is_user_fund = (fund_name == selected_fund)
+        fig.add_trace(go.Scatter(
+            x=years,
+            y=balances,
+            name=f"{fund_name} {'(YOUR FUND)' if is_user_fund else ''}",
+            line={
+                'color': FUND_COLORS[idx % len(FUND_COLORS)],
+                'width': 5 if is_user_fund else 2,
+                'dash': 'solid' if is_user_fund else 'dot'
+            },
+            mode='lines'
+        ))
+    
+    fig.update_layout(
+        title=f"Fund Performance Comparison (High Growth Option)",
+        xaxis_title="Age",
+        yaxis_title="Super Balance ($)",
+        hovermode="x unified",
+        height=500,
+        legend=dict(orientation="v", yanchor="top", y=0.99, xanchor="left", x=0.01)
+    )
+    return fig
+
+def calculate_tier3_results(selected_fund, current_age, retirement_age, current_balance, annual_salary,
+                            employer_contrib, voluntary_contrib, high_growth_return, balanced_return,
+                            salary_growth, unused_cap, previous=None):
+    """
+    Runs the High Growth and Balanced projections for one fund and set of inputs.
+    `previous` is an earlier result of this function to resume the projections from.
+    """
+    years_to_retirement = retirement_age - current_age
+    
+    # Get fund-specific fees
+    fund_info = load_fund_data().fees(selected_fund)
+    
+    # Determine Marginal Rate for Tax Benefit Calc (Simple estimate based on income)
+    # Using 2024-25 resident tax rates
+    income = annual_salary
+    if income > 190000:
+        marginal_rate = 0.45
+    elif income > 135000:
+        marginal_rate = 0.37
+    elif income > 45000:
+        marginal_rate = 0.30
+    else:
+        marginal_rate = 0.19
+        
+    # Medicare levy
+    marginal_rate += 0.02 
+    
+    # Calculate projections with fund-specific fees
+    hg_projection = calculate_super_projection(
+        current_balance, annual_salary, employer_contrib, voluntary_contrib,
+        high_growth_return, fund_info['investment_fee_high_growth'], 
+        fund_info['admin_fee_flat'], fund_info['admin_fee_percent'], 
+        fund_info['admin_fee_cap'], fund_info['transaction_cost'],
+        salary_growth, years_to_retirement, unused_cap, marginal_rate,
+        resume_from=previous.get('hg_projection') if previous else None
+    )
+    
+    bal_projection = calculate_super_projection(
+        current_balance, annual_salary, employer_contrib, voluntary_contrib,
+        balanced_return, fund_info['investment_fee_balanced'], 
+        fund_info['admin_fee_flat'], fund_info['admin_fee_percent'], 
+        fund_info['admin_fee_cap'], fund_info['transaction_cost'],
+        salary_growth, years_to_retirement, unused_cap, marginal_rate,
+        resume_from=previous.get('bal_projection') if previous else None
+    )
+    
+    return {
+        'hg_projection': hg_projection,
+        'bal_projection': bal_projection,
+        'current_age': current_age,
+        'retirement_age': retirement_age,
+        'selected_fund': selected_fund,
+        'current_balance': current_balance,
+        'unused_cap': unused_cap,
+        'tax_saved_catchup': hg_projection.get('tax_saved_catchup', 0)
+    }
+
+def calculate_all_fund_projections(current_balance, annual_salary, employer_contrib, voluntary_contrib,
+                                   salary_growth, years, unused_cap=0, marginal_rate=0.32, progress=None):
+    """
+    Projects every fund in fund_fees.json at its historical High Growth and Balanced returns.
+    Returns {fund_name: {'high_growth': ProjectionResult, 'balanced': ProjectionResult}}.
+    """
+    fund_data = load_fund_data()
+    projections = {}
+    for idx, fund_name in enumerate(fund_data.names):
+        fund = fund_data.fees(fund_name)
+        common = (fund['admin_fee_flat'], fund['admin_fee_percent'], fund['admin_fee_cap'], fund['transaction_cost'],
+                  salary_growth, years, unused_cap, marginal_rate)
+        projections[fund_name] = {
+            'high_growth': calculate_super_projection(
+                current_balance, annual_salary, employer_contrib, voluntary_contrib,
+                fund['return_high_growth_10y'], fund['investment_fee_high_growth'], *common
+            ),
+            'balanced': calculate_super_projection(
+                current_balance, annual_salary, employer_contrib, voluntary_contrib,
+                fund['return_balanced_10y'], fund['investment_fee_balanced'], *common
+            ),
+        }
+        if progress is not None:
+            progress((idx + 1) / len(fund_data))
+    return projections
+
+# Inputs that shape every year of the projection; any change means a full rerun
+SUPER_PATH_INPUTS = ('balance', 'salary', 'employer_rate', 'return_rate', 'investment_fee_rate',
+                     'admin_fee_flat', 'admin_fee_percent', 'admin_fee_cap', 'transaction_cost', 'unused_cap')
+
+def _contribution_schedule(voluntary, years):
+    """Per-year voluntary amounts from a flat amount or a schedule (last amount repeats)."""
+    if np.ndim(voluntary) == 0:
+        return np.full(years, float(voluntary))
+    amounts = np.asarray(voluntary, dtype=np.float64)
+    if amounts.size == 0:
+        return np.zeros(years)
+    if amounts.size >= years:
+        return amounts[:years].copy()
+    return np.concatenate([amounts, np.full(years - amounts.size, amounts[-1])])
+
+def _first_changed_year(previous, inputs):
+    """First projection year whose state differs from `previous`'s (0 = nothing reusable)."""
+    prev_inputs = previous.scalars.get('inputs') if isinstance(previous, ProjectionResult) else None
+    if not prev_inputs or any(prev_inputs[name] != inputs[name] for name in SUPER_PATH_INPUTS):
+        return 0
+    limit = min(prev_inputs['years'], inputs['years'])
+    if prev_inputs['salary_growth'] != inputs['salary_growth']:
+        limit = min(limit, 1)  # Year 0 uses the starting salary either way
+    changed = np.flatnonzero(prev_inputs['voluntary'][:limit] != inputs['voluntary'][:limit])
+    return int(changed[0]) if changed.size else limit
+
+@cached_projection(ignore=('resume_from',))
 def calculate_super_projection(balance, salary, employer_rate, voluntary, return_rate, 
                                investment_fee_rate, admin_fee_flat, admin_fee_percent, 
                                admin_fee_cap, transaction_cost, salary_growth, years, 
-                               unused_cap=0, marginal_rate=0.32):
+                               unused_cap=0, marginal_rate=0.32, resume_from=None):
     """
-    Calculate super balance projection with compounding and fund-specific fees
+    Calculate super balance projection with compounding and fund-specific fees.
+
+    `voluntary` is a flat annual amount or a per-year schedule. Passing the
+    previous result as `resume_from` reuses its year-by-year balances and
+    salaries up to the first year the inputs change (e.g. a later retirement
+    age or a change to later-year contributions) and only steps the rest.
     """
-    balances = [balance]
-    current_salary = salary
+    years = max(years, 0)
+    voluntary_by_year = _contribution_schedule(voluntary, years)
+    voluntary_by_year.flags.writeable = False
+    inputs = {
+        'balance': balance, 'salary': salary, 'employer_rate': employer_rate, 'return_rate': return_rate,
+        'investment_fee_rate': investment_fee_rate, 'admin_fee_flat': admin_fee_flat,
+        'admin_fee_percent': admin_fee_percent, 'admin_fee_cap': admin_fee_cap,
+        'transaction_cost': transaction_cost, 'unused_cap': unused_cap,
+        'salary_growth': salary_growth, 'years': years, 'voluntary': voluntary_by_year
+    }
+
+    # Preallocated: opening balance plus one closing balance per year, and the salary used each year
+    block = np.empty((2, years + 1))
+    balances, salaries = block
+    start = _first_changed_year(resume_from, inputs) if resume_from is not None else 0
+    if start > 0:
+        balances[:start + 1] = resume_from['balance'][:start + 1]
+        salaries[:start] = resume_from['salary'][:start]
+        balance = balances[start]
+        current_salary = salaries[start - 1] * (1 + salary_growth)
+    else:
+        balances[0] = balance
+        current_salary = salary
     
     # Calculate tax efficacy of catch-up
     # Catch-up contributions are taxed at 15% in fund, vs marginal_rate outside
@@ -455,10 +597,12 @@ def calculate_super_projection(balance, salary, employer_rate, voluntary, return
     if unused_cap > 0:
         tax_saved_catchup = unused_cap * (marginal_rate - 0.15)
     
-    for year in range(years):
+    for year in range(start, years):
+        salaries[year] = current_salary
+
         # Contributions
         employer_contrib = current_salary * employer_rate
-        total_contrib = employer_contrib + voluntary
+        total_contrib = employer_contrib + voluntary_by_year[year]
         
         # Apply catch-up in Year 1 (index 0 loop)
         if year == 0 and unused_cap > 0:
@@ -495,12 +639,16 @@ def calculate_super_projection(balance, salary, employer_rate, voluntary, return
         
         # New balance
         balance = balance + net_contrib + net_return - admin_total
-        balances.append(balance)
+        balances[year + 1] = balance
         
         # Salary growth
         current_salary *= (1 + salary_growth)
+    salaries[years] = current_salary
     
-    
-    return {'balance': balances, 'tax_saved_catchup': tax_saved_catchup}
+    return ProjectionResult.from_block(('balance', 'salary'), block, {
+        'tax_saved_catchup': tax_saved_catchup,
+        'inputs': inputs,
+        'resumed_from_year': start
+    })
 
     render_footer_disclaimer()
@@ -2,6 +2,15 @@ import streamlit as st
 import plotly.graph_objects as go
 from utils.ui import parse_currency_input
 from utils.compliance import render_footer_disclaimer, get_projection_disclaimer
+from utils.session import store_result, get_result
+from utils.charts import brand_figure, cached_figure, BRAND_NAVY, BRAND_INDIGO
+
+# Death benefits tax on the taxable component for non-dependants (15% + 2% Medicare Levy)
+DEATH_BENEFITS_TAX_RATE = 0.17
+
+def calculate_estate_tax(balance, taxable_portion):
+    """Potential death benefits tax on a super balance paid to non-dependant beneficiaries."""
+    return balance * taxable_portion * DEATH_BENEFITS_TAX_RATE
 
 def render_tier5_legacy():
     """Renders the Tier 5 'Legacy & Estate' Calculator."""
@@ -26,7 +35,7 @@ def render_tier5_legacy():
     
     # Pull from Tier 3 (Super)
     # Try to get projected balance, otherwise fallback to current or default
-    tier3_results = st.session_state.get('tier3_results', {})
+    tier3_results = get_result('tier3_results', {})
     
     default_super_balance = 500000
     if tier3_results:
@@ -98,7 +107,7 @@ def render_tier5_legacy():
             projected_balance = super_balance
     
     # Calculation: Projected Super Balance * Taxable% * 17% (15% tax + 2% Medicare)
-    estate_tax_liability = projected_balance * taxable_portion * 0.17
+    estate_tax_liability = calculate_estate_tax(projected_balance, taxable_portion)
     
     # Scope Note
     if use_tier3_projection:
@@ -118,29 +127,7 @@ def render_tier5_legacy():
          
     with col_est_2:
         # Minimalist Bar Chart for Wealth Gap / Tax
-        fig_estate = go.Figure()
-        fig_estate.add_trace(go.Bar(
-            y=['Estate Value'],
-            x=[projected_balance],
-            name='Total Super (Projected)',
-            orientation='h',
-            marker_color='#0F172A' # Deep Slate
-        ))
-        fig_estate.add_trace(go.Bar(
-            y=['Estate Value'],
-            x=[estate_tax_liability],
-            name='Potential Tax',
-            orientation='h',
-            marker_color='#6366F1' # Indigo
-        ))
-        
-        fig_estate.update_layout(
-            barmode='overlay', 
-            title=f"Impact of Death Benefits Tax ({'At Retirement' if use_tier3_projection else 'Projected'})",
-            height=200,
-            margin=dict(l=20, r=20, t=30, b=20),
-            legend=dict(orientation="h", y=1.1)
-        )
+        fig_estate = create_estate_chart(projected_balance, estate_tax_liability, use_tier3_projection)
         st.plotly_chart(fig_estate, use_container_width=True)
         render_chart_disclaimer()
 
@@ -168,7 +155,7 @@ def render_tier5_legacy():
     # Savings = WashAmount * TaxablePortion * 17%
     # Logic: We are converting 'WashAmount' from Taxable to Tax-Free.
     # The tax saved is the tax that WOULD have been paid on that component.
-    tax_saved = wash_amount * taxable_portion * 0.17
+    tax_saved = calculate_estate_tax(wash_amount, taxable_portion)
     
     # Scope Note
     st.caption("ℹ️ *Recontribution Note: Calculations assume the user meets all eligibility criteria for non-concessional contributions and the bring-forward rule. The proportioning rule is applied conceptually; actual results depend on specific fund components.*")
@@ -187,12 +174,12 @@ def render_tier5_legacy():
         )
 
     # Save results to session state for Summary Page
-    st.session_state['legacy_results'] = {
+    store_result('legacy_results', {
         'current_tax': estate_tax_liability,
         'future_tax': future_tax,
         'taxable_portion': taxable_portion,
         'projected_balance': projected_balance
-    }
+    })
 
     # --- 4. Call to Action (CTA) ---
     st.divider()
@@ -258,3 +245,32 @@ def render_sticky_footer_disclaimer():
             Scenario modelling for illustrative purposes only. No Financial Advice provided.
         </div>
     """, unsafe_allow_html=True)
+
+
+@cached_figure
+def create_estate_chart(projected_balance, estate_tax_liability, use_tier3_projection):
+    """Minimalist overlay bar of the estate value and the potential tax on it."""
+    fig = brand_figure()
+    fig.add_trace(go.Bar(
+        y=['Estate Value'],
+        x=[projected_balance],
+        name='Total Super (Projected)',
+        orientation='h',
+        marker_color=BRAND_NAVY # Deep Slate
+    ))
+    fig.add_trace(go.Bar(
+        y=['Estate Value'],
+        x=[estate_tax_liability],
+        name='Potential Tax',
+        orientation='h',
+        marker_color=BRAND_INDIGO # Indigo
+    ))
+    
+    fig.update_layout(
+        barmode='overlay', 
+        title=f"Impact of Death Benefits Tax ({'At Retirement' if use_tier3_projection else 'Projected'})",
+        height=200,
+        margin=dict(l=20, r=20, t=30, b=20),
+        legend=dict(orientation="h", y=1.1)
+    )
+    return fig
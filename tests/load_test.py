@@ -0,0 +1,205 @@
+"""
+Headless load test for app.py.
+
+Each virtual user is a Streamlit AppTest session (the same script runner the
+server uses, no browser or network) walking the full journey:
+Home -> Tier 1 -> Tier 2 -> Tier 3 -> FIRE -> Legacy -> Summary, submitting
+each calculator with its inputs jittered so users don't all hit the same
+cache entries. AppTest swaps process-global state on every run (the
+Runtime singleton, config), so each virtual user runs in its own process.
+Memory is therefore reported per process: the loaded app plus what each
+session adds on top, which is what sizing a pod needs.
+
+    python tests/load_test.py --users 8 --journeys 3
+    python tests/load_test.py --users 20 --json load_report.json
+
+Reports per-step latency percentiles, journeys/sec, CPU use across all
+users and memory per session.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from streamlit.testing.v1 import AppTest
+from utils.simulation import pool_context
+
+APP_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app.py'))
+
+# (page, label prefix of the button that submits it, or None)
+JOURNEY = (
+    ("Home", None),
+    ("Tier 1: Clarity (Readiness)", "🚀"),
+    ("Tier 2: Direction (Strategy)", "🚀"),
+    ("Tier 3: Acceleration (Super)", "🚀"),
+    ("Tier 4: Freedom (FIRE)", "🚀"),
+    ("Tier 5: Protection (Legacy)", None),
+    ("Information Summary", None),
+)
+
+LATENCY_PERCENTILES = (50, 90, 95, 99)
+
+
+def _rss_bytes():
+    """Current resident memory of this process (Linux), or None."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _jitter_inputs(at, rng):
+    """Scales every numeric text input on the page by +/-20%."""
+    for text_input in at.text_input:
+        try:
+            value = float(str(text_input.value).replace(",", "").replace("$", ""))
+        except ValueError:
+            continue
+        if value > 0:
+            text_input.set_value(f"{int(value * rng.uniform(0.8, 1.2)):,}")
+
+
+def run_virtual_user(user_id, journeys, think_time, registered, timeout):
+    """
+    One virtual user (runs in its own process): `journeys` full journeys in
+    one AppTest session. Returns step timings, errors, CPU seconds and memory.
+    """
+    rng = random.Random(user_id)
+    timings, errors = {}, []
+    cpu_start = resource.getrusage(resource.RUSAGE_SELF)
+    rss_start = _rss_bytes()
+    rss_loaded = None
+
+    def timed(step, at):
+        started = time.perf_counter()
+        at.run(timeout=timeout)
+        timings.setdefault(step, []).append(time.perf_counter() - started)
+        if at.exception:
+            errors.append(f"user {user_id} {step}: {at.exception[0].value}")
+
+    try:
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        timed("Home (first load)", at)
+        rss_loaded = _rss_bytes()
+        if registered:
+            # Registered users see the gated tables, PDFs and summary
+            at.session_state["lead_data"] = {"name": f"Load User {user_id}", "email": f"load{user_id}@example.com"}
+
+        for _ in range(journeys):
+            for page, submit in JOURNEY:
+                at.session_state["page_selection"] = page
+                timed(page, at)
+                if submit:
+                    button = next((b for b in at.button if b.label.startswith(submit)), None)
+                    if button is None:
+                        errors.append(f"user {user_id} {page}: no submit button")
+                    else:
+                        _jitter_inputs(at, rng)
+                        button.click()
+                        timed(f"{page} · submit", at)
+                if think_time:
+                    time.sleep(rng.uniform(0, 2 * think_time))
+    except Exception as e:  # A crashed user is a result, not a harness failure
+        errors.append(f"user {user_id} crashed: {e!r}")
+
+    cpu_end = resource.getrusage(resource.RUSAGE_SELF)
+    rss_end = _rss_bytes()
+    return {
+        "timings": timings,
+        "errors": errors,
+        "cpu_seconds": (cpu_end.ru_utime - cpu_start.ru_utime) + (cpu_end.ru_stime - cpu_start.ru_stime),
+        # ru_maxrss is kilobytes on Linux
+        "peak_rss_mb": cpu_end.ru_maxrss / 1024,
+        "app_rss_mb": (rss_loaded or 0) / 1024 / 1024,
+        "session_mb": ((rss_end or 0) - (rss_loaded or rss_start or 0)) / 1024 / 1024,
+    }
+
+
+def run_load_test(users=4, journeys=1, think_time=0.0, registered=True, timeout=120):
+    """Runs the virtual users concurrently and returns the report dict."""
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=users, mp_context=pool_context()) as executor:
+        futures = [executor.submit(run_virtual_user, i, journeys, think_time, registered, timeout) for i in range(users)]
+        results = [future.result() for future in futures]
+    wall = time.perf_counter() - started
+
+    timings, errors = {}, []
+    for result in results:
+        errors.extend(result["errors"])
+        for step, samples in result["timings"].items():
+            timings.setdefault(step, []).extend(samples)
+
+    steps = {}
+    for step, samples in timings.items():
+        samples = np.array(samples) * 1000
+        steps[step] = {"count": len(samples), "mean_ms": float(samples.mean()), "max_ms": float(samples.max())}
+        steps[step].update({f"p{p}_ms": float(v) for p, v in zip(LATENCY_PERCENTILES, np.percentile(samples, LATENCY_PERCENTILES))})
+
+    cpu_seconds = sum(r["cpu_seconds"] for r in results)
+    return {
+        "users": users,
+        "journeys_per_user": journeys,
+        "wall_seconds": wall,
+        "journeys_per_second": users * journeys / wall if wall else 0.0,
+        "cpu_seconds": cpu_seconds,
+        "cpu_percent": 100 * cpu_seconds / wall if wall else 0.0,
+        "cpus": os.cpu_count(),
+        "app_rss_mb": float(np.median([r["app_rss_mb"] for r in results])),
+        "session_mb": float(np.median([r["session_mb"] for r in results])),
+        "peak_rss_mb": max(r["peak_rss_mb"] for r in results),
+        "steps": steps,
+        "errors": errors,
+    }
+
+
+def print_report(report):
+    print(f"\n{report['users']} users x {report['journeys_per_user']} journeys in {report['wall_seconds']:.1f}s "
+          f"({report['journeys_per_second']:.2f} journeys/sec)")
+    print(f"CPU {report['cpu_seconds']:.1f}s ({report['cpu_percent']:.0f}% of one core, {report['cpus']} available)")
+    print(f"Memory: app loaded {report['app_rss_mb']:.0f} MB, +{report['session_mb']:.1f} MB per session after the "
+          f"journeys, {report['peak_rss_mb']:.0f} MB peak process\n")
+
+    header = f"{'Step':<42}{'n':>5}" + "".join(f"{f'p{p}':>9}" for p in LATENCY_PERCENTILES) + f"{'max':>9}"
+    print(header)
+    print("-" * len(header))
+    order = ["Home (first load)"] + [s for page, submit in JOURNEY for s in (page, f"{page} · submit" if submit else None) if s]
+    for step in order:
+        if step in report["steps"]:
+            s = report["steps"][step]
+            print(f"{step:<42}{s['count']:>5}" + "".join(f"{s[f'p{p}_ms']:>8.0f}ms" for p in LATENCY_PERCENTILES)
+                  + f"{s['max_ms']:>7.0f}ms")
+
+    if report["errors"]:
+        print(f"\n{len(report['errors'])} errors:")
+        for error in report["errors"][:20]:
+            print(f"  {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless concurrent-session load test for app.py")
+    parser.add_argument("--users", type=int, default=4, help="Concurrent virtual users")
+    parser.add_argument("--journeys", type=int, default=1, help="Full journeys per user")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between pages (seconds)")
+    parser.add_argument("--anonymous", action="store_true", help="Skip lead capture (gated content stays locked)")
+    parser.add_argument("--timeout", type=float, default=120, help="Per-run script timeout (seconds)")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = run_load_test(args.users, args.journeys, args.think_time, not args.anonymous, args.timeout)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    sys.exit(1 if report["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
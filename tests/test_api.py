@@ -0,0 +1,110 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import threading
+import unittest
+import urllib.request
+import urllib.error
+import numpy as np
+from api import CalculationServer, run_scenarios, _jsonable
+from calculators.engines import run_strategy
+
+class TestCalculationAPI(unittest.TestCase):
+
+    def test_calculators_direct(self):
+        results = run_scenarios("readiness", [{"equity": 600000, "income": 180000, "experience": "Intermediate", "age": 40}])
+        self.assertTrue(results[0]["ok"])
+        self.assertEqual(results[0]["result"]["assessment"], "Ready")
+
+        strategy = run_strategy({"income": 180000})
+        self.assertEqual(len(strategy["dr_results"]["net_wealth"]), 10)
+
+        bad = run_scenarios("fire", [{"fire_age": 30, "current_age": 40}, {"not_a_field": 1}])
+        self.assertEqual([r["ok"] for r in bad], [False, False])
+
+    def test_results_are_strict_json(self):
+        cleaned = _jsonable({"a": np.array([1.0, np.inf, np.nan]), "b": np.array([[np.nan], [2.0]]), "c": float("-inf")})
+        self.assertEqual(cleaned, {"a": [1.0, None, None], "b": [[None], [2.0]], "c": None})
+        json.dumps(cleaned, allow_nan=False)
+
+        projection = run_scenarios("super", [{}])[0]["result"]["hg_projection"]
+        self.assertIn("balance", projection)
+        self.assertNotIn("inputs", projection)
+
+    def test_out_of_range_inputs_fail_cleanly(self):
+        bad = run_scenarios("strategy", [{"loan_term": 0, "loan_type": "Principal & Interest"}, {"ip_price": "lots"},
+                                         {"loan_rate": float("nan")}, {}])
+        self.assertEqual([r["ok"] for r in bad], [False, False, False, True])
+        self.assertIn("loan_term", bad[0]["error"])
+        bad = run_scenarios("super", [{"current_age": 10}, {"current_age": 70, "retirement_age": 65}])
+        self.assertEqual([r["ok"] for r in bad], [False, False])
+
+    def test_http_batch(self):
+        server = CalculationServer(("127.0.0.1", 0), workers=2)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+
+        scenarios = [{"current_age": 30 + i, "fire_age": 50} for i in range(5)]
+        req = urllib.request.Request(f"{base}/v1/fire/batch", data=json.dumps({"scenarios": scenarios}).encode(),
+                                     headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            body = json.loads(resp.read())
+        self.assertEqual(len(body["results"]), 5)
+        # Results come back in input order
+        self.assertEqual([r["result"]["ages"][0] for r in body["results"]], [30.0, 31.0, 32.0, 33.0, 34.0])
+
+        req = urllib.request.Request(f"{base}/v1/super", data=json.dumps({"selected_fund": "Nope"}).encode())
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            urllib.request.urlopen(req, timeout=30)
+        self.assertEqual(ctx.exception.code, 400)
+
+        req = urllib.request.Request(f"{base}/v1/fire/batch/export.csv", data=json.dumps({"scenarios": scenarios}).encode())
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            self.assertEqual(resp.headers["Content-Type"], "text/csv")
+            lines = resp.read().decode().splitlines()
+        # Header plus one row per projected year, scenarios in input order
+        self.assertEqual(lines[0].split(",")[:4], ["scenario", "projection", "year", "ages"])
+        labels = [line.split(",")[0] for line in lines[1:]]
+        self.assertEqual(labels, sorted(labels))
+        self.assertEqual(len(labels), sum(len(r["result"]["ages"]) for r in body["results"]))
+
+        req = urllib.request.Request(f"{base}/v1/strategy/export.csv",
+                                     data=json.dumps({"loan_term": 0, "loan_type": "Principal & Interest"}).encode())
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            urllib.request.urlopen(req, timeout=30)
+        self.assertEqual(ctx.exception.code, 400)
+
+        req = urllib.request.Request(f"{base}/v1/readiness/export.csv", data=b"{}")
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            urllib.request.urlopen(req, timeout=30)
+        self.assertEqual(ctx.exception.code, 404)
+
+    def test_stats_count_worker_cache_hits(self):
+        server = CalculationServer(("127.0.0.1", 0), workers=1)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+
+        with urllib.request.urlopen(f"{base}/v1/stats", timeout=30) as resp:
+            self.assertEqual(json.loads(resp.read())["projection_cache"]["workers"], 0)
+        for _ in range(2):
+            req = urllib.request.Request(f"{base}/v1/fire", data=json.dumps({"current_age": 41, "fire_age": 57}).encode())
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                resp.read()
+        with urllib.request.urlopen(f"{base}/v1/stats", timeout=30) as resp:
+            stats = json.loads(resp.read())["projection_cache"]
+        # The repeated request is served from the worker's memory cache
+        self.assertEqual(stats["workers"], 1)
+        self.assertGreaterEqual(stats["hits"], 1)
+        self.assertGreater(stats["hit_rate"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import zipfile
+import tempfile
+import unittest
+from unittest.mock import patch
+import batch_reports
+from batch_reports import generate_batch_reports, build_prospect_reports
+
+class TestBatchReports(unittest.TestCase):
+
+    def test_worker_chunk(self):
+        reports = build_prospect_reports(10, [{"name": "Jo Smith"}, {"name": "Bad", "scenario": {"nope": 1}}])
+        self.assertEqual(reports[0][0], "00011_Jo_Smith.pdf")
+        self.assertTrue(reports[0][1].startswith(b"%PDF"))
+        self.assertIsInstance(reports[1][1], ValueError)
+
+        # Names and goals are text, not markup
+        reports = build_prospect_reports(0, [{"name": "Lee & <Co", "goal": "Grow <b>wealth"}])
+        self.assertTrue(reports[0][1].startswith(b"%PDF"))
+
+        # Any failure in the report build stays with its prospect
+        real = batch_reports.generate_pdf_report
+
+        def flaky(prospect, *args):
+            if prospect["name"] == "A":
+                raise RuntimeError("boom")
+            return real(prospect, *args)
+
+        with patch.object(batch_reports, 'generate_pdf_report', side_effect=flaky):
+            reports = build_prospect_reports(0, [{"name": "A"}, {"name": "B"}])
+        self.assertIsInstance(reports[0][1], RuntimeError)
+        self.assertTrue(reports[1][1].startswith(b"%PDF"))
+
+    def test_batch_zip(self):
+        prospects = [{"name": f"Prospect {i}", "scenario": {"income": 90000 + i * 1000}} for i in range(12)]
+        prospects.append({"name": "Bad", "scenario": {"loan_rate": "x"}})
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "reports.zip")
+            stats = generate_batch_reports(prospects, out, workers=2, chunk_size=5)
+            with zipfile.ZipFile(out) as archive:
+                names = archive.namelist()
+                self.assertTrue(archive.read(names[0]).startswith(b"%PDF"))
+                errors = archive.read("errors.txt").decode()
+        self.assertEqual(stats["pdfs"], 12)
+        self.assertEqual(stats["failed"], 1)
+        self.assertGreater(stats["pdfs_per_second"], 0)
+        self.assertEqual(names[:12], [f"{i + 1:05d}_Prospect_{i}.pdf" for i in range(12)])
+        self.assertIn("00013_Bad.pdf", errors)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import time
+import tempfile
+import unittest
+import numpy as np
+from utils.cache import ProjectionCache, make_key, projection_cache
+from calculators.tier3_super import calculate_super_projection
+
+SUPER_ARGS = (30000, 120000, 0.115, 0, 0.0884, 0.0052, 52, 0.001, 350, 0.0008, 0.03, 30)
+
+class TestProjectionCache(unittest.TestCase):
+
+    def test_canonical_keys(self):
+        # Equal numbers hash the same regardless of int/float or dict order
+        self.assertEqual(make_key("f", {"age": 35, "income": 120000.0}), make_key("f", {"income": 120000, "age": 35.0}))
+        self.assertNotEqual(make_key("f", {"age": 35}), make_key("f", {"age": 36}))
+
+    def test_lru_and_ttl_eviction(self):
+        cache = ProjectionCache(max_entries=2, max_bytes=10 ** 9, ttl_seconds=60, disk_dir=None)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)  # Evicts 'b' (least recently used)
+        self.assertEqual(cache.get("b"), (False, None))
+        self.assertEqual(cache.get("a"), (True, 1))
+
+        short = ProjectionCache(ttl_seconds=0.01, disk_dir=None)
+        short.put("x", 1)
+        time.sleep(0.02)
+        self.assertEqual(short.get("x"), (False, None))
+        self.assertEqual(short.stats()["expired"], 1)
+
+    def test_disk_persistence_survives_new_instance(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = ProjectionCache(disk_dir=tmp)
+            value = calculate_super_projection.uncached(*SUPER_ARGS)
+            first.put("k", value, compute_seconds=0.5)
+
+            second = ProjectionCache(disk_dir=tmp)  # e.g. after a restart
+            found, restored = second.get("k")
+            self.assertTrue(found)
+            np.testing.assert_array_equal(restored['balance'], value['balance'])
+            self.assertFalse(restored['balance'].flags.writeable)
+            self.assertEqual(second.stats()["disk_hits"], 1)
+
+    def test_disk_sweep_drops_expired_and_oldest(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ProjectionCache(ttl_seconds=600, disk_dir=tmp, max_disk_bytes=10 ** 9)
+            for age, key in ((1000, "old"), (300, "a"), (200, "b"), (100, "c")):  # 'old' is past the TTL
+                cache.put(key, np.zeros(1000))
+                os.utime(cache._path(key), (time.time() - age,) * 2)
+            self.assertEqual(cache.sweep_disk(), 1)
+            cache.max_disk_bytes = 2 * os.path.getsize(cache._path("c"))
+            self.assertEqual(cache.sweep_disk(), 1)
+            self.assertEqual(sorted(os.listdir(tmp)), ["b.pkl", "c.pkl"])
+
+    def test_unloadable_disk_entry_is_a_miss(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ProjectionCache(disk_dir=tmp)
+            # A pickle referring to a module that no longer exists (protocol 0 GLOBAL opcode)
+            with open(cache._path("k"), "wb") as f:
+                f.write(b"cgone_module\nthing\n.")
+            self.assertEqual(cache.get("k"), (False, None))
+            self.assertFalse(os.path.exists(cache._path("k")))
+
+    def test_decorated_projection_is_shared(self):
+        projection_cache.clear()
+        before = projection_cache.stats()
+        first = calculate_super_projection(*SUPER_ARGS)
+        second = calculate_super_projection(*SUPER_ARGS, unused_cap=0)  # Same canonical inputs
+        self.assertIs(first, second)
+        after = projection_cache.stats()
+        self.assertEqual(after["hits"] - before["hits"], 1)
+        self.assertGreater(after["hit_rate"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+import plotly.io as pio
+from utils.charts import BRAND_INDIGO, get_figure_cache_stats
+from calculators.tier1 import create_gauge_chart
+from calculators.tier2 import create_wealth_chart
+
+class TestFigureCache(unittest.TestCase):
+
+    def test_unchanged_inputs_reuse_figure(self):
+        years = list(range(1, 11))
+        dr = np.linspace(50000, 800000, 10)
+        before = get_figure_cache_stats()
+        first = create_wealth_chart(years, dr, dr * 0.8)
+        # A recomputed but equal result hashes to the same key
+        second = create_wealth_chart(years, dr.copy(), dr * 0.8)
+        after = get_figure_cache_stats()
+        self.assertIs(first, second)
+        self.assertEqual(after["hits"] - before["hits"], 1)
+        self.assertIsNot(create_wealth_chart(years, dr, dr * 0.7), first)
+
+    def test_cached_matches_fresh_build(self):
+        self.assertEqual(create_gauge_chart(55).to_dict(), create_gauge_chart.uncached(55).to_dict())
+
+    def test_brand_template(self):
+        fig = create_gauge_chart(80)
+        self.assertIn("wealth", pio.templates)
+        self.assertEqual(fig.layout.template.layout.colorway[0], BRAND_INDIGO)
+
+if __name__ == '__main__':
+    unittest.main()
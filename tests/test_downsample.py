@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from utils.downsample import lttb_indices, percentile_bands, downsample_figure
+from utils.charts import brand_figure
+import plotly.graph_objects as go
+
+class TestDownsample(unittest.TestCase):
+
+    def test_lttb_keeps_ends_and_extremes(self):
+        x = np.arange(10000, dtype=float)
+        y = np.sin(x / 500)
+        y[4321] = 50  # A spike must survive
+        idx = lttb_indices(x, y, 300)
+        self.assertEqual(len(idx), 300)
+        self.assertEqual((idx[0], idx[-1]), (0, 9999))
+        self.assertIn(4321, idx)
+        self.assertTrue(np.all(np.diff(idx) > 0))
+        np.testing.assert_array_equal(lttb_indices(x[:50], y[:50], 300), np.arange(50))
+
+    def test_percentile_bands_budget(self):
+        paths = np.cumsum(np.random.default_rng(3).standard_normal((500, 2400)), axis=1)
+        steps, bands = percentile_bands(paths, (10, 50, 90), budget=400)
+        self.assertEqual(bands.shape, (3, len(steps)))
+        self.assertLessEqual(len(steps), 400)
+        np.testing.assert_array_equal(bands[1], np.percentile(paths[:, steps], 50, axis=0))
+
+    def test_figure_traces_capped_and_aligned(self):
+        x = np.arange(20000) / 12
+        fig = brand_figure()
+        fig.add_trace(go.Scatter(x=x, y=np.sqrt(x)))
+        fig.add_trace(go.Scatter(x=x, y=np.sqrt(x) * 0.5, fill='tonexty'))
+        fig.add_trace(go.Scatter(x=[1, 2, 3], y=[1, 2, 3]))
+        downsample_figure(fig, budget=500)
+        self.assertLessEqual(len(fig.data[0].x), 500)
+        np.testing.assert_array_equal(fig.data[0].x, fig.data[1].x)
+        self.assertEqual(len(fig.data[2].x), 3)
+
+if __name__ == '__main__':
+    unittest.main()
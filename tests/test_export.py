@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+import csv
+import zipfile
+import unittest
+import xml.etree.ElementTree as ET
+import numpy as np
+from calculators.engines import run_strategy, run_fire
+from utils.export import export_rows, export_bytes, stream_export
+
+SHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+class TestExport(unittest.TestCase):
+
+    def test_rows_come_from_projection_arrays(self):
+        result = run_strategy({"income": 180000})
+        rows = list(export_rows([result]))
+        header = rows[0]
+        self.assertEqual(header[:3], ["scenario", "projection", "year"])
+        self.assertEqual(len(rows), 1 + 2 * 10)
+        ip_rows = [r for r in rows[1:] if r[1] == "ip_results"]
+        col = header.index("net_wealth")
+        np.testing.assert_array_equal([r[col] for r in ip_rows], result['ip_results']['net_wealth'])
+
+    def test_csv_round_trip_and_error_rows(self):
+        results = [ValueError("fire_age must be greater than current_age."), run_fire({"current_age": 40})]
+        rows = list(csv.reader(io.StringIO(export_bytes(results, "csv").decode("utf-8"))))
+        self.assertEqual(rows[0][:4], ["scenario", "projection", "year", "ages"])
+        self.assertEqual(rows[1], ["1", "error", "fire_age must be greater than current_age."])
+        self.assertEqual(float(rows[2][rows[0].index("balances")]), results[1]['balances'][0])
+
+    def test_xlsx_is_a_valid_workbook(self):
+        results = [run_fire({"current_age": 30 + i % 15}) for i in range(40)]
+        data = export_bytes(iter(results), "xlsx")
+        archive = zipfile.ZipFile(io.BytesIO(data))
+        self.assertIsNone(archive.testzip())
+        sheet = ET.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+        rows = sheet.find(f"{SHEET_NS}sheetData")
+        self.assertEqual(len(rows), 1 + sum(r.periods for r in results))
+
+    def test_stream_is_chunked(self):
+        chunks = list(stream_export((run_fire({"current_age": 30}) for _ in range(100)), "csv"))
+        self.assertGreater(len(chunks), 1)
+        with self.assertRaises(ValueError):
+            stream_export([], "pdf")
+
+if __name__ == '__main__':
+    unittest.main()
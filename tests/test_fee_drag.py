@@ -0,0 +1,42 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from calculators.fee_drag import calculate_fee_drag_table, get_fee_drag_table, FEE_COMPONENTS
+from calculators.tier3_super import calculate_super_projection
+from utils.funds import fund_registry
+
+class TestFeeDrag(unittest.TestCase):
+
+    def test_matches_single_fund_engine(self):
+        table = calculate_fee_drag_table.uncached(30000, 120000, 0.115, 0, 0.03, 30)
+        index = fund_registry.current()
+        self.assertEqual(len(table['funds']), 2 * len(index))
+        for row, (name, option) in enumerate(zip(table['funds'], table['options'])):
+            fees = index.fees(name)
+            key = 'high_growth' if option == 'High Growth' else 'balanced'
+            expected = calculate_super_projection.uncached(
+                30000, 120000, 0.115, 0, fees[f'return_{key}_10y'], fees[f'investment_fee_{key}'],
+                fees['admin_fee_flat'], fees['admin_fee_percent'], fees['admin_fee_cap'],
+                fees['transaction_cost'], 0.03, 30
+            )
+            self.assertEqual(table['final_balance'][row], expected['balance'][-1])
+
+    def test_component_signs(self):
+        table = calculate_fee_drag_table.uncached(100000, 150000, 0.115, 5000, 0.03, 25)
+        for component in ('admin_fee_flat', 'investment_fee', 'transaction_cost'):
+            self.assertTrue(np.all(table[component] >= 0))
+        # Removing the cap can only cost money
+        self.assertTrue(np.all(table['admin_fee_cap'] <= 0))
+        self.assertTrue(np.all(table['total'] > 0))
+        self.assertEqual(len(table.series_names), len(FEE_COMPONENTS) + 2)
+
+    def test_bands_share_cached_table(self):
+        first = get_fee_drag_table(31000, 121000, 0.115, 0, 0.03, 30)
+        second = get_fee_drag_table(29000, 118000, 0.115, 0, 0.03, 30)
+        self.assertIs(first, second)
+
+if __name__ == '__main__':
+    unittest.main()
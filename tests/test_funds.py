@@ -0,0 +1,63 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import tempfile
+import unittest
+from utils.funds import FundIndex, FundRegistry, FUND_DATA_PATH, FUND_FIELDS
+
+def write_json(path, data, mtime):
+    with open(path, 'w') as f:
+        json.dump(data, f)
+    os.utime(path, (mtime, mtime))
+
+class TestFundRegistry(unittest.TestCase):
+
+    def setUp(self):
+        with open(FUND_DATA_PATH) as f:
+            self.data = json.load(f)
+
+    def test_compiled_columns_match_json(self):
+        index = FundIndex(self.data)
+        self.assertEqual(len(index), len(self.data))
+        for name, record in self.data.items():
+            row = index.row_of[name]
+            for field in FUND_FIELDS:
+                self.assertEqual(index.columns[field][row], record[field])
+            self.assertEqual(index[name], record)
+        self.assertFalse(index.columns['admin_fee_cap'].flags.writeable)
+
+    def test_schema_validation(self):
+        bad = json.loads(json.dumps(self.data))
+        del bad['HESTA']['transaction_cost']
+        bad['Hostplus']['admin_fee_flat'] = "78"
+        with self.assertRaises(ValueError) as ctx:
+            FundIndex(bad)
+        self.assertIn("HESTA.transaction_cost", str(ctx.exception))
+        self.assertIn("Hostplus.admin_fee_flat", str(ctx.exception))
+
+    def test_hot_reload_on_mtime_change(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'fund_fees.json')
+            write_json(path, self.data, 1_700_000_000)
+            registry = FundRegistry(path)
+            first = registry.current()
+            self.assertIs(registry.current(), first)  # Unchanged file -> same index
+
+            updated = json.loads(json.dumps(self.data))
+            updated['HESTA']['admin_fee_flat'] = 99
+            write_json(path, updated, 1_700_000_100)
+            second = registry.current()
+            self.assertIsNot(second, first)
+            self.assertEqual(second.fees('HESTA')['admin_fee_flat'], 99)
+
+            # A broken edit keeps the last good index
+            with open(path, 'w') as f:
+                f.write("{not json")
+            os.utime(path, (1_700_000_200, 1_700_000_200))
+            with self.assertLogs('utils.funds', level='ERROR'):
+                self.assertIs(registry.current(), second)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from calculators.household import household_tax_by_split, calculate_household_results
+from calculators.tier2 import calculate_tier2_results
+from utils.tax import calculate_income_tax, calculate_income_tax_array
+
+class TestHouseholdTax(unittest.TestCase):
+
+    def test_income_tax_array_matches_scalar(self):
+        incomes = np.concatenate([np.linspace(-50000, 400000, 4501), [18200, 45000, 135000, 190000]])
+        np.testing.assert_array_equal(calculate_income_tax_array(incomes),
+                                      [calculate_income_tax(x) for x in incomes])
+
+    def test_split_matches_per_partner_scalar_tax(self):
+        taxable = np.array([-20000.0, 5000.0, 30000.0])
+        franking = np.array([0.0, 1000.0, 2000.0])
+        shares = np.array([1.0, 0.3, 0.0])
+        saved = household_tax_by_split(taxable, franking, 150000, 40000, shares)
+        self.assertEqual(saved.shape, (3, 3))
+        base = calculate_income_tax(150000) + calculate_income_tax(40000)
+        for s, share in enumerate(shares):
+            for y in range(3):
+                new = (calculate_income_tax(150000 + share * taxable[y]) +
+                       calculate_income_tax(40000 + (1 - share) * taxable[y]) - franking[y])
+                self.assertAlmostEqual(saved[s, y], base - new, places=6)
+
+    def test_optimised_split_is_best(self):
+        results = calculate_tier2_results(650000, 0.085, 0.025, 650000, 0.058, 0.02, "NSW", 0.061, 0.37,
+                                          "Interest Only", 30, 0.01, 0.07, 2500)
+        household = calculate_household_results({"Shares": results['dr_results'], "Property": results['ip_results']},
+                                                 180000, 40000)
+        for strategy in household.values():
+            splits = strategy['splits']
+            best = splits['Optimised']['tax_saved'][-1]
+            for name in ("100% You", "50/50", "100% Partner"):
+                self.assertGreaterEqual(best, splits[name]['tax_saved'][-1])
+            self.assertEqual(best, strategy['best_tax_saved'])
+        # Negatively geared property losses are worth most against the higher earner
+        self.assertEqual(household['Property']['best_share'], 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
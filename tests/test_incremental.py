@@ -0,0 +1,53 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from calculators.tier3_super import calculate_super_projection, calculate_tier3_results
+
+project = calculate_super_projection.uncached
+
+# balance, salary, employer_rate, voluntary, return, investment fee, admin flat/%/cap, transaction cost
+BASE = (30000, 120000, 0.115, 0, 0.0884, 0.0052, 52, 0.001, 350, 0.0008)
+
+class TestIncrementalProjection(unittest.TestCase):
+
+    def assertSameProjection(self, a, b):
+        np.testing.assert_array_equal(a['balance'], b['balance'])
+        np.testing.assert_array_equal(a['salary'], b['salary'])
+
+    def test_longer_horizon_resumes_at_old_end(self):
+        previous = project(*BASE, 0.03, 30)
+        resumed = project(*BASE, 0.03, 35, resume_from=previous)
+        self.assertEqual(resumed['resumed_from_year'], 30)
+        self.assertSameProjection(resumed, project(*BASE, 0.03, 35))
+
+    def test_later_year_contribution_change(self):
+        previous = project(*BASE, 0.03, 40)
+        schedule = [0] * 25 + [10000] * 15
+        args = BASE[:3] + (schedule,) + BASE[4:]
+        resumed = project(*args, 0.03, 40, resume_from=previous)
+        self.assertEqual(resumed['resumed_from_year'], 25)
+        self.assertSameProjection(resumed, project(*args, 0.03, 40))
+
+    def test_path_input_change_is_full_rerun(self):
+        previous = project(*BASE, 0.03, 40)
+        changed = project(*BASE[:4], 0.09, *BASE[5:], 0.03, 40, resume_from=previous)
+        self.assertEqual(changed['resumed_from_year'], 0)
+        growth = project(*BASE, 0.035, 40, resume_from=previous)
+        self.assertEqual(growth['resumed_from_year'], 1)
+        self.assertSameProjection(growth, project(*BASE, 0.035, 40))
+
+    def test_tier3_results_resume(self):
+        inputs = dict(selected_fund="AustralianSuper", current_age=30, retirement_age=60, current_balance=45000,
+                      annual_salary=95000, employer_contrib=0.115, voluntary_contrib=0, high_growth_return=0.0884,
+                      balanced_return=0.0794, salary_growth=0.03, unused_cap=0)
+        first = calculate_tier3_results(**inputs)
+        second = calculate_tier3_results(**dict(inputs, retirement_age=67), previous=first)
+        fresh = calculate_super_projection.uncached(45000, 95000, 0.115, 0, 0.0794, 0.0049, 52, 0.001, 350,
+                                                    0.0008, 0.03, 37, 0, 0.32)
+        np.testing.assert_array_equal(second['bal_projection']['balance'], fresh['balance'])
+
+if __name__ == '__main__':
+    unittest.main()
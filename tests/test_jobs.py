@@ -0,0 +1,127 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import time
+import tempfile
+import unittest
+import numpy as np
+from utils.jobs import JobQueue, InMemoryBroker, SQLiteBroker, QUEUED, RUNNING, DONE, FAILED
+from calculators.monte_carlo import simulate_fire_paths, SAMPLERS, FAN_PERCENTILES
+from utils.sketch import SKETCH_RELATIVE_ACCURACY
+from calculators.fire import calculate_fire_projection, calculate_required_capital
+
+FIRE_PARAMS = {'current_age': 40, 'fire_age': 50, 'annual_spend': 60000, 'current_investable': 300000,
+               'monthly_savings': 3000, 'return_rate': 0.07, 'inflation_rate': 0.03}
+
+def wait_for(queue, job_id, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = queue.status(job_id)
+        if status['state'] in (DONE, FAILED):
+            return status
+        time.sleep(0.05)
+    raise AssertionError("Job did not finish in time")
+
+class TestMonteCarlo(unittest.TestCase):
+
+    def test_zero_volatility_matches_deterministic(self):
+        mc = simulate_fire_paths(**FIRE_PARAMS, volatility=0.0, n_paths=50)
+        det = calculate_fire_projection.uncached(**FIRE_PARAMS)
+        np.testing.assert_allclose(mc['p50'], det['balances'])
+        self.assertEqual(mc['success_probability'], 1.0 if det['success'] else 0.0)
+
+    def test_seeded_and_chunk_independent(self):
+        a = simulate_fire_paths(**FIRE_PARAMS, n_paths=3000, chunk_size=3000)
+        b = simulate_fire_paths(**FIRE_PARAMS, n_paths=3000, chunk_size=700)
+        np.testing.assert_array_equal(a['p10'], b['p10'])
+        self.assertEqual(a['success_probability'], b['success_probability'])
+
+    def test_samplers_agree_with_plain_monte_carlo(self):
+        plain = simulate_fire_paths(**FIRE_PARAMS, n_paths=40000, sampler="pseudo", antithetic=False,
+                                    control_variate=False)
+        for sampler in SAMPLERS:
+            reduced = simulate_fire_paths(**FIRE_PARAMS, n_paths=2000, sampler=sampler)
+            tolerance = 4 * np.hypot(plain['success_probability_se'], reduced['success_probability_se'])
+            self.assertAlmostEqual(reduced['success_probability'], plain['success_probability'], delta=tolerance)
+
+    def test_variance_reduction_needs_fewer_paths(self):
+        # Spread across seeds: 1,000 variance-reduced paths vs 5,000 plain paths
+        reduced = [simulate_fire_paths(**FIRE_PARAMS, n_paths=1000, seed=s)['success_probability'] for s in range(15)]
+        plain = [simulate_fire_paths(**FIRE_PARAMS, n_paths=5000, seed=s, sampler="pseudo", antithetic=False,
+                                     control_variate=False)['success_probability'] for s in range(15)]
+        self.assertLess(np.std(reduced), 1.25 * np.std(plain))
+
+    def test_standard_error_reported(self):
+        result = simulate_fire_paths(**FIRE_PARAMS, n_paths=2000)
+        self.assertGreater(result['success_probability_se'], 0)
+        self.assertLess(result['success_probability_se'], 0.02)
+        with self.assertRaises(ValueError):
+            simulate_fire_paths(**FIRE_PARAMS, n_paths=100, sampler="halton")
+
+    def test_streaming_matches_in_memory(self):
+        for sampler in SAMPLERS:
+            exact = simulate_fire_paths(**FIRE_PARAMS, n_paths=6000, chunk_size=1000, sampler=sampler, streaming=False)
+            streamed = simulate_fire_paths(**FIRE_PARAMS, n_paths=6000, chunk_size=999, sampler=sampler, streaming=True)
+            self.assertAlmostEqual(streamed['success_probability'], exact['success_probability'], places=12)
+            self.assertAlmostEqual(streamed['success_probability_se'], exact['success_probability_se'], places=12)
+            self.assertEqual(streamed['median_depletion_age'], exact['median_depletion_age'])
+            for p in FAN_PERCENTILES:
+                np.testing.assert_allclose(streamed[f'p{p}'], exact[f'p{p}'], rtol=2 * SKETCH_RELATIVE_ACCURACY)
+
+    def test_required_capital_is_growing_annuity(self):
+        pv = calculate_required_capital(60000, 0.03, 0.0595, 10, 10)
+        start = 60000 * 1.03 ** 10
+        expected = sum(start * 1.03 ** t / 1.0595 ** t for t in range(10))
+        self.assertAlmostEqual(pv, expected, places=6)
+        self.assertAlmostEqual(calculate_required_capital(1000, 0.05, 0.05, 0, 4), 4000)
+        self.assertEqual(calculate_required_capital(60000, 0.03, 0.06, 10, 0), 0)
+
+class TestJobQueue(unittest.TestCase):
+
+    def _check_queue(self, broker):
+        queue = JobQueue(broker, workers=1)
+        self.addCleanup(queue.shutdown)
+
+        job_id = queue.submit("fire_monte_carlo", dict(FIRE_PARAMS, n_paths=2000, chunk_size=500))
+        self.assertEqual(wait_for(queue, job_id)['state'], DONE)
+        result = queue.result(job_id)
+        self.assertEqual(result['n_paths'], 2000)
+        self.assertEqual(queue.status(job_id)['progress'], 1.0)
+
+        bad = queue.submit("fire_monte_carlo", {'not_a_param': 1})
+        status = wait_for(queue, bad)
+        self.assertEqual(status['state'], FAILED)
+        self.assertIn("TypeError", status['error'])
+        self.assertIsNone(queue.result(bad))
+
+        with self.assertRaises(ValueError):
+            queue.submit("unknown_kind", {})
+
+    def test_prestart_spawns_every_worker(self):
+        queue = JobQueue(InMemoryBroker(), workers=2)
+        self.addCleanup(queue.shutdown)
+        self.assertEqual(len(queue.prestart()), 2)
+        job_id = queue.submit("fire_monte_carlo", dict(FIRE_PARAMS, n_paths=200))
+        self.assertEqual(wait_for(queue, job_id)['state'], DONE)
+
+    def _check_conditional_update(self, broker):
+        broker.create("job", "fire_monte_carlo")
+        self.assertTrue(broker.update_if("job", (QUEUED, RUNNING), state=RUNNING, progress=0.5))
+        broker.update("job", state=DONE, progress=1.0)
+        # A progress message arriving after the job finished leaves it done
+        self.assertFalse(broker.update_if("job", (QUEUED, RUNNING), state=RUNNING, progress=0.9))
+        self.assertEqual((broker.get("job")["state"], broker.get("job")["progress"]), (DONE, 1.0))
+        self.assertFalse(broker.update_if("missing", (QUEUED, RUNNING), state=RUNNING))
+
+    def test_in_memory_broker(self):
+        self._check_conditional_update(InMemoryBroker())
+        self._check_queue(InMemoryBroker())
+
+    def test_sqlite_broker(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self._check_conditional_update(SQLiteBroker(os.path.join(tmp, "cas.db")))
+            self._check_queue(SQLiteBroker(os.path.join(tmp, "jobs.db")))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from calculators.portfolio import calculate_portfolio_projection, schedule_purchases
+from calculators.tier2 import calculate_tier2_results, PROJECTION_SERIES
+from utils.tax import calculate_land_tax, calculate_land_tax_array
+
+portfolio = calculate_portfolio_projection.uncached
+
+class TestPortfolioEngine(unittest.TestCase):
+
+    def test_single_property_matches_tier2(self):
+        for loan_type in ("Interest Only", "Principal & Interest"):
+            tier2 = calculate_tier2_results(650000, 0.085, 0.025, 1400000, 0.058, 0.02, "NSW", 0.061, 0.37,
+                                            loan_type, 30, 0.01, 0.07, 2500)
+            result = portfolio([{"price": 1400000, "state": "NSW"}], 0.061, 0.37, loan_type, 30, 10)
+            for name in PROJECTION_SERIES:
+                np.testing.assert_array_equal(result[name], tier2['ip_results'][name])
+
+    def test_land_tax_aggregated_per_state(self):
+        # Each property's land is under the NSW threshold, the combined holding is not
+        props = [{"price": 1000000, "state": "NSW"}, {"price": 1000000, "state": "NSW"}, {"price": 500000, "state": "QLD"}]
+        result = portfolio(props, 0.06, 0.37, years=5)
+        nsw_land = result['property_values'][:2, 0].sum() * 0.6
+        self.assertEqual(calculate_land_tax("NSW", result['property_values'][0, 0] * 0.6), 0)
+        self.assertAlmostEqual(result['land_tax_by_state']['NSW'][0], calculate_land_tax("NSW", nsw_land))
+        self.assertEqual(result['land_tax_by_state']['QLD'][0], 0)
+
+    def test_land_tax_array_matches_scalar(self):
+        values = np.linspace(0, 3000000, 301)
+        for state in ("NSW", "VIC", "QLD", "WA", "SA", "TAS"):
+            np.testing.assert_array_equal(calculate_land_tax_array(state, values),
+                                          [calculate_land_tax(state, v) for v in values])
+
+    def test_staggered_purchase_and_equity_release(self):
+        props = [{"price": 700000, "state": "QLD"}, {"price": 700000, "state": "QLD", "purchase_year": 3}]
+        released = portfolio(props, 0.06, 0.37, years=10, collateral_value=1500000, collateral_debt=400000)
+        standalone = portfolio(props, 0.06, 0.37, years=10, cross_collateralise=False)
+
+        self.assertTrue(np.all(released['property_values'][1, :3] == 0))
+        self.assertGreater(released['property_values'][1, 3], 0)
+        # Home equity covers the costs above 80% LVR, so no LMI is charged
+        self.assertGreater(released['purchases'][1]['equity_released'], 0)
+        self.assertEqual(released['purchases'][1]['lmi'], 0)
+        self.assertGreater(standalone['purchases'][1]['lmi'], 0)
+        self.assertGreater(released['net_wealth'][-1], standalone['net_wealth'][-1])
+
+    def test_scheduler_timeline(self):
+        plan = schedule_purchases.uncached(550000, "QLD", 0.075, 0.04, 300000, 0.061, 0.45, home_value=1200000,
+                                           home_loan=300000, max_properties=4, years=20)
+        years = [p['year'] for p in plan['timeline']]
+        self.assertEqual(len(years), 4)
+        self.assertEqual(years, sorted(set(years)))
+        for purchase in plan['timeline']:
+            self.assertGreaterEqual(purchase['serviceability_surplus'], 0)
+            self.assertLessEqual(purchase['lvr'], 0.80 + 1e-9)
+        # The scheduled portfolio never needs LMI
+        self.assertTrue(all(p['lmi'] == 0 for p in plan['projection']['purchases']))
+
+        # Without equity or enough income nothing is affordable
+        none = schedule_purchases.uncached(550000, "QLD", 0.075, 0.04, 60000, 0.061, 0.32, years=20)
+        self.assertEqual(none['timeline'], [])
+        self.assertIsNone(none['projection'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import time
+import unittest
+import numpy as np
+from calculators.property_mc import simulate_property_paths, PROPERTY_CORRELATION, PAGE_PATHS, PAGE_YEARS
+from calculators.tier2 import calculate_ip_projection
+
+IP_PARAMS = {'price': 650000, 'loan': 690000, 'growth': 0.058, 'yield_rate': 0.02, 'interest_rate': 0.061,
+             'tax_rate': 0.37, 'maint': 0.01, 'mgmt': 0.07, 'rates': 2500, 'state': 'NSW'}
+
+class TestPropertyMonteCarlo(unittest.TestCase):
+
+    def test_zero_volatility_matches_deterministic(self):
+        for loan_type in ("Interest Only", "Principal & Interest"):
+            det = calculate_ip_projection.uncached(**IP_PARAMS, loan_type=loan_type, loan_term=25, years=10)
+            mc = simulate_property_paths(**IP_PARAMS, loan_type=loan_type, loan_term=25, years=10, n_paths=10,
+                                         growth_volatility=0, rent_volatility=0, rate_volatility=0, vacancy_rate=0)
+            np.testing.assert_allclose(mc['equity_p50'], det['net_wealth'])
+            np.testing.assert_allclose(mc['cash_flow_p50'], det['taxable_income'] * (1 - IP_PARAMS['tax_rate']))
+
+    def test_seeded_and_worker_independent(self):
+        a = simulate_property_paths(**IP_PARAMS, n_paths=9000, workers=1)
+        b = simulate_property_paths(**IP_PARAMS, n_paths=9000, workers=2)
+        np.testing.assert_array_equal(a['equity_p10'], b['equity_p10'])
+        self.assertEqual(a['negative_years_mean'], b['negative_years_mean'])
+        c = simulate_property_paths(**IP_PARAMS, n_paths=9000, seed=1)
+        self.assertFalse(np.array_equal(a['equity_p10'], c['equity_p10']))
+
+    def test_vacancy_drives_negative_cash_flow_years(self):
+        # Positively geared on average, so vacancies decide how often it runs at a loss
+        params = dict(IP_PARAMS, yield_rate=0.06, loan=400000)
+        low = simulate_property_paths(**params, vacancy_rate=0.0, n_paths=4000)
+        high = simulate_property_paths(**params, vacancy_rate=0.25, n_paths=4000)
+        self.assertLess(low['negative_years_mean'], high['negative_years_mean'])
+        self.assertGreater(high['equity_p90'][-1], high['equity_p10'][-1])
+
+    def test_rejects_invalid_correlation(self):
+        bad = np.array(PROPERTY_CORRELATION)
+        bad[0, 1] = bad[1, 0] = 1.5
+        for correlation in (bad, np.eye(3)):
+            with self.assertRaises(ValueError):
+                simulate_property_paths(**IP_PARAMS, correlation=correlation, n_paths=10)
+
+    def test_page_size_runs_interactively(self):
+        started = time.perf_counter()
+        result = simulate_property_paths(**IP_PARAMS, n_paths=PAGE_PATHS, years=PAGE_YEARS)
+        self.assertLess(time.perf_counter() - started, 5)
+        self.assertEqual(result.periods, PAGE_YEARS)
+        self.assertTrue(np.all(np.diff([result[f'equity_p{p}'] for p in (10, 25, 50, 75, 90)], axis=0) >= 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from calculators.tier1 import (calculate_readiness_scores, calculate_readiness_scores_array, generate_reference_population,
+                               get_reference_scores, get_score_percentile)
+
+class TestReadinessArray(unittest.TestCase):
+
+    def test_array_matches_scalar(self):
+        population = generate_reference_population(n=3000, seed=7)
+        # Add band edges, negatives and unknown labels
+        equity = np.concatenate([population['equity'], [50000, 100000, 200000, 500000, 49999, -20000]])
+        income = np.concatenate([population['income'], [80000, 100000, 120000, 150000, 200000, 79999]])
+        age = np.concatenate([population['age'], [34, 35, 44, 45, 55, 18]])
+        dependants = np.concatenate([population['dependants'], [0, 1, 2, 3, 0, 4]])
+        experience = np.concatenate([population['experience'], ["Other"] * 6])
+        risk = np.concatenate([population['risk_tolerance'], ["Unknown"] * 6])
+
+        scores = calculate_readiness_scores_array(equity, income, experience, risk, age, dependants)
+        for i in range(len(equity)):
+            expected = calculate_readiness_scores(equity[i], income[i], experience[i], risk[i], age[i], dependants[i])
+            self.assertEqual({k: int(v[i]) for k, v in scores.items()}, expected)
+
+    def test_percentile_lookup(self):
+        reference = get_reference_scores()
+        self.assertTrue(np.all(np.diff(reference) >= 0))
+        self.assertEqual(get_score_percentile(-1), 0.0)
+        self.assertEqual(get_score_percentile(1000), 100.0)
+        low, mid, high = (get_score_percentile(s) for s in (30, 55, 80))
+        self.assertLess(low, mid)
+        self.assertLess(mid, high)
+        # Matches a brute-force mid-rank over the population
+        self.assertAlmostEqual(mid, ((reference < 55).mean() + (reference <= 55).mean()) / 2 * 100)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from calculators.engines import run_strategy, run_super
+from utils.pdf_gen import build_consolidated_report, get_report_cache_stats, _fire_section
+
+TIER1 = {'scores': {'equity': 20, 'income': 15, 'experience': 10, 'risk': 10, 'age_bonus': 5, 'total': 60},
+         'risk_tolerance': 'Balanced', 'age': 35}
+FIRE = {'projected_wealth': 900000, 'required_capital': 2000000, 'gap': 1100000, 'success': False,
+        'depletion_age': 71, 'fire_age': 50}
+LEGACY = {'current_tax': 15000, 'future_tax': 120000, 'taxable_portion': 800000, 'projected_balance': 1200000}
+
+class TestConsolidatedReport(unittest.TestCase):
+
+    def test_only_changed_section_is_rebuilt(self):
+        sections = {"tier1": TIER1, "tier2": run_strategy({"income": 150000}), "tier3": run_super({"current_age": 41}),
+                    "fire": FIRE, "legacy": LEGACY}
+        before = get_report_cache_stats()
+        first = build_consolidated_report({"name": "Test User"}, sections)
+        self.assertTrue(first.getvalue().startswith(b"%PDF"))
+        built = get_report_cache_stats()
+        self.assertEqual(built["misses"] - before["misses"], 5)
+
+        sections["tier3"] = run_super({"current_age": 42})
+        build_consolidated_report({"name": "Test User"}, sections)
+        after = get_report_cache_stats()
+        self.assertEqual(after["misses"] - built["misses"], 1)
+        self.assertEqual(after["hits"] - built["hits"], 4)
+
+    def test_fire_outcome_reports_the_bridge(self):
+        held = dict(FIRE, success=True, depletion_age=None, access_age=60)
+        outcomes = [_fire_section(results, None, None)[0]._cellvalues[-1][1] for results in (held, FIRE)]
+        self.assertEqual(outcomes, ["Bridge holds to age 60", "Funds depleted at age 71"])
+
+    def test_missing_sections_are_skipped(self):
+        pdf = build_consolidated_report({}, {"tier1": None, "fire": {}})
+        self.assertTrue(pdf.getvalue().startswith(b"%PDF"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from utils.results import ProjectionResult
+from calculators.tier2 import calculate_dr_projection
+from calculators.tier3_super import calculate_super_projection
+
+class TestProjectionResult(unittest.TestCase):
+
+    def test_dict_style_access(self):
+        res = ProjectionResult({"balance": [1, 2, 3]}, {"tax_saved_catchup": 500})
+        self.assertEqual(res['balance'][-1], 3)
+        self.assertEqual(res['tax_saved_catchup'], 500)
+        self.assertTrue('balance' in res)
+        self.assertEqual(res.get('tax_saved', [0])[-1], 0)
+        self.assertEqual(res.periods, 3)
+        self.assertEqual(len(res), 2)  # Keys, as for the dict it replaces
+        self.assertEqual(res.to_dict(), {"balance": [1.0, 2.0, 3.0], "tax_saved_catchup": 500})
+
+    def test_series_are_read_only_views(self):
+        res = calculate_dr_projection(amount=100000, growth=0.07, yield_rate=0.04, interest_rate=0.06, tax_rate=0.39, years=10)
+        net_wealth = res['net_wealth']
+        self.assertEqual(net_wealth.dtype, np.float64)
+        # Views share the result's single contiguous block
+        self.assertTrue(np.shares_memory(net_wealth, res.block))
+        self.assertTrue(res.block.flags['C_CONTIGUOUS'])
+        with self.assertRaises(ValueError):
+            net_wealth[0] = 0
+
+    def test_super_projection_result(self):
+        res = calculate_super_projection(30000, 90000, 0.115, 0, 0.08, 0.005, 52, 0.001, 350, 0.0008, 0.03, 30, unused_cap=20000, marginal_rate=0.32)
+        self.assertEqual(len(res['balance']), 31)
+        self.assertEqual(res['balance'][0], 30000)
+        self.assertAlmostEqual(res['tax_saved_catchup'], 20000 * (0.32 - 0.15))
+
+if __name__ == '__main__':
+    unittest.main()
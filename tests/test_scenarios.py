@@ -0,0 +1,66 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from calculators.engines import run_strategy, run_super, run_fire
+from calculators.scenarios import (compute_workspace, diff_metrics, default_scenario, SCENARIO_METRICS,
+                                   BASELINE_NAME)
+from calculators.fire import calculate_required_capital
+from calculators.tier5_legacy import calculate_estate_tax
+
+class TestScenarioWorkspace(unittest.TestCase):
+
+    def setUp(self):
+        base = default_scenario({"age": 40, "income": 150000})
+        fire_only = default_scenario({"age": 40, "income": 150000})
+        fire_only["fire"]["annual_spend"] = 60000
+        richer = default_scenario({"age": 40, "income": 150000})
+        richer["strategy"]["income"] = 200000
+        richer["super"]["voluntary_contrib"] = 10000
+        richer["legacy"]["taxable_portion"] = 0.5
+        self.scenarios = {BASELINE_NAME: base, "Spend Less": fire_only, "Earn More": richer}
+
+    def test_metrics_match_engines(self):
+        workspace = compute_workspace(self.scenarios)
+        self.assertEqual(workspace["errors"], {})
+        inputs = self.scenarios["Earn More"]
+        metrics = workspace["metrics"]["Earn More"]
+        self.assertEqual([k for k, _ in SCENARIO_METRICS], list(metrics))
+
+        strategy = run_strategy(inputs["strategy"])
+        self.assertAlmostEqual(metrics["property_net_wealth"], strategy["ip_results"]["net_wealth"][-1])
+        self.assertAlmostEqual(metrics["shares_tax_saved"], strategy["dr_results"]["tax_saved"][-1])
+        super_final = run_super(inputs["super"])["hg_projection"]["balance"][-1]
+        self.assertAlmostEqual(metrics["super_at_retirement"], super_final)
+        self.assertAlmostEqual(metrics["estate_tax"], calculate_estate_tax(super_final, 0.5))
+        fire = run_fire(inputs["fire"])
+        required = calculate_required_capital(inputs["fire"]["annual_spend"], fire["inflation_rate"],
+                                              fire["effective_return"], fire["years_to_fire"], fire["years_in_bridge"])
+        self.assertAlmostEqual(metrics["fire_gap"], required - fire["fire_starting_balance"])
+
+    def test_unchanged_sections_are_reused(self):
+        stats = compute_workspace(self.scenarios)["stats"]
+        # Baseline runs 3 engines; 'Spend Less' only changes FIRE; 'Earn More' changes strategy and super
+        self.assertEqual(stats, {"computed": 6, "reused": 3})
+
+    def test_diffs_against_baseline(self):
+        workspace = compute_workspace(self.scenarios)
+        diffs = workspace["diffs"]
+        self.assertEqual(set(diffs), {"Spend Less", "Earn More"})
+        spend_less = diffs["Spend Less"]
+        self.assertLess(spend_less["fire_gap"]["change"], 0)
+        self.assertEqual(spend_less["super_at_retirement"]["change"], 0)
+        self.assertEqual(spend_less["estate_tax"]["pct_change"], 0)
+        self.assertGreater(diffs["Earn More"]["super_at_retirement"]["change"], 0)
+
+        self.assertIsNone(diff_metrics({"a": {"x": 0.0}, "b": {"x": 5.0}}, "a")["b"]["x"]["pct_change"])
+
+    def test_invalid_scenario_reported(self):
+        self.scenarios["Broken"] = {"fire": {"fire_age": 30}}
+        workspace = compute_workspace(self.scenarios)
+        self.assertIn("Broken", workspace["errors"])
+        self.assertNotIn("Broken", workspace["diffs"])
+
+if __name__ == '__main__':
+    unittest.main()
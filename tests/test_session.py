@@ -0,0 +1,102 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+import numpy as np
+from streamlit.testing.v1 import AppTest
+from utils import session
+from calculators.tier2 import calculate_tier2_results
+from calculators.fire import calculate_fire_projection
+
+APP_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app.py'))
+
+TIER2_INPUTS = {
+    "dr_amount": 650000, "dr_growth": 0.085, "dr_yield": 0.025,
+    "ip_price": 650000, "ip_growth": 0.058, "ip_yield": 0.02, "ip_state": "NSW",
+    "loan_rate": 0.061, "marginal_tax_rate": 0.39, "loan_type": "Interest Only", "loan_term": 30,
+    "maint_rate": 0.01, "mgmt_rate": 0.07, "rates": 2500
+}
+
+class TestSessionBudget(unittest.TestCase):
+
+    def setUp(self):
+        self.fake_st = SimpleNamespace(session_state={})
+        patcher = patch.object(session, 'st', self.fake_st)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_evicted_result_recomputes_on_access(self):
+        value = calculate_tier2_results(**TIER2_INPUTS)
+        session.store_result('tier2_results', value, recompute=calculate_tier2_results, inputs=TIER2_INPUTS)
+        session.store_result('user_profile', {"age": 35})
+        before = session.get_memory_metrics()
+
+        stats = session.enforce_budget(budget_bytes=0)
+
+        # Recomputable result evicted, profile kept
+        self.assertNotIn('tier2_results', self.fake_st.session_state)
+        self.assertIn('user_profile', self.fake_st.session_state)
+        self.assertGreater(stats['bytes_saved'], 0)
+
+        restored = session.get_result('tier2_results')
+        np.testing.assert_array_equal(restored['dr_results']['net_wealth'], value['dr_results']['net_wealth'])
+        after = session.get_memory_metrics()
+        self.assertEqual(after['evictions'] - before['evictions'], 1)
+        self.assertEqual(after['recomputes'] - before['recomputes'], 1)
+
+    def test_summaries_without_recipe_are_kept(self):
+        fire_inputs = {'current_age': 40, 'fire_age': 50, 'annual_spend': 60000, 'current_investable': 300000,
+                       'monthly_savings': 3000, 'return_rate': 0.07, 'inflation_rate': 0.03, 'access_age': 60}
+        session.store_result('fire_results', calculate_fire_projection(**fire_inputs),
+                             recompute=calculate_fire_projection, inputs=fire_inputs)
+        session.store_result('tier1_results', {"scores": {"total": 60}})
+        session.enforce_budget(budget_bytes=0)
+        self.assertEqual(session.get_result('tier1_results')['scores']['total'], 60)
+        self.assertEqual(session.get_result('fire_results')['years_to_fire'], 10)  # Rebuilt from its recipe
+
+        # The page's summary has no recipe, so it is never evicted; the projection still is
+        session.store_result('fire_summary', {"success": True, "fire_age": 50})
+        session.enforce_budget(budget_bytes=0)
+        self.assertEqual(session.get_result('fire_summary'), {"success": True, "fire_age": 50})
+        self.assertNotIn('fire_results', self.fake_st.session_state)
+
+    def test_under_budget_is_untouched(self):
+        session.store_result('legacy_results', {"future_tax": 1000.0})
+        stats = session.enforce_budget(budget_bytes=10 ** 9)
+        self.assertEqual(stats['evictions'], 0)
+        self.assertEqual(session.get_result('legacy_results')['future_tax'], 1000.0)
+
+    def test_compaction_converts_numeric_lists(self):
+        self.fake_st.session_state['fire_results'] = {"balances": [float(i) for i in range(100)]}
+        session.enforce_budget(budget_bytes=0)
+        balances = self.fake_st.session_state['fire_results']['balances']
+        self.assertIsInstance(balances, np.ndarray)
+        self.assertEqual(balances[-1], 99.0)
+
+
+class TestFirePageBudget(unittest.TestCase):
+
+    def test_fire_page_projection_is_evictable(self):
+        at = AppTest.from_file(APP_PATH, default_timeout=120)
+        at.run()
+        at.session_state["page_selection"] = "Tier 4: Freedom (FIRE)"
+        at.run()
+        next(button for button in at.button if button.label.startswith("🚀")).click()
+        at.run()
+        self.assertEqual(len(at.exception), 0)
+        state = {key: at.session_state[key] for key in ('fire_results', 'fire_summary', session._RECIPES_KEY)}
+        projection = state['fire_results']
+
+        with patch.object(session, 'st', SimpleNamespace(session_state=state)):
+            session.enforce_budget(budget_bytes=0)
+            self.assertNotIn('fire_results', state)
+            self.assertIn('fire_summary', state)  # The summary page's copy has no recipe and stays
+            rebuilt = session.get_result('fire_results')
+        np.testing.assert_array_equal(rebuilt['balances'], projection['balances'])
+
+
+if __name__ == '__main__':
+    unittest.main()
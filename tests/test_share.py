@@ -0,0 +1,100 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import base64
+import unittest
+from streamlit.testing.v1 import AppTest
+from calculators.engines import STRATEGY_DEFAULTS, SUPER_DEFAULTS, FIRE_DEFAULTS
+from calculators.scenarios import default_scenario, compute_workspace, BASELINE_NAME, LEGACY_DEFAULTS
+from utils.share import encode_scenario, decode_scenario, PROFILE_SCHEMA, SECTION_SCHEMA, SHARE_QUERY_PARAM
+from utils.cache import make_key
+
+APP_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app.py'))
+
+PROFILE = {"age": 40, "marital_status": "Married/De facto", "income": 150000, "user_income": 90000,
+           "partner_income": 60000, "dependants": 2, "home_value": 1200000, "mortgage": 650000,
+           "risk_tolerance": "Moderate Growth", "experience": "Advanced (Active Portfolio/SMSF)", "state": "QLD"}
+
+class TestShareLinks(unittest.TestCase):
+
+    def setUp(self):
+        base = default_scenario(PROFILE)
+        what_if = default_scenario(PROFILE)
+        what_if["fire"]["annual_spend"] = 65000.0
+        what_if["strategy"]["loan_rate"] = 0.0575
+        what_if["super"]["high_growth_return"] = 0.081
+        self.scenarios = {BASELINE_NAME: base, "Spend Less ✂️": what_if}
+
+    def test_round_trip(self):
+        token = encode_scenario(PROFILE, self.scenarios, BASELINE_NAME)
+        profile, scenarios, baseline = decode_scenario(token)
+        self.assertEqual(profile, PROFILE)
+        self.assertEqual(baseline, BASELINE_NAME)
+        self.assertEqual(scenarios, self.scenarios)
+        self.assertEqual(list(scenarios), list(self.scenarios))
+        # Restored inputs hit the same projection cache entries as the originals
+        for name, inputs in self.scenarios.items():
+            for section, values in inputs.items():
+                self.assertEqual(make_key(section, scenarios[name][section]), make_key(section, values))
+
+    def test_token_is_compact_and_url_safe(self):
+        token = encode_scenario(PROFILE, self.scenarios, BASELINE_NAME)
+        self.assertLess(len(token), 250)
+        self.assertTrue(set(token) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"))
+        # A what-if costs its name and changed fields, a fraction of a full input set
+        single = encode_scenario(PROFILE, {BASELINE_NAME: self.scenarios[BASELINE_NAME]}, BASELINE_NAME)
+        self.assertLess(len(token) - len(single), len(single) / 3)
+
+    def test_restored_workspace_computes(self):
+        _, scenarios, _ = decode_scenario(encode_scenario(PROFILE, self.scenarios, BASELINE_NAME))
+        self.assertEqual(compute_workspace(scenarios)["errors"], {})
+
+    def test_rejects_bad_tokens(self):
+        token = encode_scenario(PROFILE, self.scenarios, BASELINE_NAME)
+        data = bytearray(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        data[0] = 99
+        other_version = base64.urlsafe_b64encode(bytes(data)).rstrip(b"=").decode()
+        for bad in ("", "!!!", token[:len(token) // 2], token + "AAAA", other_version, "A" * 5000):
+            with self.assertRaises(ValueError):
+                decode_scenario(bad)
+        with self.assertRaises(ValueError):
+            encode_scenario(dict(PROFILE, state="Atlantis"), self.scenarios, BASELINE_NAME)
+
+    def test_rejects_out_of_range_values(self):
+        # Encodable, but beyond the page inputs (Tier 1 age) or the engines (a zero-year P&I loan)
+        bad_profile = encode_scenario(dict(PROFILE, age=120), self.scenarios, BASELINE_NAME)
+        zero_term = dict(self.scenarios[BASELINE_NAME])
+        zero_term["strategy"] = dict(zero_term["strategy"], loan_term=0, loan_type="Principal & Interest")
+        bad_what_if = encode_scenario(PROFILE, dict(self.scenarios, **{"Zero Term": zero_term}), BASELINE_NAME)
+        for bad in (bad_profile, bad_what_if):
+            with self.assertRaisesRegex(ValueError, "out-of-range"):
+                decode_scenario(bad)
+
+    def test_failing_scenario_is_reported_not_raised(self):
+        scenarios = dict(self.scenarios)
+        scenarios["Retire Yesterday"] = dict(scenarios[BASELINE_NAME], fire=dict(scenarios[BASELINE_NAME]["fire"], fire_age=30))
+        comparison = compute_workspace(scenarios)
+        self.assertEqual(list(comparison["errors"]), ["Retire Yesterday"])
+        self.assertIn(BASELINE_NAME, comparison["metrics"])
+
+    def test_unregistered_recipient_sees_the_comparison(self):
+        at = AppTest.from_file(APP_PATH, default_timeout=120)
+        at.query_params[SHARE_QUERY_PARAM] = encode_scenario(PROFILE, self.scenarios, BASELINE_NAME)
+        at.run()
+        self.assertEqual(len(at.exception), 0)
+        self.assertEqual(at.session_state["page_selection"], "Information Summary")
+        # The shared comparison renders above the lead gate, which still guards the rest of the summary
+        self.assertIn("Spend Less ✂️", at.dataframe[0].value.columns)
+        self.assertTrue(any("reserved for registered users" in info.value for info in at.info))
+
+    def test_schema_covers_every_input(self):
+        # A new engine input must be added to the share schema (appended, or a version bump)
+        sections = dict(SECTION_SCHEMA)
+        for section, defaults in (("strategy", STRATEGY_DEFAULTS), ("super", SUPER_DEFAULTS),
+                                  ("fire", FIRE_DEFAULTS), ("legacy", LEGACY_DEFAULTS)):
+            self.assertEqual({field for field, _ in sections[section]}, set(defaults))
+        self.assertLessEqual(set(PROFILE), {field for field, _ in PROFILE_SCHEMA})
+
+if __name__ == '__main__':
+    unittest.main()
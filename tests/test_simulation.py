@@ -0,0 +1,58 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import multiprocessing
+from unittest import mock
+import numpy as np
+from utils.simulation import plan_blocks, block_seeds, iter_blocks, pool_context, BLOCK_PATHS
+from calculators.monte_carlo import simulate_fire_paths, FAN_PERCENTILES
+
+FIRE_PARAMS = {'current_age': 40, 'fire_age': 50, 'annual_spend': 60000, 'current_investable': 300000,
+               'monthly_savings': 3000, 'return_rate': 0.07, 'inflation_rate': 0.03}
+
+def draw_block(size, seed_sequence, years):
+    return np.random.default_rng(seed_sequence).standard_normal((size, years))
+
+class TestSimulationRunner(unittest.TestCase):
+
+    def test_plan_blocks(self):
+        self.assertEqual(plan_blocks(10000), [3333, 3333, 3334])
+        self.assertEqual(sum(plan_blocks(3 * BLOCK_PATHS + 1)), 3 * BLOCK_PATHS + 1)
+        self.assertTrue(max(plan_blocks(100000)) <= BLOCK_PATHS)
+        self.assertEqual(len(plan_blocks(1000, min_blocks=8)), 8)
+        self.assertEqual(plan_blocks(3, min_blocks=8), [1, 1, 1])
+        self.assertEqual(plan_blocks(0), [])
+
+    def test_block_streams_are_reproducible_and_distinct(self):
+        a, b = block_seeds(42, 3), block_seeds(42, 3)
+        first = np.random.default_rng(a[0]).random(5)
+        np.testing.assert_array_equal(first, np.random.default_rng(b[0]).random(5))
+        self.assertFalse(np.array_equal(first, np.random.default_rng(a[1]).random(5)))
+
+    def test_pool_yields_blocks_in_order(self):
+        progress = []
+        serial = list(iter_blocks(draw_block, 9000, 7, workers=1, years=3))
+        pooled = list(iter_blocks(draw_block, 9000, 7, workers=2, progress=progress.append, years=3))
+        self.assertEqual(len(serial), len(pooled))
+        for s, p in zip(serial, pooled):
+            np.testing.assert_array_equal(s, p)
+        self.assertEqual(progress[-1], 1.0)
+
+    def test_pool_context_falls_back_to_spawn(self):
+        self.assertIn(pool_context().get_start_method(), ("forkserver", "spawn"))
+        with mock.patch.object(multiprocessing, "get_all_start_methods", return_value=["spawn"]):
+            self.assertEqual(pool_context().get_start_method(), "spawn")
+
+    def test_fire_bitwise_identical_for_any_worker_count(self):
+        for kwargs in ({'n_paths': 9000, 'streaming': True}, {'n_paths': 5000, 'sampler': 'pseudo', 'streaming': False}):
+            one = simulate_fire_paths(**FIRE_PARAMS, workers=1, **kwargs)
+            two = simulate_fire_paths(**FIRE_PARAMS, workers=2, **kwargs)
+            for p in FAN_PERCENTILES:
+                np.testing.assert_array_equal(one[f'p{p}'], two[f'p{p}'])
+            for key in ('success_probability', 'success_probability_se', 'median_depletion_age'):
+                self.assertEqual(one[key], two[key])
+
+if __name__ == '__main__':
+    unittest.main()
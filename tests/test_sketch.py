@@ -0,0 +1,47 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from utils.sketch import QuantileSketch, SKETCH_RELATIVE_ACCURACY
+
+PERCENTILES = (1, 10, 25, 50, 75, 90, 99)
+
+class TestQuantileSketch(unittest.TestCase):
+
+    def test_within_relative_accuracy(self):
+        rng = np.random.default_rng(0)
+        values = np.exp(rng.normal(12, 1.5, (50000, 4)))
+        sketch = QuantileSketch(4)
+        for start in range(0, len(values), 3000):
+            sketch.add(values[start:start + 3000])
+        exact = np.percentile(values, PERCENTILES, axis=0)
+        np.testing.assert_allclose(sketch.percentiles(PERCENTILES), exact, rtol=SKETCH_RELATIVE_ACCURACY * 1.01)
+        self.assertEqual(sketch.count, 50000)
+
+    def test_zeros_and_growing_range(self):
+        sketch = QuantileSketch(2)
+        sketch.add([[0.0, 100.0], [0.0, 200.0]])
+        sketch.add([[5.0, 1e9], [-3.0, 0.5]])  # Range widens both ways; negatives count as zero
+        result = sketch.percentiles([0, 50, 100])
+        self.assertEqual(result[0, 0], 0.0)
+        self.assertEqual(result[1, 0], 0.0)
+        self.assertAlmostEqual(result[2, 0], 5.0, delta=5.0 * SKETCH_RELATIVE_ACCURACY)
+        self.assertAlmostEqual(result[0, 1], 0.5, delta=0.5 * SKETCH_RELATIVE_ACCURACY)
+        self.assertAlmostEqual(result[2, 1], 1e9, delta=1e9 * SKETCH_RELATIVE_ACCURACY)
+
+    def test_memory_independent_of_count(self):
+        rng = np.random.default_rng(1)
+        sketch = QuantileSketch(3)
+        sketch.add(rng.uniform(1000, 2000, (1000, 3)))
+        buckets = sketch._counts.shape[1]
+        for _ in range(20):
+            sketch.add(rng.uniform(1000, 2000, (5000, 3)))
+        self.assertEqual(sketch._counts.shape[1], buckets)
+
+    def test_empty(self):
+        self.assertTrue(np.isnan(QuantileSketch(2).percentiles([50])).all())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,9 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import unittest
-from utils.tax import calculate_income_tax, calculate_marginal_rate, calculate_stamp_duty
+import numpy as np
+from utils.tax import (calculate_income_tax, calculate_marginal_rate, calculate_stamp_duty, calculate_stamp_duty_array,
+                       calculate_lmi, calculate_lmi_array)
 
 class TestTaxEngine(unittest.TestCase):
 
@@ -44,5 +46,14 @@ class TestTaxEngine(unittest.TestCase):
         # Total = 15925
         self.assertAlmostEqual(calculate_stamp_duty("QLD", 500000), 15925, delta=100)
 
+    def test_compiled_tables_match_scalar(self):
+        # Includes every bracket boundary
+        values = np.concatenate([np.linspace(0, 2000000, 2001), [16000, 35000, 93000, 351000, 1168000, 960000, 5000, 540000]])
+        for state in ("NSW", "VIC", "QLD", "WA"):
+            np.testing.assert_array_equal(calculate_stamp_duty_array(state, values),
+                                          [calculate_stamp_duty(state, v) for v in values])
+        loans = np.linspace(300000, 550000, 1001)
+        np.testing.assert_array_equal(calculate_lmi_array(loans, 500000), [calculate_lmi(l, 500000) for l in loans])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,63 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from streamlit.testing.v1 import AppTest
+from utils.warmup import run_warmup, selected_steps, start_warmup, prime_default_projections, WARMUP_STEPS
+from utils.cache import get_cache_stats, projection_cache
+
+APP_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app.py'))
+
+class TestWarmup(unittest.TestCase):
+
+    def test_selected_steps(self):
+        self.assertEqual(selected_steps(""), ())
+        self.assertEqual(selected_steps("0"), ())
+        self.assertEqual(selected_steps("all"), WARMUP_STEPS)
+        self.assertEqual([name for name, _ in selected_steps("plotly, imports")], ["imports", "plotly"])
+        with self.assertRaises(ValueError):
+            selected_steps("imports,bogus")
+        self.assertIsNone(start_warmup("bogus"))
+        self.assertIsNone(start_warmup("off"))
+
+    def test_failing_step_does_not_stop_the_rest(self):
+        calls = []
+
+        def broken():
+            raise RuntimeError("no browser")
+
+        with self.assertLogs("wealth_warmup", level="INFO") as logs:
+            timings = run_warmup((("broken", broken), ("after", lambda: calls.append(1))))
+        self.assertIsNone(timings["broken"])
+        self.assertGreaterEqual(timings["after"], 0)
+        self.assertEqual(calls, [1])
+        self.assertTrue(any("broken failed" in line for line in logs.output))
+
+    def test_default_projections_prime_the_cache(self):
+        steps = dict(WARMUP_STEPS)
+        run_warmup((("default_projections", steps["default_projections"]),))
+        hits = get_cache_stats()["hits"]
+        run_warmup((("default_projections", steps["default_projections"]),))
+        self.assertGreater(get_cache_stats()["hits"], hits)
+
+    def test_page_path_hits_the_warmed_cache(self):
+        projection_cache.clear()
+        prime_default_projections()
+        # A new visitor submitting each page with its defaults, with and without Tier 1 first
+        for pages in (("Tier 1: Clarity (Readiness)", "Tier 2: Direction (Strategy)", "Tier 3: Acceleration (Super)"),
+                      ("Tier 2: Direction (Strategy)", "Tier 3: Acceleration (Super)")):
+            misses = get_cache_stats()["misses"]
+            at = AppTest.from_file(APP_PATH, default_timeout=120)
+            at.run()
+            at.session_state["lead_data"] = {"name": "Test User", "email": "test@example.com"}
+            for page in pages:
+                at.session_state["page_selection"] = page
+                at.run()
+                next(button for button in at.button if button.label.startswith("🚀")).click()
+                at.run()
+            self.assertEqual(len(at.exception), 0)
+            self.assertEqual(get_cache_stats()["misses"], misses, pages)
+
+if __name__ == '__main__':
+    unittest.main()
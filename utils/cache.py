@@ -0,0 +1,285 @@
+import os
+import time
+import json
+import pickle
+import hashlib
+import inspect
+import functools
+import threading
+from collections import OrderedDict
+from utils.session import estimate_size
+
+# Defaults (override with environment variables)
+CACHE_MAX_ENTRIES = int(os.environ.get("WEALTH_CACHE_MAX_ENTRIES", 2048))
+CACHE_MAX_BYTES = int(os.environ.get("WEALTH_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+CACHE_TTL_SECONDS = float(os.environ.get("WEALTH_CACHE_TTL_SECONDS", 6 * 60 * 60))
+# Local directory for persisted entries; disk persistence is off unless set
+CACHE_DIR = os.environ.get("WEALTH_CACHE_DIR") or None
+CACHE_MAX_DISK_BYTES = int(os.environ.get("WEALTH_CACHE_MAX_DISK_BYTES", 512 * 1024 * 1024))
+CACHE_SWEEP_SECONDS = 60  # Minimum gap between sweeps of the disk tier
+
+# Bump to invalidate every cached projection (e.g. after changing reference data
+# that isn't Python source). Source changes are picked up by SOURCE_FINGERPRINT.
+CACHE_VERSION = 1
+
+# Packages whose source is fingerprinted into every key: a decorated engine's
+# result also depends on the helpers it calls (utils.tax etc.)
+ENGINE_PACKAGES = ("calculators", "utils")
+
+
+def _canonical(value):
+    """Normalises an input so equal values always serialise identically (35 == 35.0)."""
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return repr(round(float(value), 10))
+    if hasattr(value, "tolist"):  # NumPy scalars / arrays
+        return _canonical(value.tolist())
+    if hasattr(value, "to_dict"):  # ProjectionResult
+        return _canonical(value.to_dict())
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    raise TypeError(f"Cannot build a cache key from {type(value).__name__}")
+
+
+def _source_fingerprint(packages=ENGINE_PACKAGES):
+    """Short hash of every .py file in `packages`, so any code change gets fresh keys."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    digest = hashlib.sha256()
+    for package in packages:
+        directory = os.path.join(root, package)
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".py"):
+                with open(os.path.join(directory, name), "rb") as f:
+                    digest.update(name.encode("utf-8") + b"\0" + f.read())
+    return digest.hexdigest()[:16]
+
+
+SOURCE_FINGERPRINT = _source_fingerprint()
+
+
+def make_key(namespace, inputs):
+    """Stable hex key for a namespace (function identity) plus its canonical inputs."""
+    payload = json.dumps([namespace, _canonical(inputs)], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ProjectionCache:
+    """
+    Thread-safe, process-wide LRU cache for pure projection results.
+
+    Entries expire after `ttl_seconds` and the least recently used entries are
+    evicted once either `max_entries` or `max_bytes` is exceeded. When
+    `disk_dir` is set, entries are also written there so hits survive restarts;
+    writes periodically sweep expired files and the oldest ones beyond
+    `max_disk_bytes`. Cached values are shared between sessions and must not
+    be mutated.
+    """
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES,
+                 ttl_seconds=CACHE_TTL_SECONDS, disk_dir=CACHE_DIR, max_disk_bytes=CACHE_MAX_DISK_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()  # key -> (value, expires_at, size, compute_seconds)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._sweep_lock = threading.Lock()
+        self._last_sweep = 0.0
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0,
+                       "expired": 0, "compute_seconds": 0.0, "compute_seconds_saved": 0.0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    # --- Public API ---
+
+    def get(self, key):
+        """Returns (found, value)."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, size, compute_seconds = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    self._stats["compute_seconds_saved"] += compute_seconds
+                    return True, value
+                self._drop(key)
+                self._stats["expired"] += 1
+
+        found, value, compute_seconds = self._read_disk(key, now)
+        with self._lock:
+            if found:
+                self._stats["disk_hits"] += 1
+                self._stats["compute_seconds_saved"] += compute_seconds
+                self._insert(key, value, now, compute_seconds)
+            else:
+                self._stats["misses"] += 1
+        return found, value
+
+    def put(self, key, value, compute_seconds=0.0):
+        now = time.time()
+        with self._lock:
+            self._stats["compute_seconds"] += compute_seconds
+            self._insert(key, value, now, compute_seconds)
+        self._write_disk(key, value, now, compute_seconds)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Hit/miss counters plus hit rate and current size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    # --- Memory tier (callers hold the lock) ---
+
+    def _insert(self, key, value, now, compute_seconds):
+        if key in self._entries:
+            self._drop(key)
+        size = estimate_size(value)
+        self._entries[key] = (value, now + self.ttl_seconds, size, compute_seconds)
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self._stats["evictions"] += 1
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry[2]
+
+    # --- Disk tier ---
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def _read_disk(self, key, now):
+        if not self.disk_dir:
+            return False, None, 0.0
+        try:
+            with open(self._path(key), "rb") as f:
+                created_at, compute_seconds, value = pickle.load(f)
+        except FileNotFoundError:
+            return False, None, 0.0
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, AttributeError, ImportError):
+            # Corrupt, or pickled against classes/modules that have since moved (ImportError
+            # covers ModuleNotFoundError): treat as a miss and drop the file
+            self._remove(self._path(key))
+            return False, None, 0.0
+        if created_at + self.ttl_seconds <= now:
+            self._remove(self._path(key))
+            return False, None, 0.0
+        return True, value, compute_seconds
+
+    def _write_disk(self, key, value, now, compute_seconds):
+        if not self.disk_dir:
+            return
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump((now, compute_seconds, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))  # Atomic, safe with concurrent writers
+        except (OSError, pickle.PicklingError):
+            self._remove(tmp_path)
+        if now - self._last_sweep >= CACHE_SWEEP_SECONDS:
+            self.sweep_disk(now)
+
+    def sweep_disk(self, now=None):
+        """
+        Deletes expired files from the disk tier, then the oldest ones until it
+        fits in `max_disk_bytes`. Returns the number of files removed.
+        """
+        if not self.disk_dir or not self._sweep_lock.acquire(blocking=False):
+            return 0  # Off, or another thread is already sweeping
+        try:
+            now = time.time() if now is None else now
+            self._last_sweep = now
+            files = []
+            for entry in os.scandir(self.disk_dir):
+                if not entry.name.endswith(".pkl"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+            files.sort()  # Oldest written first
+
+            removed, total = 0, sum(size for _, size, _ in files)
+            for modified, size, path in files:
+                if modified + self.ttl_seconds > now and total <= self.max_disk_bytes:
+                    break
+                self._remove(path)
+                total -= size
+                removed += 1
+            return removed
+        finally:
+            self._sweep_lock.release()
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# Single shared instance for the whole server process
+projection_cache = ProjectionCache()
+
+
+def cached_projection(func=None, ignore=()):
+    """
+    Decorator that memoises a pure projection function in `projection_cache`.
+
+    The key covers CACHE_VERSION, the engine source fingerprint (so a change
+    to the function or anything it calls never serves stale disk entries),
+    the function's identity (module, name and bytecode) and its bound
+    arguments with defaults applied. Arguments named in `ignore` are left out
+    of the key.
+    """
+    if func is None:
+        return functools.partial(cached_projection, ignore=ignore)
+
+    signature = inspect.signature(func)
+    code = func.__code__
+    constants = repr([c for c in code.co_consts if not inspect.iscode(c)])
+    code_hash = hashlib.sha256(code.co_code + constants.encode("utf-8")).hexdigest()[:16]
+    namespace = f"v{CACHE_VERSION}:{SOURCE_FINGERPRINT}:{func.__module__}.{func.__qualname__}:{code_hash}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        inputs = {name: value for name, value in bound.arguments.items() if name not in ignore}
+        key = make_key(namespace, inputs)
+
+        found, value = projection_cache.get(key)
+        if found:
+            return value
+
+        start = time.perf_counter()
+        value = func(*args, **kwargs)
+        projection_cache.put(key, value, compute_seconds=time.perf_counter() - start)
+        return value
+
+    wrapper.uncached = func
+    return wrapper
+
+
+def get_cache_stats():
+    """Hit rates and compute saved by the shared projection cache."""
+    return projection_cache.stats()
@@ -0,0 +1,89 @@
+import os
+import functools
+import threading
+from collections import OrderedDict
+import plotly.graph_objects as go
+import plotly.io as pio
+from utils.cache import make_key
+from utils.downsample import downsample_figure
+
+# --- BRAND PALETTE (matches utils/pdf_gen) ---
+BRAND_NAVY = "#0F172A"
+BRAND_INDIGO = "#6366F1"
+BRAND_PURPLE = "#A855F7"
+BRAND_EMERALD = "#10B981"
+BRAND_AMBER = "#F59E0B"
+BRAND_BLUE = "#3B82F6"
+BRAND_RED = "#EF4444"
+
+BRAND_COLORWAY = [BRAND_INDIGO, BRAND_NAVY, BRAND_PURPLE, BRAND_EMERALD, BRAND_AMBER, BRAND_BLUE, BRAND_RED]
+
+FIGURE_CACHE_SIZE = int(os.environ.get("WEALTH_FIGURE_CACHE_SIZE", 256))
+
+
+def _build_brand_template():
+    """Plotly's default template with the brand colours merged in (built once at import)."""
+    template = go.layout.Template(pio.templates["plotly"])
+    template.layout.update(
+        colorway=BRAND_COLORWAY,
+        font={"family": "Inter, Helvetica, Arial, sans-serif", "color": BRAND_NAVY},
+        title={"font": {"color": BRAND_NAVY}},
+        hoverlabel={"bgcolor": "white"},
+    )
+    return template
+
+
+BRAND_TEMPLATE = _build_brand_template()
+pio.templates["wealth"] = BRAND_TEMPLATE
+
+
+def brand_figure(**layout):
+    """Empty figure on the prebuilt brand template (referenced by name, so it is not re-validated)."""
+    return go.Figure(layout=dict(template="wealth", **layout))
+
+
+# --- FIGURE CACHE ---
+
+_figures = OrderedDict()  # make_key(builder, inputs) -> go.Figure
+_figures_lock = threading.Lock()
+_figure_stats = {"hits": 0, "misses": 0}
+
+
+def cached_figure(func):
+    """
+    Caches a chart builder's figure on a hash of its inputs.
+
+    Reruns with unchanged inputs get the already-built, validated figure back
+    instead of constructing a new one. New figures go through
+    `downsample_figure`, so no trace sends more than CHART_POINT_BUDGET points
+    to the browser. Cached figures are shared between sessions and must not
+    be modified after they are returned. The builder stays available as
+    `.uncached`.
+    """
+    namespace = f"figure:{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = make_key(namespace, [args, kwargs])
+        with _figures_lock:
+            fig = _figures.get(key)
+            if fig is not None:
+                _figures.move_to_end(key)
+                _figure_stats["hits"] += 1
+                return fig
+
+        fig = downsample_figure(func(*args, **kwargs))
+        with _figures_lock:
+            _figure_stats["misses"] += 1
+            _figures[key] = fig
+            while len(_figures) > FIGURE_CACHE_SIZE:
+                _figures.popitem(last=False)
+        return fig
+
+    wrapper.uncached = func
+    return wrapper
+
+
+def get_figure_cache_stats():
+    with _figures_lock:
+        return dict(_figure_stats, entries=len(_figures))
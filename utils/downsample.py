@@ -0,0 +1,92 @@
+import os
+import numpy as np
+
+# Max points sent to the browser per chart trace (override with an environment variable)
+CHART_POINT_BUDGET = int(os.environ.get("WEALTH_CHART_POINT_BUDGET", 600))
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: indices of `n_out` points that keep a line's shape.
+
+    The first and last points are always kept; every bucket in between keeps
+    the point forming the largest triangle with the previously kept point and
+    the average of the next bucket, so peaks and troughs survive.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket boundaries for the n - 2 interior points
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    # Averages of each bucket (the last 'next bucket' is the final point)
+    counts = np.diff(edges)
+    avg_x = np.append(np.add.reduceat(x[:-1], edges[:-1]) / counts, x[-1])
+    avg_y = np.append(np.add.reduceat(y[:-1], edges[:-1]) / counts, y[-1])
+
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        area = np.abs((x[a] - avg_x[i + 1]) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y[i + 1] - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def shared_indices(x, ys, budget=CHART_POINT_BUDGET):
+    """
+    One index set for several series on the same x (e.g. the edges of a band),
+    so filled areas stay aligned. Each series gets an equal share of the
+    budget and the kept points are merged.
+    """
+    if len(x) <= budget:
+        return np.arange(len(x))
+    per_series = max(budget // max(len(ys), 1), 3)
+    return np.unique(np.concatenate([lttb_indices(x, y, per_series) for y in ys]))
+
+
+def percentile_bands(paths, percentiles, budget=None):
+    """
+    Reduces a (paths x steps) cloud to percentile bands along the step axis.
+
+    Returns (step indices, bands) with one band row per percentile. With a
+    `budget`, the steps are thinned to at most that many, shared by all bands.
+    """
+    bands = np.percentile(paths, percentiles, axis=0)
+    steps = np.arange(bands.shape[1])
+    if budget is not None:
+        steps = shared_indices(steps, bands, budget)
+        bands = bands[:, steps]
+    return steps, bands
+
+
+def _numeric(values):
+    values = np.asarray(values)
+    return values if values.dtype.kind in "iuf" else np.arange(len(values))
+
+
+def downsample_figure(fig, budget=CHART_POINT_BUDGET):
+    """
+    Thins every Scatter trace longer than `budget` points, in place.
+
+    Traces with identical x values are thinned together so bands and
+    'tonexty' fills keep matching points. Shorter traces are left untouched.
+    """
+    groups = {}
+    for trace in fig.data:
+        if trace.type != "scatter" or trace.y is None or len(trace.y) <= budget:
+            continue
+        x = trace.x if trace.x is not None else np.arange(len(trace.y))
+        groups.setdefault(np.asarray(x).tobytes(), (x, []))[1].append(trace)
+
+    for x, traces in groups.values():
+        keep = shared_indices(_numeric(x), [np.asarray(t.y, dtype=np.float64) for t in traces], budget)
+        for trace in traces:
+            trace.x = np.asarray(x)[keep]
+            trace.y = np.asarray(trace.y)[keep]
+    return fig
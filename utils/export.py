@@ -0,0 +1,188 @@
+import io
+import csv
+import math
+import zipfile
+from xml.sax.saxutils import escape
+from utils.results import ProjectionResult
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Rows buffered before a chunk is handed to the caller
+EXPORT_CHUNK_ROWS = 500
+
+ID_COLUMNS = ["scenario", "projection", "year"]
+
+
+# --- Rows ---
+
+def iter_projections(result, name="projection"):
+    """Yields (name, ProjectionResult) for every projection inside an engine result."""
+    if isinstance(result, ProjectionResult):
+        yield name, result
+    elif isinstance(result, dict):
+        for key, value in result.items():
+            yield from iter_projections(value, key)
+
+
+def export_rows(results, labels=None):
+    """
+    Yields a header then one row per projection year, straight from the result blocks.
+
+    `results` is any iterable of engine results (consumed lazily, so a batch is
+    never held in memory at once); `labels` optionally names each scenario
+    (default: its 1-based position). The series columns come from the first
+    result, as every scenario of one calculator shares its structure. A result
+    that is an Exception is written as an 'error' row.
+    """
+    labels = iter(labels) if labels is not None else None
+    columns = None
+    leading_errors = []  # Errors before the header is known
+    for position, result in enumerate(results, start=1):
+        label = next(labels) if labels is not None else position
+        if isinstance(result, Exception):
+            if columns is None:
+                leading_errors.append([label, "error", str(result)])
+            else:
+                yield [label, "error", str(result)]
+            continue
+
+        projections = list(iter_projections(result))
+        if columns is None:
+            columns = []
+            for _, projection in projections:
+                columns.extend(s for s in projection.series_names if s not in columns)
+            yield ID_COLUMNS + columns
+            yield from leading_errors
+
+        for name, projection in projections:
+            index = {series: row for row, series in enumerate(projection.series_names)}
+            rows = [index.get(c) for c in columns]
+            for year, values in enumerate(projection.block.T.tolist(), start=1):
+                yield [label, name, year] + [values[r] if r is not None else None for r in rows]
+
+    if columns is None:
+        yield ID_COLUMNS
+        yield from leading_errors
+
+
+# --- Writers ---
+
+def stream_csv(rows):
+    """Encodes rows as CSV, yielding UTF-8 chunks of EXPORT_CHUNK_ROWS rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    pending = 0
+    for row in rows:
+        writer.writerow(["" if v is None else v for v in row])
+        pending += 1
+        if pending >= EXPORT_CHUNK_ROWS:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable file that collects whatever zipfile writes to it."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+
+
+def _xlsx_cell(value):
+    if value is None or isinstance(value, bool):
+        return "<c/>" if value is None else f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        # Excel has no NaN/inf, leave those blank
+        return f"<c><v>{value!r}</v></c>" if math.isfinite(value) else "<c/>"
+    return f'<c t="inlineStr"><is><t>{escape(str(value))}</t></is></c>'
+
+
+def stream_xlsx(rows, sheet_name="Projections"):
+    """
+    Encodes rows as a single-sheet XLSX workbook, yielding bytes as it goes.
+
+    The sheet XML is written into a ZIP entry on a non-seekable sink (sizes go
+    in data descriptors), so no part of the workbook is held beyond the
+    current chunk of rows.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for part, xml in XLSX_PARTS.items():
+            archive.writestr(part, xml)
+        archive.writestr("xl/workbook.xml", XLSX_WORKBOOK.format(name=escape(sheet_name[:31], {'"': "&quot;"})))
+
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                        b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+            pending = []
+            for row in rows:
+                pending.append("<row>" + "".join(_xlsx_cell(v) for v in row) + "</row>")
+                if len(pending) >= EXPORT_CHUNK_ROWS:
+                    sheet.write("".join(pending).encode("utf-8"))
+                    pending = []
+                    yield sink.drain()
+            sheet.write(("".join(pending) + "</sheetData></worksheet>").encode("utf-8"))
+    yield sink.drain()
+
+
+def stream_export(results, fmt="csv", labels=None):
+    """Streams engine results as CSV or XLSX chunks."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt} (expected {', '.join(EXPORT_FORMATS)})")
+    rows = export_rows(results, labels)
+    return stream_csv(rows) if fmt == "csv" else stream_xlsx(rows)
+
+
+def export_bytes(results, fmt="csv", labels=None):
+    """Whole export in memory (for single-session download buttons)."""
+    return b"".join(stream_export(results, fmt, labels))
@@ -0,0 +1,136 @@
+import os
+import json
+import math
+import logging
+import threading
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FUND_DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'fund_fees.json')
+
+# Every fund in fund_fees.json must provide these (all non-negative numbers)
+FUND_FIELDS = (
+    'admin_fee_flat',
+    'admin_fee_percent',
+    'admin_fee_cap',
+    'investment_fee_balanced',
+    'investment_fee_high_growth',
+    'transaction_cost',
+    'return_balanced_10y',
+    'return_high_growth_10y',
+)
+
+
+def validate_fund_data(data):
+    """Checks the fee table shape once at load time. Raises ValueError listing every problem."""
+    if not isinstance(data, dict) or not data:
+        raise ValueError("Fund data must be a non-empty object keyed by fund name.")
+    problems = []
+    for name, record in data.items():
+        if not isinstance(record, dict):
+            problems.append(f"{name}: expected an object")
+            continue
+        for field in FUND_FIELDS:
+            value = record.get(field)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                problems.append(f"{name}.{field}: missing or not a number")
+            elif not math.isfinite(value) or value < 0:
+                problems.append(f"{name}.{field}: must be a finite, non-negative number")
+    if problems:
+        raise ValueError("Invalid fund data: " + "; ".join(problems))
+
+
+class FundIndex:
+    """
+    Compiled, read-only view of the fee table.
+
+    Struct-of-arrays: `columns[field]` is a float64 array with one row per fund
+    (in `names` order) and `row_of[name]` gives a fund's row. It also behaves
+    like the old `{fund_name: {field: value}}` dict for display code.
+    """
+
+    __slots__ = ('names', 'row_of', 'columns', 'version', '_records')
+
+    def __init__(self, data, version=None):
+        validate_fund_data(data)
+        self.names = tuple(sorted(data))
+        self.row_of = {name: row for row, name in enumerate(self.names)}
+        self.columns = {}
+        for field in FUND_FIELDS:
+            column = np.array([data[name][field] for name in self.names], dtype=np.float64)
+            column.flags.writeable = False
+            self.columns[field] = column
+        self.version = version
+        self._records = {name: dict(data[name]) for name in self.names}
+
+    def fees(self, name):
+        """Fee fields for one fund as a plain dict of floats."""
+        row = self.row_of[name]
+        return {field: float(column[row]) for field, column in self.columns.items()}
+
+    def top(self, field, n):
+        """Names of the `n` funds with the highest `field` (ties keep name order)."""
+        order = np.argsort(-self.columns[field], kind='stable')
+        return [self.names[i] for i in order[:n]]
+
+    # --- Dict-style access (original JSON values) ---
+
+    def __getitem__(self, name):
+        return dict(self._records[name])
+
+    def __contains__(self, name):
+        return name in self.row_of
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def keys(self):
+        return list(self.names)
+
+    def items(self):
+        return [(name, dict(self._records[name])) for name in self.names]
+
+
+class FundRegistry:
+    """
+    Owns the compiled FundIndex for a JSON file and recompiles it when the
+    file's mtime/size changes, so updated PDS fees apply without a restart.
+    A bad edit is logged and the last good index keeps serving.
+    """
+
+    def __init__(self, path=FUND_DATA_PATH):
+        self.path = path
+        self._index = None
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    def _file_stamp(self):
+        stat = os.stat(self.path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def current(self):
+        """Returns the up-to-date FundIndex (one stat() call when nothing changed)."""
+        stamp = self._file_stamp()
+        if stamp == self._stamp and self._index is not None:
+            return self._index
+        with self._lock:
+            if stamp != self._stamp or self._index is None:
+                try:
+                    with open(self.path, 'r') as f:
+                        index = FundIndex(json.load(f), version=stamp[0])
+                except ValueError as e:  # Includes json.JSONDecodeError
+                    if self._index is None:
+                        raise
+                    logger.error("Ignoring update to %s: %s", self.path, e)
+                else:
+                    self._index = index
+                    logger.info("Loaded %d funds from %s", len(index), self.path)
+                self._stamp = stamp
+            return self._index
+
+
+fund_registry = FundRegistry()
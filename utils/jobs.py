@@ -0,0 +1,229 @@
+import os
+import time
+import uuid
+import pickle
+import sqlite3
+import inspect
+import importlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import streamlit as st
+from utils.simulation import pool_context
+
+# Job kinds -> "module:function". Resolved inside the worker process.
+# Functions may accept a `progress` callback taking a 0-1 fraction.
+# Register a kind here only once a page submits it (workers import every kind's module).
+JOB_KINDS = {
+    "fire_monte_carlo": "calculators.monte_carlo:simulate_fire_paths",
+}
+
+# Broker selection for the shared queue: "memory" or a path to a SQLite file
+JOB_BROKER = os.environ.get("WEALTH_JOB_BROKER", "memory")
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+# --- Brokers ---
+
+class InMemoryBroker:
+    """Keeps job records in a dict; visible to the server process only."""
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, job_id, kind):
+        now = time.time()
+        with self._lock:
+            self._jobs[job_id] = {"id": job_id, "kind": kind, "state": QUEUED, "progress": 0.0,
+                                  "result": None, "error": None, "created": now, "updated": now}
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields, updated=time.time())
+
+    def update_if(self, job_id, states, **fields):
+        """Updates the job only while its state is one of `states`. Returns True if it did."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["state"] not in states:
+                return False
+            job.update(fields, updated=time.time())
+            return True
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def delete(self, job_id):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+
+class SQLiteBroker:
+    """Stores job records (and pickled results) in a local SQLite file."""
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT, state TEXT, progress REAL, "
+                "result BLOB, error TEXT, created REAL, updated REAL)"
+            )
+
+    def _connect(self):
+        # One short-lived connection per call keeps this safe across threads
+        return sqlite3.connect(self.path, timeout=30)
+
+    def create(self, job_id, kind):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                         (job_id, kind, QUEUED, 0.0, None, None, now, now))
+
+    def update(self, job_id, **fields):
+        if "result" in fields:
+            fields["result"] = pickle.dumps(fields["result"], protocol=pickle.HIGHEST_PROTOCOL)
+        fields["updated"] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    def update_if(self, job_id, states, **fields):
+        """Updates the job only while its state is one of `states` (atomically). Returns True if it did."""
+        fields["updated"] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        placeholders = ", ".join("?" for _ in states)
+        with self._connect() as conn:
+            cursor = conn.execute(f"UPDATE jobs SET {columns} WHERE id = ? AND state IN ({placeholders})",
+                                  (*fields.values(), job_id, *states))
+        return cursor.rowcount > 0
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        if job["result"] is not None:
+            job["result"] = pickle.loads(job["result"])
+        return job
+
+    def delete(self, job_id):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+
+# --- Worker side ---
+
+_progress_queue = None
+
+
+def _init_worker(progress_queue):
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _warm_worker():
+    """Imports every job kind's module so the worker's first real job starts straight away."""
+    for target in JOB_KINDS.values():
+        importlib.import_module(target.split(":")[0])
+    return os.getpid()
+
+
+def _run_job(job_id, kind, params):
+    module_name, func_name = JOB_KINDS[kind].split(":")
+    func = getattr(importlib.import_module(module_name), func_name)
+    _progress_queue.put((job_id, 0.0))
+    if "progress" in inspect.signature(func).parameters:
+        params = dict(params, progress=lambda fraction: _progress_queue.put((job_id, float(fraction))))
+    return func(**params)
+
+
+# --- Queue ---
+
+class JobQueue:
+    """
+    Local job queue backed by a process pool.
+
+    `submit` returns a job ID straight away; the page polls `status` (state and
+    0-1 progress) and collects `result` when the job is done, so long runs never
+    block the Streamlit script thread.
+    """
+
+    def __init__(self, broker=None, workers=None):
+        self.broker = broker or InMemoryBroker()
+        self.workers = workers or os.cpu_count() or 1
+        # Workers come from a forkserver (or spawn) rather than forking the (threaded) server process
+        context = pool_context()
+        self._progress_queue = context.Queue()
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                             initializer=_init_worker, initargs=(self._progress_queue,))
+        self._listener = threading.Thread(target=self._listen_progress, daemon=True)
+        self._listener.start()
+
+    def _listen_progress(self):
+        while True:
+            message = self._progress_queue.get()
+            if message is None:
+                return
+            job_id, fraction = message
+            # Conditional, so a late progress message can't turn a finished job back to running
+            self.broker.update_if(job_id, (QUEUED, RUNNING), state=RUNNING, progress=fraction)
+
+    def submit(self, kind, params):
+        """Queues a job and returns its ID."""
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = uuid.uuid4().hex
+        self.broker.create(job_id, kind)
+        future = self._executor.submit(_run_job, job_id, kind, params)
+        future.add_done_callback(lambda f: self._finish(job_id, f))
+        return job_id
+
+    def prestart(self):
+        """
+        Starts every worker now rather than on the first submits, with the job
+        modules already imported. Returns the worker process IDs.
+        """
+        # Submitting while no worker is idle spawns one per task
+        futures = [self._executor.submit(_warm_worker) for _ in range(self.workers)]
+        return sorted({future.result() for future in futures})
+
+    def _finish(self, job_id, future):
+        try:
+            self.broker.update(job_id, state=DONE, progress=1.0, result=future.result())
+        except Exception as e:
+            self.broker.update(job_id, state=FAILED, error=f"{type(e).__name__}: {e}")
+
+    def status(self, job_id):
+        """Returns {'state', 'progress', 'error'} or None for an unknown job."""
+        job = self.broker.get(job_id)
+        if job is None:
+            return None
+        return {"state": job["state"], "progress": job["progress"], "error": job["error"]}
+
+    def result(self, job_id, pop=False):
+        """Returns the finished job's result (None while still running)."""
+        job = self.broker.get(job_id)
+        if job is None or job["state"] != DONE:
+            return None
+        if pop:
+            self.broker.delete(job_id)
+        return job["result"]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._progress_queue.put(None)
+        self._listener.join(timeout=5)
+
+
+@st.cache_resource
+def get_job_queue():
+    """Shared queue for the whole server process (broker chosen by WEALTH_JOB_BROKER)."""
+    broker = InMemoryBroker() if JOB_BROKER == "memory" else SQLiteBroker(JOB_BROKER)
+    return JobQueue(broker)
@@ -5,7 +5,13 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_RIGHT
 import io
+import copy
+import functools
 import datetime
+import threading
+from collections import OrderedDict
+from xml.sax.saxutils import escape
+from utils.cache import make_key
 
 # --- BRANDING CONSTANTS ---
 BRAND_NAVY = colors.Color(15/255, 23/255, 42/255) # #0F172A
@@ -42,53 +48,86 @@ def header_footer(canvas, doc):
     
     canvas.restoreState()
 
-def generate_pdf_report(user_data, dr_results, ip_results, chart_image=None):
-    """
-    Generates a premium PDF report using ReportLab Platypus.
-    
-    Args:
-        user_data (dict): Lead details (Name, Goal, etc.)
-        dr_results (dict): Debt Recycling calculation results
-        ip_results (dict): Investment Property calculation results
-        chart_image (bytes): PNG image data of the main chart (optional)
-    """
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=inch, leftMargin=inch, topMargin=inch, bottomMargin=inch)
-    
-    elements = []
+@functools.lru_cache(maxsize=None)
+def _report_styles():
+    """Title, heading and body styles shared by every report (built once per process)."""
     styles = getSampleStyleSheet()
-    
-    # Custom Styles
     title_style = ParagraphStyle(
         'TitleStyle',
         parent=styles['Heading1'],
         fontSize=24,
-        textColor=APT_NAVY,
+        textColor=BRAND_NAVY,
         spaceAfter=20,
         alignment=TA_CENTER
     )
-    
     h2_style = ParagraphStyle(
         'H2Style',
         parent=styles['Heading2'],
         fontSize=16,
-        textColor=APT_NAVY,
+        textColor=BRAND_NAVY,
         spaceBefore=20,
         spaceAfter=10
     )
+    return title_style, h2_style, styles['Normal']
+
+
+def _branded_table(data, col_widths):
+    """Navy-header comparison table used throughout the reports."""
+    t = Table(data, colWidths=col_widths)
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), BRAND_NAVY),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'), # Left align first col
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), BRAND_GREY),
+        ('GRID', (0, 0), (-1, -1), 1, colors.white)
+    ]))
+    return t
+
+
+def _strategy_table(dr_results, ip_results):
+    dr_final = dr_results['net_wealth'][-1]
+    ip_final = ip_results['net_wealth'][-1]
+    dr_tax = dr_results['tax_saved'][-1]
+    ip_tax = ip_results['tax_saved'][-1]
+    
+    data = [
+        ["Metric", "Debt Recycling", "Investment Property"],
+        ["Projected Net Wealth", f"${dr_final:,.0f}", f"${ip_final:,.0f}"],
+        ["Estimated Tax Saved", f"${dr_tax:,.0f}", f"${ip_tax:,.0f}"],
+        ["Liquidity", "High (Shares)", "Low (Property)"],
+        ["Effort Required", "Low (Set & Forget)", "High (Management)"]
+    ]
+    return [_branded_table(data, [2.5*inch, 1.75*inch, 1.75*inch]), Spacer(1, 20)]
+
+def generate_pdf_report(user_data, dr_results, ip_results, chart_image=None):
+    """
+    Generates a premium PDF report using ReportLab Platypus.
     
-    normal_style = styles['Normal']
+    Args:
+        user_data (dict): Lead details (Name, Goal, etc.)
+        dr_results (dict): Debt Recycling calculation results
+        ip_results (dict): Investment Property calculation results
+        chart_image (bytes): PNG image data of the main chart (optional)
+    """
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=inch, leftMargin=inch, topMargin=inch, bottomMargin=inch)
+    
+    elements = []
+    title_style, h2_style, normal_style = _report_styles()
     
     # --- TITLE PAGE / HEADER ---
     elements.append(Paragraph("Wealth Strategy Analysis", title_style))
-    elements.append(Paragraph(f"Prepared for: {user_data.get('name', 'Valued Client')}", normal_style))
+    elements.append(Paragraph(f"Prepared for: {escape(str(user_data.get('name', 'Valued Client')))}", normal_style))
     elements.append(Paragraph(f"Date: {datetime.date.today().strftime('%d %B %Y')}", normal_style))
     elements.append(Spacer(1, 20))
     
     # --- CLIENT GOAL ---
     if user_data.get('goal'):
         elements.append(Paragraph("Primary Objective", h2_style))
-        elements.append(Paragraph(f"Target: {user_data['goal']}", normal_style))
+        elements.append(Paragraph(f"Target: {escape(str(user_data['goal']))}", normal_style))
         elements.append(Spacer(1, 10))
 
     # --- MAIN CHART ---
@@ -101,37 +140,161 @@ def generate_pdf_report(user_data, dr_results, ip_results, chart_image=None):
 
     # --- COMPARISON TABLE ---
     elements.append(Paragraph("Strategy Comparison", h2_style))
+    elements.extend(_strategy_table(dr_results, ip_results))
     
-    dr_final = dr_results['net_wealth'][-1]
-    ip_final = ip_results['net_wealth'][-1]
-    dr_tax = dr_results['tax_saved'][-1]
-    ip_tax = ip_results['tax_saved'][-1]
+    # --- BUILD ---
+    doc.build(elements, onFirstPage=header_footer, onLaterPages=header_footer)
     
+    buffer.seek(0)
+    return buffer
+
+
+# --- CONSOLIDATED REPORT ---
+
+# Report sections in page order: (section, session key, heading)
+REPORT_SECTIONS = (
+    ("tier1", "tier1_results", "Investment Readiness"),
+    ("tier2", "tier2_results", "Strategy Comparison"),
+    ("tier3", "tier3_results", "Superannuation Outlook"),
+    ("fire", "fire_summary", "Financial Independence (FIRE)"),
+    ("legacy", "legacy_results", "Estate & Legacy"),
+)
+
+SECTION_CACHE_SIZE = 256
+
+_section_cache = OrderedDict()  # make_key(section, inputs) -> tuple of flowables
+_section_cache_lock = threading.Lock()
+_section_stats = {"hits": 0, "misses": 0}
+
+
+def _readiness_section(results, h2_style, normal_style):
+    scores = results['scores']
+    data = [["Component", "Score"]] + [
+        [label, f"{scores[key]}"] for key, label in (
+            ('equity', "Equity Position"), ('income', "Income Strength"), ('experience', "Investment Experience"),
+            ('risk', "Risk Profile"), ('age_bonus', "Age & Time Horizon"))
+    ] + [["Total", f"{scores['total']}/100"]]
+    return [
+        Paragraph(f"Profile: {results.get('risk_tolerance', 'Balanced')} investor, age {results.get('age', '-')}.", normal_style),
+        Spacer(1, 10),
+        _branded_table(data, [3.5*inch, 2.5*inch]),
+    ]
+
+
+def _strategy_section(results, h2_style, normal_style):
+    return [
+        Paragraph(f"Upfront purchase costs for the property scenario: stamp duty ${results.get('stamp_duty', 0):,.0f}, "
+                  f"LMI ${results.get('lmi', 0):,.0f}.", normal_style),
+        Spacer(1, 10),
+    ] + _strategy_table(results['dr_results'], results['ip_results'])
+
+
+def _super_section(results, h2_style, normal_style):
+    hg_final = results['hg_projection']['balance'][-1]
+    bal_final = results['bal_projection']['balance'][-1]
     data = [
-        ["Metric", "Debt Recycling", "Investment Property"],
-        ["Projected Net Wealth", f"${dr_final:,.0f}", f"${ip_final:,.0f}"],
-        ["Estimated Tax Saved", f"${dr_tax:,.0f}", f"${ip_tax:,.0f}"],
-        ["Liquidity", "High (Shares)", "Low (Property)"],
-        ["Effort Required", "Low (Set & Forget)", "High (Management)"]
+        ["Metric", "High Growth", "Balanced"],
+        [f"Balance at {results['retirement_age']}", f"${hg_final:,.0f}", f"${bal_final:,.0f}"],
+        ["Difference", f"${hg_final - bal_final:,.0f}", "-"],
     ]
-    
-    t = Table(data, colWidths=[2.5*inch, 1.75*inch, 1.75*inch])
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), BRAND_NAVY),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'), # Left align first col
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), BRAND_GREY),
-        ('GRID', (0, 0), (-1, -1), 1, colors.white)
-    ]))
-    
-    elements.append(t)
-    elements.append(Spacer(1, 20))
-    
-    # --- BUILD ---
+    return [
+        Paragraph(f"Fund: {escape(results['selected_fund'])}. Starting balance ${results['current_balance']:,.0f} "
+                  f"at age {results['current_age']}.", normal_style),
+        Spacer(1, 10),
+        _branded_table(data, [2.5*inch, 1.75*inch, 1.75*inch]),
+        Spacer(1, 10),
+        Paragraph(f"Estimated tax saved using carry-forward concessional contributions: "
+                  f"${results.get('tax_saved_catchup', 0):,.0f}.", normal_style),
+    ]
+
+
+def _fire_section(results, h2_style, normal_style):
+    # The model covers the bridge from the FIRE age to super access, not life expectancy
+    if results.get('success'):
+        outcome = f"Bridge holds to age {results.get('access_age', 60)}"
+    else:
+        outcome = f"Funds depleted at age {results.get('depletion_age')}"
+    data = [
+        ["Metric", "Value"],
+        [f"Required Wealth at {results['fire_age']}", f"${results['required_capital']:,.0f}"],
+        ["Projected Wealth", f"${results['projected_wealth']:,.0f}"],
+        ["Gap", f"${max(results['gap'], 0):,.0f}"],
+        ["Outcome", outcome],
+    ]
+    return [_branded_table(data, [3.5*inch, 2.5*inch])]
+
+
+def _legacy_section(results, h2_style, normal_style):
+    data = [
+        ["Metric", "Value"],
+        ["Projected Super Balance", f"${results['projected_balance']:,.0f}"],
+        ["Taxable Component", f"${results['taxable_portion']:,.0f}"],
+        ["Death Benefit Tax (Today)", f"${results['current_tax']:,.0f}"],
+        ["Death Benefit Tax (Projected)", f"${results['future_tax']:,.0f}"],
+    ]
+    return [_branded_table(data, [3.5*inch, 2.5*inch])]
+
+
+SECTION_BUILDERS = {
+    "tier1": _readiness_section,
+    "tier2": _strategy_section,
+    "tier3": _super_section,
+    "fire": _fire_section,
+    "legacy": _legacy_section,
+}
+
+
+def _section_flowables(section, heading, results, styles):
+    """Returns a section's flowables, rebuilding them only when its inputs change."""
+    key = make_key(f"report:{section}", results)
+    with _section_cache_lock:
+        cached = _section_cache.get(key)
+        if cached is not None:
+            _section_cache.move_to_end(key)
+            _section_stats["hits"] += 1
+    if cached is None:
+        _, h2_style, normal_style = styles
+        cached = tuple([Paragraph(heading, h2_style)] + SECTION_BUILDERS[section](results, h2_style, normal_style) + [Spacer(1, 20)])
+        with _section_cache_lock:
+            _section_stats["misses"] += 1
+            _section_cache[key] = cached
+            while len(_section_cache) > SECTION_CACHE_SIZE:
+                _section_cache.popitem(last=False)
+    # Layout stores sizes on the flowables themselves, so every build gets its own copies
+    return [copy.copy(f) for f in cached]
+
+
+def get_report_cache_stats():
+    with _section_cache_lock:
+        return dict(_section_stats, entries=len(_section_cache))
+
+
+def build_consolidated_report(user_data, sections):
+    """
+    One PDF covering every tier the user has completed.
+
+    `sections` maps a REPORT_SECTIONS name to its results (missing or empty
+    sections are left out). Each section's flowables are cached under a hash
+    of its results, so regenerating after one tier changes only rebuilds that
+    section before the document is laid out again.
+    """
+    styles = _report_styles()
+    title_style, h2_style, normal_style = styles
+    included = [(name, heading) for name, _, heading in REPORT_SECTIONS if sections.get(name)]
+
+    elements = [
+        Paragraph("Consolidated Wealth Information Summary", title_style),
+        Paragraph(f"Prepared for: {escape(user_data.get('name', 'Valued Client'))}", normal_style),
+        Paragraph(f"Date: {datetime.date.today().strftime('%d %B %Y')}", normal_style),
+        Spacer(1, 20),
+    ]
+    if not included:
+        elements.append(Paragraph("No scenarios have been modelled yet.", normal_style))
+    for name, heading in included:
+        elements.extend(_section_flowables(name, heading, sections[name], styles))
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=inch, leftMargin=inch, topMargin=inch, bottomMargin=inch)
     doc.build(elements, onFirstPage=header_footer, onLaterPages=header_footer)
-    
     buffer.seek(0)
     return buffer
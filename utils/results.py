@@ -0,0 +1,107 @@
+import numpy as np
+
+
+class ProjectionResult:
+    """
+    Year-by-year projection output stored as one contiguous float64 block.
+
+    Each named series (e.g. 'net_wealth', 'balance') is a row of the block and
+    is handed out as a read-only NumPy view, so charts and tables can use the
+    data without copying it. Non-series values (e.g. 'tax_saved_catchup') are
+    kept in `scalars`.
+
+    Behaves like the old dict-of-lists results for callers:
+    `result['net_wealth'][-1]`, `result.get('tax_saved', [0])`, `'balance' in result`,
+    `len(result)` (number of keys). The number of years is `periods`.
+    """
+
+    __slots__ = ('_block', '_index', 'scalars')
+
+    def __init__(self, columns, scalars=None):
+        """
+        Args:
+            columns (dict): Series name -> sequence of equal-length values.
+            scalars (dict): Extra single values stored alongside the series.
+        """
+        names = list(columns)
+        length = len(columns[names[0]]) if names else 0
+        block = np.empty((len(names), length), dtype=np.float64)
+        for row, name in enumerate(names):
+            block[row] = columns[name]
+        self._set_block(names, block)
+        self.scalars = dict(scalars or {})
+
+    @classmethod
+    def from_block(cls, names, block, scalars=None):
+        """Wraps an already-filled (series x years) array without copying it."""
+        result = cls.__new__(cls)
+        result._set_block(list(names), np.ascontiguousarray(block, dtype=np.float64))
+        result.scalars = dict(scalars or {})
+        return result
+
+    def _set_block(self, names, block):
+        if block.ndim != 2 or block.shape[0] != len(names):
+            raise ValueError("Projection block must have one row per series name.")
+        block.flags.writeable = False  # Results may be shared, never mutate in place
+        self._block = block
+        self._index = {name: row for row, name in enumerate(names)}
+
+    # --- Mapping-style access (compatible with the old dict results) ---
+
+    def __getitem__(self, key):
+        row = self._index.get(key)
+        if row is not None:
+            return self._block[row]
+        return self.scalars[key]
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def __contains__(self, key):
+        return key in self._index or key in self.scalars
+
+    def keys(self):
+        return list(self._index) + list(self.scalars)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        """Number of keys (series plus scalars), as for a dict."""
+        return len(self._index) + len(self.scalars)
+
+    def __reduce__(self):
+        # Rebuild through from_block so unpickled copies stay read-only
+        return (ProjectionResult.from_block, (self.series_names, self._block, self.scalars))
+
+    def __repr__(self):
+        return f"ProjectionResult(series={list(self._index)}, periods={self.periods})"
+
+    # --- Array access ---
+
+    @property
+    def series_names(self):
+        return list(self._index)
+
+    @property
+    def periods(self):
+        """Number of projected periods (columns in the block)."""
+        return self._block.shape[1]
+
+    @property
+    def block(self):
+        """Read-only (series x years) view of all series."""
+        return self._block
+
+    @property
+    def nbytes(self):
+        """Bytes held by the series data."""
+        return self._block.nbytes
+
+    def to_dict(self):
+        """Plain dict-of-lists copy (for JSON / legacy consumers)."""
+        data = {name: self._block[row].tolist() for name, row in self._index.items()}
+        data.update(self.scalars)
+        return data
@@ -0,0 +1,195 @@
+import os
+import sys
+import threading
+import numpy as np
+import streamlit as st
+from utils.results import ProjectionResult
+
+# Session keys holding calculator output / profile data that we account for
+TRACKED_KEYS = [
+    "tier1_results",
+    "tier2_results",
+    "tier3_results",
+    "fire_results",
+    "fire_summary",
+    "legacy_results",
+    "user_profile",
+    "lead_data",
+]
+
+# Profile a new session starts with (before Tier 1 is filled in)
+DEFAULT_USER_PROFILE = {
+    "age": 35,
+    "marital_status": "Married/De facto",
+    "income": 120000,
+    "dependants": 0,
+    "home_value": 1000000,
+    "mortgage": 600000,
+    "risk_tolerance": "Balanced",
+    "experience": "Intermediate (Some Shares/Property)",
+    "state": "NSW"
+}
+
+# Per-session budget for the tracked keys (override with WEALTH_SESSION_BUDGET_BYTES)
+SESSION_BUDGET_BYTES = int(os.environ.get("WEALTH_SESSION_BUDGET_BYTES", 32 * 1024))
+
+# Internal bookkeeping keys (kept out of the tracked set)
+_RECIPES_KEY = "_result_recipes"
+_ACCESS_KEY = "_result_access"
+_STATS_KEY = "_session_memory"
+
+# Process-wide counters across all sessions
+_metrics = {
+    "evictions": 0,
+    "bytes_evicted": 0,
+    "compactions": 0,
+    "bytes_compacted": 0,
+    "recomputes": 0,
+}
+_metrics_lock = threading.Lock()
+
+
+def _bump(**counts):
+    with _metrics_lock:
+        for name, amount in counts.items():
+            _metrics[name] += amount
+
+
+def estimate_size(value, _seen=None):
+    """Approximate deep memory footprint of a session value in bytes."""
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    if isinstance(value, ProjectionResult):
+        return sys.getsizeof(value) + value.nbytes + estimate_size(value.scalars, _seen)
+    if isinstance(value, np.ndarray):
+        # Views don't own their data; count the base array once
+        if value.base is not None:
+            return sys.getsizeof(value) + estimate_size(value.base, _seen)
+        return sys.getsizeof(value) + value.nbytes
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += estimate_size(k, _seen) + estimate_size(v, _seen)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            size += estimate_size(item, _seen)
+    return size
+
+
+def _touch(key):
+    access = st.session_state.setdefault(_ACCESS_KEY, {})
+    access[key] = access.get("_clock", 0) + 1
+    access["_clock"] = access[key]
+
+
+def store_result(key, value, recompute=None, inputs=None):
+    """
+    Stores a calculator result in session state.
+
+    Args:
+        key (str): Session state key (e.g. 'tier2_results').
+        value: The result to store.
+        recompute (callable): Pure function that rebuilds the value. When given,
+            the result may be evicted under memory pressure and is rebuilt
+            transparently by `get_result`.
+        inputs (dict): Keyword arguments for `recompute`.
+    """
+    st.session_state[key] = value
+    recipes = st.session_state.setdefault(_RECIPES_KEY, {})
+    if recompute is not None:
+        recipes[key] = (recompute, dict(inputs or {}))
+    else:
+        recipes.pop(key, None)
+    _touch(key)
+
+
+def get_result(key, default=None):
+    """Returns a stored result, recomputing it from its recipe if it was evicted."""
+    if key in st.session_state:
+        _touch(key)
+        return st.session_state[key]
+
+    recipe = st.session_state.get(_RECIPES_KEY, {}).get(key)
+    if recipe is None:
+        return default
+
+    recompute, inputs = recipe
+    value = recompute(**inputs)
+    st.session_state[key] = value
+    _touch(key)
+    _bump(recomputes=1)
+    return value
+
+
+def measure_session():
+    """Returns {key: bytes} for the tracked keys currently held by this session."""
+    return {key: estimate_size(st.session_state[key]) for key in TRACKED_KEYS if key in st.session_state}
+
+
+def _compact_value(value):
+    """Losslessly replaces plain numeric lists with float64 arrays. Returns (value, changed)."""
+    if isinstance(value, list) and len(value) > 8 and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value):
+        return np.asarray(value, dtype=np.float64), True
+    if isinstance(value, dict):
+        changed = False
+        for k, v in value.items():
+            new_v, v_changed = _compact_value(v)
+            if v_changed:
+                value[k] = new_v
+                changed = True
+        return value, changed
+    return value, False
+
+
+def enforce_budget(budget_bytes=None):
+    """
+    Keeps this session's tracked results under the memory budget.
+
+    First compacts numeric lists into arrays, then evicts results that have a
+    recompute recipe, least recently used first. Results stored without one
+    (the Tier 1, FIRE and legacy summaries) are only compacted, and profile
+    and lead data are never evicted. Returns the per-session stats dict.
+    """
+    budget = SESSION_BUDGET_BYTES if budget_bytes is None else budget_bytes
+    sizes = measure_session()
+    total = sum(sizes.values())
+    stats = st.session_state.setdefault(_STATS_KEY, {"bytes_saved": 0, "evictions": 0})
+
+    if total > budget:
+        # 1. Compaction (lossless)
+        for key in list(sizes):
+            value, changed = _compact_value(st.session_state[key])
+            if changed:
+                new_size = estimate_size(value)
+                saved = sizes[key] - new_size
+                total -= saved
+                sizes[key] = new_size
+                stats["bytes_saved"] += saved
+                _bump(compactions=1, bytes_compacted=saved)
+
+    if total > budget:
+        # 2. Evict recomputable results, least recently used first
+        recipes = st.session_state.get(_RECIPES_KEY, {})
+        access = st.session_state.get(_ACCESS_KEY, {})
+        candidates = sorted((key for key in sizes if key in recipes), key=lambda k: access.get(k, 0))
+        for key in candidates:
+            if total <= budget:
+                break
+            del st.session_state[key]
+            total -= sizes[key]
+            stats["bytes_saved"] += sizes[key]
+            stats["evictions"] += 1
+            _bump(evictions=1, bytes_evicted=sizes[key])
+
+    stats["bytes_held"] = total
+    return stats
+
+
+def get_memory_metrics():
+    """Process-wide compaction/eviction counters (all sessions)."""
+    with _metrics_lock:
+        return dict(_metrics)
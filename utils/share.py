@@ -0,0 +1,308 @@
+"""
+Compact, versioned encoding of a session's inputs for shareable links.
+
+A token packs the user profile and the scenario workspace (the current plan
+plus any what-ifs) into bytes and base64url-encodes them without padding, so
+it can sit in a query string. Every value is written against a fixed field
+list for the schema version: enums become option indices, money whole
+dollars, rates fixed-point integers, all as variable-length integers. The
+current plan is written in full and each what-if only as the fields that
+differ from it, so a link with a few what-ifs stays a couple of hundred
+characters.
+
+Fields may be appended to a list within a version (older links simply lack
+them). Reordering fields or changing a codec or an enum's options requires a
+new SHARE_SCHEMA_VERSION, and a decoder for the old one so existing links
+keep working.
+"""
+import base64
+import struct
+
+SHARE_SCHEMA_VERSION = 1
+
+# Query string parameter carrying the token
+SHARE_QUERY_PARAM = "s"
+
+# Longest token accepted (generous; a full workspace is well under this)
+MAX_TOKEN_LENGTH = 2048
+
+# Rates are stored in millionths (0.0615 -> 61500)
+RATE_SCALE = 1_000_000
+
+MARITAL_OPTIONS = ("Single", "Married/De facto", "Divorced", "Widowed")
+RISK_OPTIONS = ("Conservative", "Moderately Conservative", "Balanced", "Moderate Growth", "High Growth")
+EXPERIENCE_OPTIONS = ("Beginner (Cash/Term Deposits)", "Intermediate (Some Shares/Property)",
+                      "Advanced (Active Portfolio/SMSF)")
+STATE_OPTIONS = ("NSW", "VIC", "QLD", "WA", "SA", "TAS", "ACT", "NT")
+LOAN_TYPE_OPTIONS = ("Interest Only", "Principal & Interest")
+
+# (field, codec) in wire order; a codec is "money", "int", "rate", "rate?" (may be None), "text" or an options tuple
+PROFILE_SCHEMA = (
+    ("age", "int"),
+    ("marital_status", MARITAL_OPTIONS),
+    ("income", "money"),
+    ("user_income", "money"),
+    ("partner_income", "money"),
+    ("dependants", "int"),
+    ("home_value", "money"),
+    ("mortgage", "money"),
+    ("risk_tolerance", RISK_OPTIONS),
+    ("experience", EXPERIENCE_OPTIONS),
+    ("state", STATE_OPTIONS),
+)
+
+SECTION_SCHEMA = (
+    ("strategy", (
+        ("income", "money"),
+        ("partner_income", "money"),
+        ("marginal_tax_rate", "rate?"),
+        ("dr_amount", "money"),
+        ("dr_growth", "rate"),
+        ("dr_yield", "rate"),
+        ("ip_price", "money"),
+        ("ip_growth", "rate"),
+        ("ip_yield", "rate"),
+        ("ip_state", STATE_OPTIONS),
+        ("loan_rate", "rate"),
+        ("loan_type", LOAN_TYPE_OPTIONS),
+        ("loan_term", "int"),
+        ("maint_rate", "rate"),
+        ("mgmt_rate", "rate"),
+        ("rates", "money"),
+    )),
+    ("super", (
+        ("selected_fund", "text"),
+        ("current_age", "int"),
+        ("retirement_age", "int"),
+        ("current_balance", "money"),
+        ("annual_salary", "money"),
+        ("employer_contrib", "rate"),
+        ("voluntary_contrib", "money"),
+        ("high_growth_return", "rate?"),
+        ("balanced_return", "rate?"),
+        ("salary_growth", "rate"),
+        ("unused_cap", "money"),
+    )),
+    ("fire", (
+        ("current_age", "int"),
+        ("fire_age", "int"),
+        ("annual_spend", "money"),
+        ("current_investable", "money"),
+        ("monthly_savings", "money"),
+        ("return_rate", "rate"),
+        ("inflation_rate", "rate"),
+        ("access_age", "int"),
+    )),
+    ("legacy", (
+        ("taxable_portion", "rate"),
+    )),
+)
+
+# (min, max) of decoded numbers, by field name: the page input bounds (profile
+# age as Tier 1, scenario ages as the workspace editor), so a restored link
+# can't put a widget or an engine out of range. Unlisted fields are unchecked.
+MAX_AMOUNT = 1_000_000_000
+FIELD_BOUNDS = {
+    "age": (18, 80), "dependants": (0, 10), "loan_term": (1, 40),
+    "current_age": (18, 90), "retirement_age": (18, 90), "fire_age": (18, 90), "access_age": (18, 90),
+    **{field: (0, MAX_AMOUNT) for field in (
+        "income", "user_income", "partner_income", "home_value", "mortgage", "dr_amount", "ip_price", "rates",
+        "current_balance", "annual_salary", "voluntary_contrib", "unused_cap", "annual_spend",
+        "current_investable", "monthly_savings")},
+    **{field: (0, 1) for field in (
+        "marginal_tax_rate", "employer_contrib", "maint_rate", "mgmt_rate", "loan_rate", "taxable_portion")},
+    **{field: (-1, 1) for field in (
+        "dr_growth", "dr_yield", "ip_growth", "ip_yield", "high_growth_return", "balanced_return",
+        "salary_growth", "return_rate", "inflation_rate")},
+}
+
+
+# --- WIRE PRIMITIVES ---
+
+def _write_varint(out, value):
+    """Unsigned LEB128."""
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _zigzag(value):
+    """Signed -> unsigned so small negatives stay short (0, -1, 1, -2 -> 0, 1, 2, 3)."""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value):
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+def _write_signed(out, value):
+    _write_varint(out, _zigzag(value))
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def varint(self):
+        value, shift = 0, 0
+        while True:
+            if self.pos >= len(self.data) or shift > 63:
+                raise ValueError("Share link is truncated or corrupt.")
+            byte = self.data[self.pos]
+            self.pos += 1
+            value |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return value
+            shift += 7
+
+    def signed(self):
+        return _unzigzag(self.varint())
+
+    def raw(self, size):
+        if self.pos + size > len(self.data):
+            raise ValueError("Share link is truncated or corrupt.")
+        chunk = self.data[self.pos:self.pos + size]
+        self.pos += size
+        return chunk
+
+    def text(self):
+        try:
+            return self.raw(self.varint()).decode("utf-8")
+        except UnicodeDecodeError:
+            raise ValueError("Share link is truncated or corrupt.")
+
+
+def _write_text(out, value):
+    data = str(value).encode("utf-8")
+    _write_varint(out, len(data))
+    out.extend(data)
+
+
+def _write_value(out, codec, field, value):
+    if isinstance(codec, tuple):
+        if value not in codec:
+            raise ValueError(f"Cannot share {field}={value!r}: not one of the supported options.")
+        _write_varint(out, codec.index(value))
+    elif codec == "text":
+        _write_text(out, value)
+    elif codec == "rate?":
+        _write_varint(out, 0 if value is None else _zigzag(round(float(value) * RATE_SCALE)) + 1)
+    elif codec == "rate":
+        _write_signed(out, round(float(value) * RATE_SCALE))
+    else:  # money, int
+        _write_signed(out, round(float(value)))
+
+
+def _read_value(reader, codec, field):
+    if isinstance(codec, tuple):
+        index = reader.varint()
+        if index >= len(codec):
+            raise ValueError(f"Share link has an unknown option for {field}.")
+        return codec[index]
+    if codec == "text":
+        return reader.text()
+    if codec == "rate?":
+        value = reader.varint()
+        if value == 0:
+            return None
+        return _unzigzag(value - 1) / RATE_SCALE
+    if codec == "rate":
+        return reader.signed() / RATE_SCALE
+    return reader.signed()
+
+
+def _write_fields(out, schema, values, skip=None):
+    """Presence bitmask, then the present fields in schema order. Fields equal to `skip`'s are left out."""
+    present = [(i, field, codec) for i, (field, codec) in enumerate(schema)
+               if field in values and not (skip is not None and field in skip and skip[field] == values[field])]
+    _write_varint(out, sum(1 << i for i, _, _ in present))
+    for _, field, codec in present:
+        _write_value(out, codec, field, values[field])
+
+
+def _read_fields(reader, schema):
+    mask = reader.varint()
+    if mask >> len(schema):
+        raise ValueError("Share link has fields this version does not know.")
+    values = {field: _read_value(reader, codec, field)
+              for i, (field, codec) in enumerate(schema) if mask & (1 << i)}
+    for field, value in values.items():
+        if field in FIELD_BOUNDS and value is not None:
+            low, high = FIELD_BOUNDS[field]
+            if not low <= value <= high:
+                raise ValueError(f"Share link has an out-of-range {field}.")
+    return values
+
+
+# --- TOKENS ---
+
+def encode_scenario(profile, scenarios, baseline):
+    """
+    Packs the profile and workspace into a URL-safe token.
+
+    Args:
+        profile (dict): The shared user profile (unknown keys are not shared).
+        scenarios (dict): {name: {section: {field: value}}}, as in the scenario workspace.
+        baseline (str): Name of the scenario the others are stored against.
+
+    Money is kept to the dollar and rates to six decimal places. Raises
+    ValueError for a value the schema cannot represent (e.g. an unknown state).
+    """
+    if baseline not in scenarios:
+        raise ValueError(f"Workspace has no '{baseline}' scenario.")
+    out = bytearray(struct.pack(">B", SHARE_SCHEMA_VERSION))
+    _write_fields(out, PROFILE_SCHEMA, profile or {})
+
+    base = scenarios[baseline]
+    _write_text(out, baseline)
+    for section, schema in SECTION_SCHEMA:
+        _write_fields(out, schema, base.get(section, {}))
+
+    what_ifs = [name for name in scenarios if name != baseline]
+    _write_varint(out, len(what_ifs))
+    for name in what_ifs:
+        _write_text(out, name)
+        for section, schema in SECTION_SCHEMA:
+            _write_fields(out, schema, scenarios[name].get(section, {}), skip=base.get(section, {}))
+
+    return base64.urlsafe_b64encode(bytes(out)).rstrip(b"=").decode("ascii")
+
+
+def decode_scenario(token):
+    """
+    Inverse of encode_scenario. Returns (profile, scenarios, baseline).
+
+    What-ifs come back as complete input sets (the baseline with their
+    changes applied). Raises ValueError for a malformed, truncated or
+    unsupported-version token, or one with values outside FIELD_BOUNDS.
+    """
+    if not isinstance(token, str) or not token or len(token) > MAX_TOKEN_LENGTH:
+        raise ValueError("Share link is missing or too long.")
+    try:
+        data = base64.b64decode(token + "=" * (-len(token) % 4), altchars=b"-_", validate=True)
+    except ValueError:
+        raise ValueError("Share link is not valid base64url.")
+
+    reader = _Reader(data)
+    version = struct.unpack(">B", reader.raw(1))[0]
+    if version != SHARE_SCHEMA_VERSION:
+        raise ValueError(f"Share link version {version} is not supported.")
+
+    profile = _read_fields(reader, PROFILE_SCHEMA)
+    baseline = reader.text()
+    base = {section: _read_fields(reader, schema) for section, schema in SECTION_SCHEMA}
+    scenarios = {baseline: base}
+    for _ in range(reader.varint()):
+        name = reader.text()
+        scenarios[name] = {section: dict(base[section], **_read_fields(reader, schema))
+                           for section, schema in SECTION_SCHEMA}
+
+    if reader.pos != len(data):
+        raise ValueError("Share link has trailing data.")
+    return profile, scenarios, baseline
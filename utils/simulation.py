@@ -0,0 +1,80 @@
+"""
+Deterministic block runner for Monte Carlo simulations.
+
+Paths are split into blocks by `plan_blocks`, which looks only at the path
+count. Every block draws from its own stream, spawned from the run's seed
+with numpy's SeedSequence, and partial results come back in block order. A
+block's output therefore depends only on (seed, block index), and merging
+in block order gives bitwise-identical results for any number of workers.
+"""
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Paths per block (the unit of work sent to a worker)
+BLOCK_PATHS = 4096
+
+# Worker processes per simulation (1 runs blocks in the calling process)
+SIMULATION_WORKERS = int(os.environ.get("WEALTH_SIMULATION_WORKERS", 1))
+
+
+def pool_context():
+    """
+    Multiprocessing context for worker pools: forkserver where the platform
+    has it (workers never inherit the parent's threads or locks), else spawn.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def plan_blocks(n_paths, min_blocks=1, block_paths=BLOCK_PATHS):
+    """Block sizes for `n_paths`: at least `min_blocks` (when there are enough paths), at most `block_paths` each."""
+    n_blocks = max(min(min_blocks, n_paths), -(-n_paths // block_paths))
+    return np.diff(np.linspace(0, n_paths, n_blocks + 1).astype(np.int64)).tolist()
+
+
+def block_seeds(seed, n_blocks):
+    """One independent SeedSequence per block, spawned from the run's seed."""
+    return np.random.SeedSequence(seed).spawn(n_blocks)
+
+
+def iter_blocks(func, n_paths, seed, workers=None, min_blocks=1, progress=None, **kwargs):
+    """
+    Runs func(size, seed_sequence, **kwargs) for every block and yields the
+    results in block order.
+
+    `func` must be a module-level function (it is pickled to the workers).
+    At most two blocks per worker are in flight, so a consumer that merges
+    as it goes holds a bounded number of partial results. `progress`, if
+    given, is called with the fraction of paths done.
+    """
+    sizes = plan_blocks(n_paths, min_blocks)
+    seeds = block_seeds(seed, len(sizes))
+    workers = min(workers or SIMULATION_WORKERS, len(sizes)) or 1
+    done = 0
+
+    if workers == 1:
+        for size, block_seed in zip(sizes, seeds):
+            yield func(size, block_seed, **kwargs)
+            done += size
+            if progress is not None:
+                progress(done / n_paths)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context()) as executor:
+        pending = []
+        for size, block_seed in zip(sizes, seeds):
+            pending.append((size, executor.submit(func, size, block_seed, **kwargs)))
+            if len(pending) < workers * 2:
+                continue
+            finished_size, future = pending.pop(0)
+            yield future.result()
+            done += finished_size
+            if progress is not None:
+                progress(done / n_paths)
+        for size, future in pending:
+            yield future.result()
+            done += size
+            if progress is not None:
+                progress(done / n_paths)
@@ -0,0 +1,86 @@
+import numpy as np
+
+# Default relative accuracy of sketch percentiles (0.5% of the true value)
+SKETCH_RELATIVE_ACCURACY = 0.005
+
+# Values below this count as zero (balances are in dollars, so under a cent)
+SKETCH_MIN_VALUE = 0.01
+
+
+class QuantileSketch:
+    """
+    Streaming percentiles for a fixed number of columns (e.g. one per year).
+
+    Values are counted in logarithmic buckets, so any percentile comes back
+    within `relative_accuracy` of the value at its rank, however many values
+    were added (np.percentile also interpolates between neighbouring ranks).
+    Memory depends on the spread of the values (the number of buckets between
+    the smallest and largest), not on their count.
+    Values below `min_value`, including negatives, are counted as zero.
+    """
+
+    def __init__(self, n_columns, relative_accuracy=SKETCH_RELATIVE_ACCURACY, min_value=SKETCH_MIN_VALUE):
+        self.n_columns = n_columns
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self._log_gamma = np.log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self._zeros = np.zeros(n_columns, dtype=np.int64)
+        self._counts = np.zeros((n_columns, 0), dtype=np.int64)
+        self._offset = 0  # bucket index of self._counts[:, 0]
+        self.count = 0
+
+    def add(self, values):
+        """Adds a (rows x columns) block of values."""
+        values = np.asarray(values, dtype=np.float64).reshape(-1, self.n_columns)
+        self.count += len(values)
+        positive = values >= self.min_value
+        self._zeros += (~positive).sum(axis=0)
+        if not positive.any():
+            return
+
+        buckets = np.ceil(np.log(values[positive]) / self._log_gamma).astype(np.int64)
+        self._grow(buckets.min(), buckets.max())
+        columns = np.broadcast_to(np.arange(self.n_columns), values.shape)[positive]
+        width = self._counts.shape[1]
+        self._counts += np.bincount(columns * width + buckets - self._offset,
+                                    minlength=self.n_columns * width).reshape(self.n_columns, width)
+
+    def merge(self, other):
+        """Adds another sketch's counts (same columns and accuracy); the result is exact, in any order."""
+        self.count += other.count
+        self._zeros += other._zeros
+        width = other._counts.shape[1]
+        if width:
+            self._grow(other._offset, other._offset + width - 1)
+            start = other._offset - self._offset
+            self._counts[:, start:start + width] += other._counts
+
+    def _grow(self, low, high):
+        """Widens the bucket range to cover [low, high]."""
+        if self._counts.shape[1] == 0:
+            self._offset = low
+            self._counts = np.zeros((self.n_columns, high - low + 1), dtype=np.int64)
+            return
+        top = self._offset + self._counts.shape[1] - 1
+        if low < self._offset or high > top:
+            before, after = max(self._offset - low, 0), max(high - top, 0)
+            self._counts = np.pad(self._counts, ((0, 0), (before, after)))
+            self._offset -= before
+
+    def percentiles(self, percentiles):
+        """(len(percentiles) x columns) array, like np.percentile(values, percentiles, axis=0)."""
+        percentiles = np.atleast_1d(np.asarray(percentiles, dtype=np.float64))
+        result = np.zeros((len(percentiles), self.n_columns))
+        if self.count == 0:
+            return np.full_like(result, np.nan)
+
+        # Bucket i holds (gamma^(i-1), gamma^i]; its midpoint is within the accuracy of both ends
+        gamma = np.exp(self._log_gamma)
+        values = 2 * gamma ** (np.arange(self._counts.shape[1]) + self._offset) / (gamma + 1)
+        cumulative = self._zeros[:, np.newaxis] + np.cumsum(self._counts, axis=1)
+        ranks = np.round(percentiles / 100 * (self.count - 1)).astype(np.int64)
+        for column in range(self.n_columns):
+            positive = ranks >= self._zeros[column]
+            buckets = np.searchsorted(cumulative[column], ranks[positive], side="right")
+            result[positive, column] = values[np.minimum(buckets, len(values) - 1)]
+        return result
@@ -1,3 +1,5 @@
+import numpy as np
+
 def calculate_income_tax(income):
     """
     Calculates annual income tax based on 2024-25 (Stage 3) tax rates + 2% Medicare Levy.
@@ -34,6 +36,26 @@ def calculate_income_tax(income):
     
     return tax + medicare
 
+# Resident brackets (lower bound, upper bound, rate) above the tax-free threshold, plus Medicare
+INCOME_TAX_BRACKETS = [
+    (18200, 45000, 0.16),
+    (45000, 135000, 0.30),
+    (135000, 190000, 0.37),
+    (190000, np.inf, 0.45),
+]
+MEDICARE_LEVY = 0.02
+
+def calculate_income_tax_array(income):
+    """
+    Vectorised `calculate_income_tax` (same brackets, same order of additions),
+    for arrays of incomes of any shape.
+    """
+    income = np.asarray(income, dtype=np.float64)
+    tax = np.zeros_like(income)
+    for lower, upper, rate in INCOME_TAX_BRACKETS:
+        tax += np.maximum(np.minimum(income, upper) - lower, 0) * rate
+    return np.where(income <= INCOME_TAX_BRACKETS[0][0], 0.0, tax + income * MEDICARE_LEVY)
+
 def calculate_marginal_rate(income):
     """Returns the marginal tax rate for a given income level (including Medicare)."""
     if income <= 18200:
@@ -47,59 +69,70 @@ def calculate_marginal_rate(income):
     else:
         return 0.45 + 0.02
 
+# Stamp duty: state -> brackets of (upper bound, base duty, bracket start, rate).
+# Duty = base + (value - start) * rate for the first bracket whose upper bound covers the value.
+# Simplified approximations for 2024/25.
+STAMP_DUTY_BRACKETS = {
+    "NSW": [
+        (16000, 0, 0, 0.0125),
+        (35000, 200, 16000, 0.015),
+        (93000, 485, 35000, 0.0175),
+        (351000, 1500, 93000, 0.035),
+        (1168000, 10530, 351000, 0.045),
+        (np.inf, 47295, 1168000, 0.055),
+    ],
+    "VIC": [
+        (25000, 0, 0, 0.014),
+        (130000, 350, 25000, 0.024),
+        (440000, 2870, 130000, 0.05),
+        (960000, 18370, 440000, 0.06),
+        (np.inf, 0, 0, 0.055),  # Flatish rate above threshold approximation
+    ],
+    "QLD": [
+        (5000, 0, 0, 0.0),
+        (75000, 0, 5000, 0.015),
+        (540000, 1050, 75000, 0.035),
+        (1000000, 17325, 540000, 0.045),
+        (np.inf, 38025, 1000000, 0.0575),
+    ],
+}
+# Default fallback for other states (approx 4%)
+DEFAULT_STAMP_DUTY_BRACKETS = [(np.inf, 0, 0, 0.04)]
+
+# LMI: rate on the loan by LVR band (upper bound, rate). Very rough approximation of Genworth/QBE tables.
+LMI_BANDS = [
+    (0.80, 0.0),
+    (0.85, 0.01),
+    (0.90, 0.02),
+    (0.95, 0.04),
+    (np.inf, 0.05),
+]
+
+
+def _compile_brackets(brackets):
+    upper, base, start, rate = (np.array(column, dtype=np.float64) for column in zip(*brackets))
+    return upper, base, start, rate
+
+_STAMP_DUTY_TABLES = {state: _compile_brackets(brackets) for state, brackets in STAMP_DUTY_BRACKETS.items()}
+_DEFAULT_STAMP_DUTY_TABLE = _compile_brackets(DEFAULT_STAMP_DUTY_BRACKETS)
+_LMI_UPPER, _LMI_RATES = (np.array(column, dtype=np.float64) for column in zip(*LMI_BANDS))
+
+
 def calculate_stamp_duty(state, property_value, investor=True):
     """
     Estimates Stamp Duty based on State and Property Value.
     These are approximations for 2024/25.
     """
-    duty = 0
-    
-    if state == "NSW":
-        # Simplified NSW brackets
-        if property_value <= 16000:
-            duty = property_value * 0.0125
-        elif property_value <= 35000:
-            duty = 200 + (property_value - 16000) * 0.015
-        elif property_value <= 93000:
-            duty = 485 + (property_value - 35000) * 0.0175
-        elif property_value <= 351000:
-            duty = 1500 + (property_value - 93000) * 0.035
-        elif property_value <= 1168000:
-            duty = 10530 + (property_value - 351000) * 0.045
-        else:
-            duty = 47295 + (property_value - 1168000) * 0.055
-            
-    elif state == "VIC":
-        # Simplified VIC brackets
-        if property_value <= 25000:
-            duty = property_value * 0.014
-        elif property_value <= 130000:
-            duty = 350 + (property_value - 25000) * 0.024
-        elif property_value <= 440000:
-            duty = 2870 + (property_value - 130000) * 0.05
-        elif property_value <= 960000:
-            duty = 18370 + (property_value - 440000) * 0.06
-        else:
-            duty = property_value * 0.055 # Flatish rate above threshold approximation
-            
-    elif state == "QLD":
-        # Simplified QLD brackets
-        if property_value <= 5000:
-            duty = 0
-        elif property_value <= 75000:
-            duty = (property_value - 5000) * 0.015
-        elif property_value <= 540000:
-            duty = 1050 + (property_value - 75000) * 0.035
-        elif property_value <= 1000000:
-            duty = 17325 + (property_value - 540000) * 0.045
-        else:
-            duty = 38025 + (property_value - 1000000) * 0.0575
-            
-    # Default fallback for other states (approx 4%)
-    else: 
-        duty = property_value * 0.04
-        
-    return duty
+    for upper, base, start, rate in STAMP_DUTY_BRACKETS.get(state, DEFAULT_STAMP_DUTY_BRACKETS):
+        if property_value <= upper:
+            return base + (property_value - start) * rate
+
+def calculate_stamp_duty_array(state, property_values):
+    """Vectorised `calculate_stamp_duty`: bracket lookup with np.searchsorted on the compiled table."""
+    upper, base, start, rate = _STAMP_DUTY_TABLES.get(state, _DEFAULT_STAMP_DUTY_TABLE)
+    values = np.asarray(property_values, dtype=np.float64)
+    idx = np.searchsorted(upper, values, side='left')
+    return base[idx] + (values - start[idx]) * rate[idx]
 
 def calculate_lmi(loan_amount, property_value):
     """
@@ -108,50 +141,47 @@ def calculate_lmi(loan_amount, property_value):
     """
     lvr = loan_amount / property_value
     
-    if lvr <= 0.80:
+    if lvr <= LMI_BANDS[0][0]:
         return 0
     
-    # Very rough approximation of Genworth/QBE tables
     # LMI scales exponentially with LVR
-    if lvr <= 0.85:
-        rate = 0.01 # 1%
-    elif lvr <= 0.90:
-        rate = 0.02 # 2%
-    elif lvr <= 0.95:
-        rate = 0.04 # 4%
-    else:
-        rate = 0.05 # 5%
-        
-    return loan_amount * rate
+    for upper, rate in LMI_BANDS[1:]:
+        if lvr <= upper:
+            return loan_amount * rate
+
+def calculate_lmi_array(loan_amounts, property_values):
+    """Vectorised `calculate_lmi` over arrays of loans and property values."""
+    loans = np.asarray(loan_amounts, dtype=np.float64)
+    lvr = loans / np.asarray(property_values, dtype=np.float64)
+    return loans * _LMI_RATES[np.searchsorted(_LMI_UPPER, lvr, side='left')]
+
+# Land tax: state -> (tax-free threshold, base amount, rate above threshold). Other states: none modelled.
+LAND_TAX_BRACKETS = {
+    "NSW": (1075000, 100, 0.016),
+    "VIC": (50000, 500, 0.015),  # Vic has lower thresholds and higher rates generally (rough avg)
+    "QLD": (600000, 500, 0.01),  # simplified
+    "WA": (300000, 300, 0.0055),  # simplified
+    "SA": (534000, 0, 0.005),  # simplified
+}
 
 def calculate_land_tax(state, land_value):
     """
     Estimates Land Tax. 
     Note: Land Value is usually 50-70% of Property Value.
+    Land tax is assessed on the owner's total land value in each state.
     """
     # Simplified threshold check
-    tax = 0
-    if state == "NSW":
-        threshold = 1075000
-        if land_value > threshold:
-            tax = 100 + (land_value - threshold) * 0.016
-    elif state == "VIC":
-        threshold = 50000
-        if land_value > threshold:
-             # Vic has lower thresholds and higher rates generally
-            tax = 500 + (land_value - threshold) * 0.015 # rough avg
-            
-    elif state == "QLD":
-        threshold = 600000
-        if land_value > threshold:
-            tax = 500 + (land_value - threshold) * 0.01 # simplified
-    elif state == "WA":
-        threshold = 300000
-        if land_value > threshold:
-            tax = 300 + (land_value - threshold) * 0.0055 # simplified
-    elif state == "SA":
-        threshold = 534000
-        if land_value > threshold:
-             tax = (land_value - threshold) * 0.005 # simplified 
-
-    return tax
+    if state not in LAND_TAX_BRACKETS:
+        return 0
+    threshold, base, rate = LAND_TAX_BRACKETS[state]
+    if land_value > threshold:
+        return base + (land_value - threshold) * rate
+    return 0
+
+def calculate_land_tax_array(state, land_values):
+    """Vectorised `calculate_land_tax` for an array of (aggregate) land values in one state."""
+    land_values = np.asarray(land_values, dtype=np.float64)
+    if state not in LAND_TAX_BRACKETS:
+        return np.zeros_like(land_values)
+    threshold, base, rate = LAND_TAX_BRACKETS[state]
+    return np.where(land_values > threshold, base + (land_values - threshold) * rate, 0.0)
@@ -58,3 +58,41 @@ def go_to_page(page_name):
     """
     st.session_state.page_selection = page_name
     st.rerun()
+
+def render_export_buttons(results, file_stem, key):
+    """
+    CSV and Excel download buttons for a year-by-year projection export.
+    The file is only built when a button is clicked.
+    """
+    from utils.export import EXPORT_FORMATS, export_bytes
+
+    col_csv, col_xlsx = st.columns(2)
+    for col, fmt, label in ((col_csv, "csv", "⬇️ Download CSV"), (col_xlsx, "xlsx", "⬇️ Download Excel")):
+        with col:
+            st.download_button(
+                label,
+                data=lambda fmt=fmt: export_bytes([results], fmt),
+                file_name=f"{file_stem}.{fmt}",
+                mime=EXPORT_FORMATS[fmt],
+                key=f"{key}_{fmt}",
+                on_click="ignore",
+                use_container_width=True
+            )
+
+def render_consolidated_report_button(key):
+    """Download button for the multi-tier PDF, built from whichever tiers have results."""
+    from utils.pdf_gen import REPORT_SECTIONS, build_consolidated_report
+    from utils.session import get_result
+
+    sections = {name: get_result(session_key) for name, session_key, _ in REPORT_SECTIONS}
+    lead_data = dict(st.session_state.get('lead_data', {}))
+    st.download_button(
+        "📄 Download Consolidated Information Summary (PDF)",
+        data=lambda: build_consolidated_report(lead_data, sections).getvalue(),
+        file_name="Wealth_Consolidated_Summary.pdf",
+        mime="application/pdf",
+        key=key,
+        on_click="ignore",
+        type="primary",
+        use_container_width=True
+    )
@@ -0,0 +1,244 @@
+"""
+Opt-in warm-up so the first visitor to a fresh server doesn't pay start-up costs.
+
+Set WEALTH_WARMUP=1 (or "all") to run every step, or a comma-separated list
+of step names to run some of them. Streamlit has no server-start hook, so
+`start_warmup` is called as app.py loads and runs the steps once per process
+in a background thread; the first session renders while it runs instead of
+waiting on it. Each step's duration is logged to the "wealth_warmup" logger.
+"""
+import os
+import time
+import logging
+import importlib
+import importlib.util
+import threading
+
+logger = logging.getLogger("wealth_warmup")
+
+WARMUP = os.environ.get("WEALTH_WARMUP", "").strip().lower()
+
+# Modules imported up front (the engines plus their heavy dependencies)
+ENGINE_MODULES = (
+    "numpy_financial",
+    "scipy.stats",
+    "plotly.graph_objects",
+    "calculators.engines",
+    "calculators.tier1",
+    "calculators.tier2",
+    "calculators.tier3_super",
+    "calculators.fire",
+    "calculators.tier5_legacy",
+    "calculators.monte_carlo",
+    "calculators.fee_drag",
+    "calculators.scenarios",
+    "utils.pdf_gen",
+)
+
+_started = False
+_started_lock = threading.Lock()
+
+
+# --- STEPS ---
+
+def import_engines():
+    for name in ENGINE_MODULES:
+        importlib.import_module(name)
+
+
+def build_plotly_validators():
+    """Plotly validates and serialises each trace type lazily on first use."""
+    import plotly.graph_objects as go
+    from utils.charts import brand_figure
+    fig = brand_figure()
+    fig.add_trace(go.Scatter(x=[0, 1], y=[0, 1], fill="tonexty"))
+    fig.add_trace(go.Bar(x=[0, 1], y=[1, 0]))
+    fig.add_trace(go.Indicator(mode="gauge+number", value=50))
+    fig.to_json()
+
+
+def load_funds():
+    from utils.funds import fund_registry
+    fund_registry.current()
+
+
+def build_reference_scores():
+    from calculators.tier1 import get_reference_scores
+    get_reference_scores()
+
+
+def default_profiles():
+    """
+    Profiles a new visitor's pages run with: the session default, and what
+    Tier 1 saves when it is submitted unchanged (the default couple's incomes).
+    """
+    from calculators.tier1 import DEFAULT_USER_INCOME, DEFAULT_PARTNER_INCOME
+    from utils.session import DEFAULT_USER_PROFILE
+    return (
+        DEFAULT_USER_PROFILE,
+        dict(DEFAULT_USER_PROFILE, income=DEFAULT_USER_INCOME + DEFAULT_PARTNER_INCOME,
+             user_income=DEFAULT_USER_INCOME, partner_income=DEFAULT_PARTNER_INCOME),
+    )
+
+
+def prime_default_projections():
+    """
+    Caches the projections and first charts the pages build for each of the
+    default profiles. Inputs are put together the way the pages do it, so
+    the first real visitor's page runs are cache hits.
+    """
+    for profile in default_profiles():
+        _prime_profile(profile)
+
+
+def _prime_profile(profile):
+    from calculators.engines import run_readiness, run_strategy
+    from calculators.scenarios import compute_workspace, default_scenario, BASELINE_NAME
+    from calculators.fee_drag import get_fee_drag_table
+    from calculators.tier1 import create_gauge_chart
+    from calculators.tier2 import create_wealth_chart, create_tax_chart
+    from calculators.portfolio import calculate_portfolio_projection, schedule_purchases
+    from calculators.tier3_super import calculate_all_fund_projections
+    from utils.tax import calculate_marginal_rate
+
+    # Tier 1
+    readiness = run_readiness({
+        "equity": profile["home_value"] - profile["mortgage"], "income": profile["income"],
+        "experience": profile["experience"], "risk_tolerance": profile["risk_tolerance"],
+        "age": profile["age"], "dependants": profile["dependants"],
+    })
+    create_gauge_chart(readiness["scores"]["total"])
+
+    # Summary page workspace (also the Tier 3 results)
+    inputs = default_scenario(profile)
+    compute_workspace({BASELINE_NAME: inputs})
+
+    # Tier 2: results and charts, then the portfolio builder's and purchase scheduler's defaults
+    strategy = dict(inputs["strategy"], partner_income=profile.get("partner_income", 0))
+    results = run_strategy(strategy)
+    dr, ip = results["dr_results"], results["ip_results"]
+    years = list(range(1, 11))
+    create_wealth_chart(years, dr["net_wealth"], ip["net_wealth"])
+    create_tax_chart(years, dr["tax_saved_yearly"], ip["tax_saved_yearly"])
+
+    total_income = strategy["income"] + strategy["partner_income"]
+    tax_rate = calculate_marginal_rate(total_income)
+    loan = (strategy["loan_rate"], tax_rate, strategy["loan_type"], strategy["loan_term"])
+    costs = {"maint": strategy["maint_rate"], "mgmt": strategy["mgmt_rate"], "rates": strategy["rates"]}
+    calculate_portfolio_projection(
+        [dict(costs, price=float(strategy["ip_price"]), state=strategy["ip_state"], purchase_year=0,
+              growth=round(strategy["ip_growth"] * 100, 2) / 100, yield_rate=round(strategy["ip_yield"] * 100, 2) / 100)],
+        *loan, 20, collateral_value=profile["home_value"], collateral_debt=profile["mortgage"])
+    schedule_purchases(strategy["ip_price"], strategy["ip_state"], strategy["ip_growth"], strategy["ip_yield"],
+                       total_income, strategy["loan_rate"], tax_rate, home_value=profile["home_value"],
+                       home_loan=profile["mortgage"], living_expenses=40000, max_properties=5, years=20,
+                       loan_type=strategy["loan_type"], loan_term=strategy["loan_term"], **costs)
+
+    # Tier 3: fund comparison (a superset of the funds the page compares) and fee drag
+    super_inputs = inputs["super"]
+    years_to_retirement = super_inputs["retirement_age"] - super_inputs["current_age"]
+    calculate_all_fund_projections(super_inputs["current_balance"], super_inputs["annual_salary"],
+                                   super_inputs["employer_contrib"], super_inputs["voluntary_contrib"],
+                                   super_inputs["salary_growth"], years_to_retirement, super_inputs["unused_cap"])
+    get_fee_drag_table(super_inputs["current_balance"], super_inputs["annual_salary"],
+                       super_inputs["employer_contrib"], super_inputs["voluntary_contrib"],
+                       super_inputs["salary_growth"], years_to_retirement)
+
+
+def start_job_workers():
+    from utils.jobs import get_job_queue
+    get_job_queue().prestart()
+
+
+def launch_kaleido():
+    """Static chart export starts a headless browser on first use."""
+    if importlib.util.find_spec("kaleido") is None:
+        logger.info("Warm-up: kaleido not installed, skipping chart export")
+        return
+    import plotly.io as pio
+    from utils.charts import brand_figure
+    pio.to_image(brand_figure(), format="png", width=10, height=10)
+
+
+# (name, step) in run order
+WARMUP_STEPS = (
+    ("imports", import_engines),
+    ("plotly", build_plotly_validators),
+    ("fund_data", load_funds),
+    ("reference_scores", build_reference_scores),
+    ("default_projections", prime_default_projections),
+    ("job_workers", start_job_workers),
+    ("kaleido", launch_kaleido),
+)
+
+
+# --- RUNNER ---
+
+def selected_steps(setting=WARMUP):
+    """Steps enabled by a WEALTH_WARMUP value ("", "0" or "false" disables warm-up)."""
+    if setting in ("", "0", "false", "no", "off"):
+        return ()
+    if setting in ("1", "true", "yes", "on", "all"):
+        return WARMUP_STEPS
+    names = {name.strip() for name in setting.split(",")}
+    unknown = names - {name for name, _ in WARMUP_STEPS}
+    if unknown:
+        raise ValueError(f"Unknown warm-up steps: {', '.join(sorted(unknown))}")
+    return tuple(step for step in WARMUP_STEPS if step[0] in names)
+
+
+def run_warmup(steps=WARMUP_STEPS):
+    """
+    Runs the warm-up steps in order and logs how long each took.
+
+    A failing step is logged and skipped; it never stops the others.
+    Returns {step name: seconds}, with None for steps that failed.
+    """
+    timings = {}
+    started = time.perf_counter()
+    for name, step in steps:
+        step_started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            timings[name] = None
+            logger.warning("Warm-up step %s failed after %.2fs: %s: %s", name,
+                           time.perf_counter() - step_started, type(e).__name__, " ".join(str(e).split()))
+            continue
+        timings[name] = time.perf_counter() - step_started
+        logger.info("Warm-up step %s took %.2fs", name, timings[name])
+    logger.info("Warm-up finished in %.2fs", time.perf_counter() - started)
+    return timings
+
+
+def start_warmup(setting=WARMUP):
+    """
+    Starts the configured warm-up in a background thread, once per process.
+    Returns the thread, or None when warm-up is disabled or already started.
+    """
+    global _started
+    try:
+        steps = selected_steps(setting)
+    except ValueError as e:
+        logger.warning("Warm-up disabled: %s", e)
+        return None
+    with _started_lock:
+        if not steps or _started:
+            return None
+        _started = True
+
+    # Streamlit leaves the root logger unconfigured; make the timings visible in the server log
+    if not logger.handlers and not logging.getLogger().handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+
+    thread = threading.Thread(target=run_warmup, args=(steps,), name="wealth-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_warmup(selected_steps(WARMUP or "all"))